@@ -0,0 +1,101 @@
+"""
+Runs the benchmarks and writes the results as json.
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --filter decode --compare baseline.json --threshold 0.15
+"""
+
+import argparse
+import importlib
+import re
+import sys
+
+from .harness import (
+    dump_results,
+    find_regressions,
+    get_benchmarks,
+    load_results,
+    run_benchmark,
+)
+
+MODULES = [
+    "bench_instructions",
+    "bench_decode",
+    "bench_repeat",
+    "bench_idl",
+    "bench_codegen",
+]
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="-",
+        help="Path of the json report ('-' for stdout)",
+    )
+    parser.add_argument(
+        "--filter", type=str, default=None, help="Regex matched against group/name"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Minimum time (in seconds) of each repeat",
+    )
+    parser.add_argument(
+        "--compare",
+        type=str,
+        default=None,
+        help="Path of a previous report; exits with 1 if a benchmark regressed",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown tolerated by --compare",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+
+    for module in MODULES:
+        importlib.import_module(f".{module}", __package__)
+
+    benchmarks = get_benchmarks()
+    if args.filter is not None:
+        pattern = re.compile(args.filter)
+        benchmarks = [b for b in benchmarks if pattern.search(b.full_name)]
+
+    results = []
+    for benchmark in benchmarks:
+        result = run_benchmark(benchmark, repeat=args.repeat, min_time=args.min_time)
+        print(
+            f"{result.full_name:<60} {result.best_s * 1e6:>12.2f} us",
+            file=sys.stderr,
+        )
+        results.append(result)
+
+    dump_results(results, args.output)
+
+    if args.compare is not None:
+        regressions = find_regressions(
+            results, load_results(args.compare), args.threshold
+        )
+        for name, before, after in regressions:
+            print(
+                f"REGRESSION {name}: {before * 1e6:.2f} us -> {after * 1e6:.2f} us",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
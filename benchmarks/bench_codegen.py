@@ -0,0 +1,77 @@
+"""
+End-to-end code generation (generate_code + get_outputs) on synthetic idls
+"""
+
+import tempfile
+
+from solmate.anchor.codegen import CodeGen
+from solmate.anchor.idl import load_idl
+from .harness import register
+
+SIZES = [10, 100, 1000]
+
+
+def make_idl(n_instructions):
+    """
+    An anchor idl with n instructions, each with a few accounts and args, and n / 10 struct types
+    """
+    n_types = max(1, n_instructions // 10)
+    types = [
+        {
+            "name": f"Type{i}",
+            "type": {
+                "kind": "struct",
+                "fields": [
+                    {"name": "owner", "type": "publicKey"},
+                    {"name": "amount", "type": "u64"},
+                    {"name": "flags", "type": {"array": ["u8", 4]}},
+                ],
+            },
+        }
+        for i in range(n_types)
+    ]
+    instructions = [
+        {
+            "name": f"instruction{i}",
+            "accounts": [
+                {"name": "payer", "isMut": True, "isSigner": True},
+                {"name": "state", "isMut": True, "isSigner": False},
+                {"name": "systemProgram", "isMut": False, "isSigner": False},
+            ],
+            "args": [
+                {"name": "amount", "type": "u64"},
+                {"name": "params", "type": {"defined": f"Type{i % n_types}"}},
+            ],
+        }
+        for i in range(n_instructions)
+    ]
+    return {
+        "version": "0.1.0",
+        "name": f"synthetic_{n_instructions}",
+        "instructions": instructions,
+        "accounts": [],
+        "types": types,
+    }
+
+
+def generate(raw_idl):
+    codegen = CodeGen(
+        idl=load_idl(raw_idl),
+        addresses={},
+        root_module="synthetic",
+        source_path=tempfile.gettempdir() + "/solmate-bench-unused",
+        instr_tag_values="anchor",
+        accnt_tag_values="anchor",
+    )
+    codegen.generate_code(check_missing_types=False)
+    return codegen.get_outputs()
+
+
+for size in SIZES:
+    register(
+        "codegen",
+        f"generate[{size}]",
+        generate,
+        setup=lambda size=size: make_idl(size),
+        params={"instructions": size},
+    )
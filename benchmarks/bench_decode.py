@@ -0,0 +1,63 @@
+"""
+Account decoding throughput of the bundled token program
+"""
+
+from solmate.programs.token_program.accounts import Accounts
+from solmate.programs.token_program.types import (
+    Account,
+    AccountState,
+    AccountView,
+    Mint,
+    MintView,
+)
+from .bench_instructions import get_pubkey
+from .harness import register
+
+ACCOUNT = Account(
+    mint=get_pubkey(1),
+    owner=get_pubkey(2),
+    amount=12345,
+    delegate=get_pubkey(3),
+    state=AccountState.INITIALIZED,
+    is_native=None,
+    delegated_amount=678,
+    close_authority=None,
+)
+MINT = Mint(
+    mint_authority=get_pubkey(4),
+    supply=10**12,
+    decimals=6,
+    is_initialized=True,
+    freeze_authority=None,
+)
+ACCOUNT_BYTES = Account.to_bytes(ACCOUNT)
+MINT_BYTES = Mint.to_bytes(MINT)
+
+register("decode", "Account.from_bytes", lambda: Account.from_bytes(ACCOUNT_BYTES))
+register("decode", "Mint.from_bytes", lambda: Mint.from_bytes(MINT_BYTES))
+register("decode", "Accounts.from_bytes", lambda: Accounts.from_bytes(ACCOUNT_BYTES))
+register("decode", "AccountView.amount", lambda: AccountView(ACCOUNT_BYTES).amount)
+register("decode", "MintView.supply", lambda: MintView(MINT_BYTES).supply)
+register(
+    "decode",
+    "AccountView.decode_fields[owner,mint,amount]",
+    lambda: AccountView.decode_fields(ACCOUNT_BYTES, ("owner", "mint", "amount")),
+)
+register("encode", "Account.to_bytes", lambda: Account.to_bytes(ACCOUNT))
+
+
+def decode_many(n):
+    return AccountView.decode_many([ACCOUNT_BYTES] * n)
+
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    pass
+else:
+    register(
+        "decode",
+        "AccountView.decode_many[10000]",
+        lambda: decode_many(10000),
+        params={"n": 10000},
+    )
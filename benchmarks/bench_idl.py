@@ -0,0 +1,52 @@
+"""
+Idl parsing latency, with and without the on-disk cache
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from solmate.anchor.idl import Idl
+from .harness import register
+
+ROOT = Path(__file__).parent.parent
+IDL_PATHS = {
+    "token_program": ROOT / "programs" / "token_program.json",
+    "system_program": ROOT / "programs" / "system_program.json",
+}
+
+
+def load_cached(path):
+    return Idl.from_json_file(path)
+
+
+def setup_cache(path):
+    # a private cache directory so that the measurements do not depend on earlier runs
+    cache_dir = tempfile.TemporaryDirectory(prefix="solmate-bench-")
+    previous = os.environ.get("SOLMATE_CACHE_DIR")
+    os.environ["SOLMATE_CACHE_DIR"] = cache_dir.name
+    return path, cache_dir, previous
+
+
+def teardown_cache(state):
+    _, cache_dir, previous = state
+    if previous is None:
+        os.environ.pop("SOLMATE_CACHE_DIR", None)
+    else:
+        os.environ["SOLMATE_CACHE_DIR"] = previous
+    cache_dir.cleanup()
+
+
+for name, path in IDL_PATHS.items():
+    register(
+        "idl",
+        f"{name}.uncached",
+        lambda path=path: Idl.from_json_file(path, use_cache=False),
+    )
+    register(
+        "idl",
+        f"{name}.cached",
+        lambda state: Idl.from_json_file(state[0]),
+        setup=lambda path=path: setup_cache(path),
+        teardown=teardown_cache,
+    )
@@ -0,0 +1,134 @@
+"""
+Instruction build throughput (Ix dataclass -> TransactionInstruction) of the bundled programs
+"""
+
+import typing
+from dataclasses import fields
+
+from solana.keypair import Keypair
+from solana.publickey import PublicKey
+from solana.transaction import AccountMeta
+
+from solmate.programs.system_program import instructions as system_ixs
+from solmate.programs.token_program import instructions as token_ixs
+from solmate.tx import pack_instructions
+from .harness import register
+
+
+def get_pubkey(i):
+    return Keypair.from_seed(bytes([i] * 32)).public_key
+
+
+def get_sample_value(field_type, i):
+    name = str(field_type)
+    if "AccountMeta" in name:
+        meta = AccountMeta(get_pubkey(i), is_signer=False, is_writable=True)
+        return [meta] if "List" in name else meta
+    elif "PublicKey" in name:
+        return get_pubkey(i)
+    elif field_type is str:
+        return "seed"
+    elif hasattr(field_type, "get_member_names"):
+        return getattr(field_type, field_type.get_member_names()[0])
+
+    # the remaining arguments are integers
+    return 1
+
+
+def build_ix(cls):
+    kwargs = {
+        field.name: get_sample_value(field.type, i)
+        for i, field in enumerate(fields(cls))
+    }
+    return cls(**kwargs)
+
+
+def get_ix_classes(module):
+    return sorted(
+        (name, value) for name, value in vars(module).items() if name.endswith("Ix")
+    )
+
+
+for program, module in (("token", token_ixs), ("system", system_ixs)):
+    for name, cls in get_ix_classes(module):
+        register(
+            "instructions",
+            f"{program}.{name}",
+            lambda ix: ix.to_instruction(),
+            setup=lambda cls=cls: build_ix(cls),
+        )
+
+
+def build_transfer_checked_columns(n=1000):
+    mint = get_pubkey(0)
+    owners = [get_pubkey(1 + i % 8) for i in range(n)]
+    return dict(
+        source=[get_pubkey(10 + i % 64) for i in range(n)],
+        mint=mint,
+        destination=[get_pubkey(80 + i % 64) for i in range(n)],
+        source_owner=owners,
+        amount=list(range(n)),
+        decimals=6,
+    )
+
+
+def build_transfer_checked_rows(n=1000):
+    columns = build_transfer_checked_columns(n)
+    return [
+        {k: v[i] if isinstance(v, list) else v for k, v in columns.items()}
+        for i in range(n)
+    ]
+
+
+register(
+    "instructions",
+    "token.transfer_checked[1000]",
+    lambda rows: [token_ixs.transfer_checked(**row, signers=[]) for row in rows],
+    setup=build_transfer_checked_rows,
+)
+register(
+    "instructions",
+    "token.transfer_checked_many[1000]",
+    lambda columns: token_ixs.transfer_checked_many(**columns, signers=[]),
+    setup=build_transfer_checked_columns,
+)
+
+
+TRANSFER_CHECKED_IX = token_ixs.transfer_checked(
+    source=get_pubkey(1),
+    mint=get_pubkey(2),
+    destination=get_pubkey(3),
+    source_owner=get_pubkey(4),
+    amount=10,
+    decimals=6,
+    signers=[],
+)
+register(
+    "instructions",
+    "token.decode_instruction[transfer_checked]",
+    lambda: token_ixs.decode_instruction(TRANSFER_CHECKED_IX),
+)
+
+
+def build_payout(n=100000):
+    payer = get_pubkey(1)
+    return payer, [
+        token_ixs.transfer_checked(
+            source=get_pubkey(2),
+            mint=get_pubkey(3),
+            destination=get_pubkey(10 + i % 200),
+            source_owner=payer,
+            amount=i,
+            decimals=6,
+            signers=[],
+        )
+        for i in range(n)
+    ]
+
+
+register(
+    "instructions",
+    "tx.pack_instructions[transfer_checked, 100000]",
+    lambda payout: pack_instructions(payout[1], payout[0]),
+    setup=build_payout,
+)
@@ -0,0 +1,40 @@
+"""
+Repeat access patterns (e.g. event queues)
+"""
+
+from podite import U64
+
+from solmate.dtypes import Repeat, RingCursor
+from .harness import register
+
+N_ELEM = 10000
+RAW = b"".join(U64.to_bytes(i) for i in range(N_ELEM))
+QUEUE = Repeat[U64]
+
+
+def poll(repeat):
+    cursor = RingCursor(seq_num=N_ELEM)
+    return cursor.poll(repeat, N_ELEM + 10)
+
+
+register("repeat", "from_bytes", lambda: QUEUE.from_bytes(RAW), params={"n": N_ELEM})
+register(
+    "repeat",
+    "getitem",
+    lambda repeat: repeat[N_ELEM // 2],
+    setup=lambda: QUEUE.from_bytes(RAW),
+)
+register(
+    "repeat",
+    "iter",
+    lambda repeat: sum(repeat),
+    setup=lambda: QUEUE.from_bytes(RAW),
+    params={"n": N_ELEM},
+)
+register(
+    "repeat",
+    "ring_cursor_poll[10]",
+    poll,
+    setup=lambda: QUEUE.from_bytes(RAW),
+    params={"n": N_ELEM, "new": 10},
+)
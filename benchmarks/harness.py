@@ -0,0 +1,148 @@
+import json
+import platform
+import sys
+import time
+import timeit
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+
+import solmate
+
+# minimum time spent on each repeat of a benchmark
+MIN_REPEAT_TIME = 0.2
+
+
+@dataclass
+class Benchmark:
+    """
+    A single measurement. `fn` is called `number` times per repeat, where `number` is picked
+    automatically so that each repeat takes at least MIN_REPEAT_TIME.
+
+    :param setup: Called once before measuring; its return value is passed to fn
+    :param teardown: Called once after measuring (even if it failed) with the return value of setup
+    """
+
+    group: str
+    name: str
+    fn: Callable
+    setup: Optional[Callable] = None
+    params: Optional[Dict] = None
+    teardown: Optional[Callable] = None
+
+    @property
+    def full_name(self):
+        return f"{self.group}/{self.name}"
+
+
+@dataclass
+class Result:
+    group: str
+    name: str
+    number: int
+    repeat: int
+    best_s: float  # best time per call
+    mean_s: float  # mean time per call
+    ops_per_sec: float
+    params: Optional[Dict] = None
+
+    @property
+    def full_name(self):
+        return f"{self.group}/{self.name}"
+
+
+_REGISTRY: List[Benchmark] = []
+
+
+def register(group, name, fn, setup=None, params=None, teardown=None):
+    _REGISTRY.append(Benchmark(group, name, fn, setup, params, teardown))
+
+
+def get_benchmarks() -> List[Benchmark]:
+    return list(_REGISTRY)
+
+
+def run_benchmark(benchmark: Benchmark, repeat=5, min_time=MIN_REPEAT_TIME) -> Result:
+    if benchmark.setup is not None:
+        state = benchmark.setup()
+        fn = lambda: benchmark.fn(state)  # noqa: E731
+    else:
+        state = None
+        fn = benchmark.fn
+
+    try:
+        return _measure(benchmark, fn, repeat, min_time)
+    finally:
+        if benchmark.teardown is not None:
+            benchmark.teardown(state)
+
+
+def _measure(benchmark: Benchmark, fn, repeat, min_time) -> Result:
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 10**7:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    times = [elapsed] + timer.repeat(repeat - 1, number) if repeat > 1 else [elapsed]
+    per_call = [t / number for t in times]
+    best = min(per_call)
+
+    return Result(
+        group=benchmark.group,
+        name=benchmark.name,
+        number=number,
+        repeat=len(times),
+        best_s=best,
+        mean_s=sum(per_call) / len(per_call),
+        ops_per_sec=1 / best if best > 0 else float("inf"),
+        params=benchmark.params,
+    )
+
+
+def get_environment():
+    return {
+        "solmate": solmate.__version__,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def dump_results(results: List[Result], path):
+    report = {
+        "environment": get_environment(),
+        "results": [asdict(result) for result in results],
+    }
+    content = json.dumps(report, indent=2) + "\n"
+    if path == "-":
+        sys.stdout.write(content)
+    else:
+        with open(path, "w") as fout:
+            fout.write(content)
+
+
+def load_results(path) -> Dict[str, dict]:
+    with open(path, "r") as fin:
+        report = json.load(fin)
+
+    return {f"{r['group']}/{r['name']}": r for r in report["results"]}
+
+
+def find_regressions(results: List[Result], baseline: Dict[str, dict], threshold):
+    """
+    Returns (name, baseline best, current best) of the benchmarks that got slower than threshold
+    (e.g. 0.1 for 10%). Benchmarks missing from the baseline are ignored.
+    """
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.full_name)
+        if previous is None:
+            continue
+
+        if result.best_s > previous["best_s"] * (1 + threshold):
+            regressions.append((result.full_name, previous["best_s"], result.best_s))
+
+    return regressions
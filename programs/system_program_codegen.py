@@ -1,9 +1,10 @@
-from typing import Dict, Set, Callable, Literal
+from typing import Dict, Set, Callable, Literal, Optional
 
 from solmate.anchor import CodeGen
 from solmate.anchor.codegen import InstructionCodeGen
 from solmate.anchor.editor import CodeEditor
 from solmate.anchor.idl import Idl
+from solmate.anchor.profiler import NullProfiler
 from solmate.utils import camel_to_snake
 
 
@@ -18,6 +19,14 @@ class SystemProgramInstructionCodeGen(InstructionCodeGen):
 
         return super().get_default_account(editor, account, account_name)
 
+    def supports_many(self):
+        # the base and derived keys are computed from the other arguments
+        for account, _ in self.instr_accounts:
+            if account.name in ("basePubkey", "derivedPubkey"):
+                return False
+
+        return super().supports_many()
+
     def generate_ix_func_key_preprocessor(self, account, prefix):
         code = ["\n"]
         if account.name == "basePubkey":
@@ -72,8 +81,17 @@ def cli(
     instr_tag_values: Literal["anchor", "incremental"],
     accnt_tag_values: Literal["anchor", "incremental"],
     external_types: Dict[str, Callable[[CodeEditor], str]] = None,
+    incremental: bool = False,
+    lazy_imports: bool = False,
+    specialized_codecs: bool = False,
+    bundle: bool = False,
+    profiler: Optional[NullProfiler] = None,
 ):
-    idl = Idl.from_json_file(idl_path)
+    if profiler is None:
+        profiler = NullProfiler()
+
+    with profiler.phase("load_idl"):
+        idl = Idl.from_json_file(idl_path)
     idl.types = list(filter(lambda x: x.name not in skip_types, idl.types))
 
     print(f"Generating code for {idl_path}...")
@@ -87,6 +105,11 @@ def cli(
         instr_tag_values=instr_tag_values,
         accnt_tag_values=accnt_tag_values,
         skip_types=skip_types,
+        incremental=incremental,
+        lazy_imports=lazy_imports,
+        specialized_codecs=specialized_codecs,
+        bundle=bundle,
+        profiler=profiler,
     )
     codegen.generate_code(check_missing_types=not True)
     codegen.save_modules()
@@ -1,9 +1,10 @@
-from typing import Dict, Set, Callable, Literal
+from typing import Dict, Set, Callable, Literal, Optional
 
 from solmate.anchor import CodeGen
 from solmate.anchor.codegen import InstructionCodeGen, usize_type, AccountsCodeGen
 from solmate.anchor.editor import CodeEditor
 from solmate.anchor.idl import Idl, IdlAccount, IdlType
+from solmate.anchor.profiler import NullProfiler
 from solmate.utils import camel_to_snake, pascal_to_snake
 
 ALLOW_MULTISIG_KEY = "allowMultisig"
@@ -49,21 +50,26 @@ class TokenProgramInstructionCodeGen(InstructionCodeGen):
             return "None"
         return super().get_default_value(editor, arg)
 
-    def generate_ix_func_key_preprocessor(self, account, account_name):
+    def get_account_signer_expr(self, account, account_name):
         metadata = account.metadata or {}
         if metadata.get(ALLOW_MULTISIG_KEY, False):
+            # the owner only signs when the account is not owned by a multisig
+            return f"False if signers else {account.is_signer}"
+
+        return super().get_account_signer_expr(account, account_name)
+
+    def supports_many(self):
+        # the signers of initialize_multisig are validated against another argument
+        for account, _ in self.instr_accounts:
+            metadata = account.metadata or {}
+            if account.name == "signers" and metadata.get("length", None):
+                return False
+
+        return super().supports_many()
 
-            self.editor.add_from_import("solmate.utils", "to_account_meta")
-
-            return [
-                f"    if isinstance({account_name}, (str, PublicKey)):\n",
-                f"        {account_name} = to_account_meta(\n",
-                f"            {account_name},\n",
-                f"            is_signer=False if signers else {account.is_signer},\n",
-                f"            is_writable={account.is_mut},\n",
-                f"        )\n",
-            ]
-        elif account_name == "signers":
+    def generate_ix_func_key_preprocessor(self, account, account_name):
+        metadata = account.metadata or {}
+        if account_name == "signers":
             length = metadata.get("length", None)
             conditions = []
             if length:
@@ -88,7 +94,7 @@ class TokenProgramInstructionCodeGen(InstructionCodeGen):
                 self.editor.add_from_import("..constants", "MAX_SIGNERS")
 
                 conditions += [
-                    f"    if len(signers) > MAX_SIGNERS:\n",
+                    f"    if signers is not None and len(signers) > MAX_SIGNERS:\n",
                     f"        raise ValueError(\n",
                     f'            f"len(signers) cannot be bigger than {{MAX_SIGNERS}}, but was {{len(signers)}}"\n',
                     f"        )\n",
@@ -104,24 +110,35 @@ class TokenProgramInstructionCodeGen(InstructionCodeGen):
 
 class TokenProgramAccountsCodeGen(AccountsCodeGen):
     def generate_accounts_cls_packing_logic(self):
-        code = [
+        self.module_editor.add_from_import("podite", "BYTES_CATALOG")
+        return [
             "\n",
             "    @classmethod\n",
             "    def _from_bytes_partial(cls, buffer, **kwargs):\n",
             "        account_len = buffer.getbuffer().nbytes - buffer.tell()\n",
+            "        entry = _ACCOUNTS_BY_SIZE.get(account_len)\n",
+            "        if entry is None:\n",
+            "            return None\n",
+            "\n",
+            "        variant, account_type = entry\n",
+            "        return variant(BYTES_CATALOG.unpack_partial(account_type, buffer))\n",
+            "\n",
         ]
 
-        self.module_editor.add_from_import("podite", "BYTES_CATALOG")
+    def generate_accounts_dispatch_table(self):
+        # spl token accounts have no tag, so they are told apart by their size
+        code = [
+            "# account size to (variant, account type), computed once at import\n",
+            "_ACCOUNTS_BY_SIZE = {\n",
+        ]
         for account in self.accounts:
             variant = pascal_to_snake(account.name).upper()
-            code += [
-                f"        if account_len == {account.name}.calc_max_size():\n",
-                f"            obj = BYTES_CATALOG.unpack_partial({account.name}, buffer)\n",
-                f"            return Accounts.{variant}(obj)\n",
-                f"\n",
-            ]
+            code.append(
+                f"    {account.name}.calc_max_size(): (Accounts.{variant}, {account.name}),\n"
+            )
+        code.append("}\n")
 
-        return code
+        return "accounts_by_size", code
 
 
 class TokenProgramCodeGen(CodeGen):
@@ -133,6 +150,23 @@ class TokenProgramCodeGen(CodeGen):
             self, self._package_editor, self.idl.accounts
         ).generate()
 
+    def get_type_size(self, field_type):
+        if field_type.is_a(IdlType.OPTION):
+            # options within types are encoded as Static[COptional[...]], i.e. a u32 tag + the value
+            inner_size = self.get_type_size(field_type.field)
+            return None if inner_size is None else 4 + inner_size
+
+        return super().get_type_size(field_type)
+
+    def get_type_dtype(self, field_type, editor):
+        if field_type.is_a(IdlType.OPTION):
+            inner_descr = self.get_type_dtype(field_type.field, editor)
+            if inner_descr is None:
+                return None
+            return f'[("tag", "<u4"), ("value", {inner_descr})]'
+
+        return super().get_type_dtype(field_type, editor)
+
     def get_type_as_string(
         self, field_type, editor, within_types, explicit_forward_ref=False
     ):
@@ -165,8 +199,17 @@ def cli(
     instr_tag_values: Literal["anchor", "incremental"],
     accnt_tag_values: Literal["anchor", "incremental"],
     external_types: Dict[str, Callable[[CodeEditor], str]] = None,
+    incremental: bool = False,
+    lazy_imports: bool = False,
+    specialized_codecs: bool = False,
+    bundle: bool = False,
+    profiler: Optional[NullProfiler] = None,
 ):
-    idl = Idl.from_json_file(idl_path)
+    if profiler is None:
+        profiler = NullProfiler()
+
+    with profiler.phase("load_idl"):
+        idl = Idl.from_json_file(idl_path)
     idl.types = list(filter(lambda x: x.name not in skip_types, idl.types))
 
     if external_types is None:
@@ -184,6 +227,11 @@ def cli(
         instr_tag_values=instr_tag_values,
         accnt_tag_values=accnt_tag_values,
         skip_types=skip_types,
+        incremental=incremental,
+        lazy_imports=lazy_imports,
+        specialized_codecs=specialized_codecs,
+        bundle=bundle,
+        profiler=profiler,
     )
     codegen.generate_code(check_missing_types=not True)
     codegen.save_modules()
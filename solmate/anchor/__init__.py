@@ -2,3 +2,4 @@ from .sighash import sighash
 from .discriminant import AccountDiscriminant, InstructionDiscriminant
 from .idl import Idl
 from .codegen import CodeGen
+from .profiler import CodeGenProfiler
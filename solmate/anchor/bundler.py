@@ -0,0 +1,212 @@
+"""
+Merges the modules generated for a program into a single module (see `CodeGen(bundle=True)`).
+
+Imports between the modules of the program are dropped since all the names live in the same
+namespace, the other imports are merged at the top and the module bodies follow in dependency
+order. The submodules are re-created at import time by `solmate.bundle.export_submodules`.
+"""
+
+import ast
+from typing import Dict, List, Set, Tuple
+
+from .editor import ImportCollector, LOCK_FOOTER, LOCK_HEADER, LOCK_WARNING
+
+IMPORTS_LOCK_HEADER = LOCK_HEADER + "imports" + LOCK_WARNING
+
+
+class _ParsedModule:
+    def __init__(self, name, is_package):
+        self.name = name
+        self.is_package = is_package
+        self.body: List[str] = []
+        self.defined: List[str] = []
+        # alias to (module, name) of the imports from the other modules of the program
+        self.internal_imports: Dict[str, Tuple[str, str]] = {}
+        self.dependencies: Set[str] = set()
+
+
+def _is_internal(root_module, module_name):
+    return module_name == root_module or module_name.startswith(root_module + ".")
+
+
+def _resolve(module: _ParsedModule, node: ast.ImportFrom) -> str:
+    if node.level == 0:
+        return node.module
+
+    package = module.name if module.is_package else module.name.rpartition(".")[0]
+    for _ in range(node.level - 1):
+        package = package.rpartition(".")[0]
+
+    return f"{package}.{node.module}" if node.module else package
+
+
+def _get_defined_names(node) -> List[str]:
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return [node.name]
+    elif isinstance(node, ast.Assign):
+        targets = node.targets
+    elif isinstance(node, (ast.AnnAssign, ast.AugAssign)):
+        targets = [node.target]
+    else:
+        return []
+
+    names = []
+    for target in targets:
+        for child in ast.walk(target):
+            if isinstance(child, ast.Name):
+                names.append(child.id)
+    return names
+
+
+def _strip_locks(lines: List[str]) -> List[str]:
+    """
+    Removes the imports lock and the markers of the other locks (a bundle is never edited in place)
+    """
+    result = []
+    in_imports = False
+    for line in lines:
+        stripped = line.strip()
+        if stripped == IMPORTS_LOCK_HEADER:
+            in_imports = True
+        elif stripped == LOCK_FOOTER:
+            in_imports = False
+        elif not in_imports and not stripped.startswith(LOCK_HEADER):
+            result.append(line)
+    return result
+
+
+def _parse_module(
+    root_module, name, is_package, source, imports: ImportCollector, bindings
+) -> _ParsedModule:
+    module = _ParsedModule(name, is_package)
+    lines = source.splitlines(keepends=True)
+    removed = set()
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Import):
+            removed.update(range(node.lineno - 1, node.end_lineno))
+            for alias in node.names:
+                if _is_internal(root_module, alias.name):
+                    # e.g. "import root.types as types", the submodules are exported at the end
+                    module.dependencies.add(alias.name)
+                    continue
+
+                binding = alias.asname or alias.name.split(".")[0]
+                _bind(bindings, binding, f"import {alias.name}", name)
+                imports.add_import(alias.name, alias.asname)
+
+        elif isinstance(node, ast.ImportFrom):
+            removed.update(range(node.lineno - 1, node.end_lineno))
+            from_module = _resolve(module, node)
+            if _is_internal(root_module, from_module):
+                module.dependencies.add(from_module)
+                for alias in node.names:
+                    module.internal_imports[alias.asname or alias.name] = (
+                        from_module,
+                        alias.name,
+                    )
+                continue
+
+            for alias in node.names:
+                binding = alias.asname or alias.name
+                _bind(
+                    bindings, binding, f"from {from_module} import {alias.name}", name
+                )
+                imports.add_from_import(from_module, alias.name, alias.asname)
+
+        else:
+            for defined in _get_defined_names(node):
+                if defined not in module.defined:
+                    module.defined.append(defined)
+
+    body = [line for i, line in enumerate(lines) if i not in removed]
+    body = "".join(_strip_locks(body)).strip("\n")
+
+    for alias, (_, import_name) in module.internal_imports.items():
+        if alias != import_name:
+            body = f"{alias} = {import_name}\n" + body
+
+    module.body = [body + "\n"] if body else []
+    return module
+
+
+def _bind(bindings: Dict[str, Tuple[str, str]], name, origin, module_name):
+    """
+    Records that name is bound by origin (an import or a definition) and fails if a different
+    origin already bound it in another module
+    """
+    previous = bindings.get(name)
+    if previous is not None and previous[0] != origin:
+        raise ValueError(
+            f"Cannot bundle: {name} is bound by both {previous[1]} ({previous[0]}) "
+            f"and {module_name} ({origin})"
+        )
+    bindings[name] = (origin, module_name)
+
+
+def _sort_modules(modules: Dict[str, _ParsedModule]) -> List[_ParsedModule]:
+    """
+    Orders the modules such that each module comes after the modules it imports (cycles are broken
+    arbitrarily but deterministically)
+    """
+    ordered = []
+    visited = set()
+
+    def visit(name):
+        if name in visited or name not in modules:
+            return
+        visited.add(name)
+        for dependency in sorted(modules[name].dependencies):
+            visit(dependency)
+        ordered.append(modules[name])
+
+    for name in sorted(modules):
+        visit(name)
+
+    return ordered
+
+
+def bundle_modules(root_module: str, sources: Dict[str, str]) -> str:
+    """
+    Returns the source code of a single module equivalent to the given modules.
+
+    :param root_module: Name of the root package of the program
+    :param sources: Dict from module name (packages by their own name) to source code
+    """
+    imports = ImportCollector()
+    imports.add_from_import("solmate.bundle", "export_submodules")
+
+    bindings = {"export_submodules": ("from solmate.bundle", "<bundle>")}
+    modules = {}
+    for name, source in sources.items():
+        is_package = any(other.startswith(name + ".") for other in sources)
+        module = _parse_module(root_module, name, is_package, source, imports, bindings)
+        for defined in module.defined:
+            _bind(bindings, defined, f"{name}.{defined}", name)
+        modules[name] = module
+
+    for name in modules:
+        child = name[len(root_module) + 1 :]
+        if name != root_module and "." not in child:
+            _bind(bindings, child, name, root_module)
+
+    code = imports.as_source_code()
+    for module in _sort_modules(modules):
+        if module.body:
+            code += ["\n", f"# {module.name}\n"] + module.body + ["\n"]
+
+    submodules = {}
+    for name, module in sorted(modules.items()):
+        if name == root_module:
+            continue
+
+        exported = sorted(set(module.defined) | set(module.internal_imports))
+        submodules[name[len(root_module) + 1 :]] = exported
+
+    code += ["\n", "export_submodules(\n", "    __name__,\n", "    {\n"]
+    for name, exported in submodules.items():
+        code.append(f'        "{name}": [\n')
+        code += [f'            "{attr}",\n' for attr in exported]
+        code.append("        ],\n")
+    code += ["    },\n", ")\n"]
+
+    return "".join(code)
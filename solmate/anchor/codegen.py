@@ -1,11 +1,18 @@
+import json
 import os
-from typing import Dict, Iterable, Set, Union, Callable, Literal, Optional
+from functools import partial
+from hashlib import sha256
+from typing import Dict, Iterable, List, Set, Tuple, Union, Callable, Literal, Optional
 
 from podite import Vec
 from solana.publickey import PublicKey
 
+import solmate
 from solmate.utils import camel_to_snake, pascal_to_snake, snake_to_pascal
-from .editor import CodeEditor
+from .bundler import bundle_modules
+from .editor import CodeEditor, remove_source, write_source
+from .profiler import NullProfiler
+from .sighash import sighash
 from .idl import (
     Idl,
     IdlTypeDefinition,
@@ -15,6 +22,7 @@ from .idl import (
     IdlAccountItem,
     IdlInstruction,
     IdlAccount,
+    IdlField,
 )
 
 
@@ -215,38 +223,150 @@ class InstructionCodeGen:
         code.append("\n")
 
         # generating data
-        editor.add_from_import("io", "BytesIO")
-        code.append("        buffer = BytesIO()\n")
-        editor.add_from_import(".instruction_tag", "InstructionTag")
-        instr_tag_name = camel_to_snake(instr.name).upper()
-        code.append(
-            f"        buffer.write(InstructionTag.to_bytes(InstructionTag.{instr_tag_name}))\n"
-        )
-        for arg in instr.args:
-            arg_type = self.codegen.get_type_as_string(
-                arg.type, editor, within_types=False
+        data_layout = self.get_data_layout()
+        if data_layout is None:
+            editor.add_from_import("io", "BytesIO")
+            code.append("        buffer = BytesIO()\n")
+            editor.add_from_import(".instruction_tag", "InstructionTag")
+            instr_tag_name = camel_to_snake(instr.name).upper()
+            code.append(
+                f"        buffer.write(InstructionTag.to_bytes(InstructionTag.{instr_tag_name}))\n"
             )
+            for arg in instr.args:
+                arg_type = self.codegen.get_type_as_string(
+                    arg.type, editor, within_types=False
+                )
+
+                editor.add_from_import("podite", "BYTES_CATALOG")
+                code.append(
+                    f"        buffer.write(BYTES_CATALOG.pack({arg_type}, self.{arg.py_name}))\n"
+                )
+            code.append("\n")
+            data = "buffer.getvalue()"
+        else:
+            # the tag value is baked into the generated code, so encoding is a single pack call
+            code = self.generate_ix_cls_data_layout(data_layout) + code
+            values = [str(self.codegen.get_instr_tag_value(instr))]
+            for arg in instr.args:
+                if arg.type.is_a(IdlType.PUBLIC_KEY):
+                    values.append(f"bytes(self.{arg.py_name})")
+                else:
+                    values.append(f"self.{arg.py_name}")
 
-            editor.add_from_import("podite", "BYTES_CATALOG")
             code.append(
-                f"        buffer.write(BYTES_CATALOG.pack({arg_type}, self.{arg.py_name}))\n"
+                f"        data = self._data_layout.pack({', '.join(values)})\n"
             )
-        code.append("\n")
+            code.append("\n")
+            data = "data"
 
         editor.add_from_import("solana.transaction", "TransactionInstruction")
         code.append("        return TransactionInstruction(\n")
         code.append("            keys=keys,\n")
         code.append(f"            program_id=self.program_id,\n")
-        code.append("            data=buffer.getvalue(),\n")
+        code.append(f"            data={data},\n")
         code.append("        )\n")
         code.append("\n")
         return code
 
+    def generate_ix_cls_from_instruction_method(self):
+        """
+        Generates the inverse of to_instruction, mapping the keys back onto the account fields and
+        decoding the data fields
+        """
+        editor = self.editor
+        instr = self.instr
+        ix_cls = f"{snake_to_pascal(self.instr_name)}Ix"
+
+        editor.add_from_import("solmate.utils", "split_account_metas")
+        editor.add_from_import("solana.transaction", "TransactionInstruction")
+
+        code = [
+            "\n",
+            "    # (name, is_optional, is_array, is_signer) of the accounts in key order\n",
+            "    _accounts_layout = (\n",
+        ]
+        for account, account_name in self.instr_accounts:
+            code.append(
+                f'        ("{account_name}", {account.is_optional}, {account.is_array}, {account.is_signer}),\n'
+            )
+        code += [
+            "    )\n",
+            "\n",
+            "    @classmethod\n",
+            f'    def from_instruction(cls, ix: TransactionInstruction) -> "{ix_cls}":\n',
+            "        accounts = split_account_metas(ix.keys, cls._accounts_layout)\n",
+        ]
+
+        values = [arg.py_name for arg in instr.args]
+        if instr.args and self.get_data_layout() is not None:
+            code += [
+                "        if len(ix.data) < cls._data_layout.size:\n",
+                '            raise ValueError("The instruction data is shorter than the data layout")\n',
+                f"        _, {', '.join(values)} = cls._data_layout.unpack_from(ix.data)\n",
+            ]
+            for i, arg in enumerate(instr.args):
+                if arg.type.is_a(IdlType.PUBLIC_KEY):
+                    values[i] = f"PublicKey({arg.py_name})"
+        elif instr.args:
+            editor.add_from_import("io", "BytesIO")
+            editor.add_from_import("solmate.utils", "unpack_borsh")
+            code += [
+                "        buffer = BytesIO(ix.data)\n",
+                f"        buffer.seek({self.codegen.get_instr_tag_size()})\n",
+            ]
+            for arg in instr.args:
+                arg_type = self.codegen.get_type_as_string(
+                    arg.type, editor, within_types=False
+                )
+                code.append(
+                    f"        {arg.py_name} = unpack_borsh({arg_type}, buffer)\n"
+                )
+
+        code += [
+            "\n",
+            "        return cls(\n",
+            "            program_id=ix.program_id,\n",
+            "            **accounts,\n",
+        ]
+        for arg, value in zip(instr.args, values):
+            code.append(f"            {arg.py_name}={value},\n")
+        code += ["        )\n", "\n"]
+
+        return code
+
+    def get_data_layout(self) -> Optional[str]:
+        """
+        Returns the struct format of the instruction data (tag followed by the args) if the tag and
+        all the args are fixed-size primitives, otherwise None
+        """
+        tag_format = self.codegen.get_instr_tag_format()
+        if tag_format is None:
+            return None
+
+        layout = "<" + tag_format
+        for arg in self.instr.args:
+            arg_format = STRUCT_FORMATS.get(arg.type)
+            if arg_format is None:
+                return None
+            layout += arg_format
+
+        return layout
+
+    def generate_ix_cls_data_layout(self, data_layout):
+        self.editor.add_from_import("struct", "Struct")
+        instr_tag_name = camel_to_snake(self.instr.name).upper()
+        return [
+            "\n",
+            f"    # InstructionTag.{instr_tag_name} followed by the data fields\n",
+            f'    _data_layout = Struct("{data_layout}")\n',
+        ]
+
     def generate_ix_cls(self):
         code = self.generate_ix_cls_declaration()
         code += self.generate_ix_cls_metas_fields()
         code += self.generate_ix_cls_args_fields()
         code += self.generate_ix_cls_to_instruction_method()
+        code += self.generate_ix_cls_from_instruction_method()
 
         return code
 
@@ -260,8 +380,11 @@ class InstructionCodeGen:
         code += ["):\n"]
         return code
 
-    def generate_ix_func_args(self):
-        code = []
+    def get_ix_func_params(self) -> List[Tuple[str, str, Optional[str]]]:
+        """
+        Returns the (name, type, default or None) of the parameters of the instruction function,
+        the parameters without default first
+        """
         editor = self.editor
         codegen = self.codegen
         instr = self.instr
@@ -309,16 +432,32 @@ class InstructionCodeGen:
         else:
             args_with_default.append(("program_id", "PublicKey", program_id))
 
-        for arg_name, arg_type in args_without_default:
-            code.append(f"    {arg_name}: {arg_type},\n")
-
-        for arg_name, arg_type, arg_val in args_with_default:
-            code.append(f"    {arg_name}: {arg_type} = {arg_val},\n")
+        return [
+            (arg_name, arg_type, None) for arg_name, arg_type in args_without_default
+        ] + args_with_default
 
+    @staticmethod
+    def render_func_params(params: List[Tuple[str, str, Optional[str]]]) -> List[str]:
+        code = []
+        for arg_name, arg_type, arg_val in params:
+            if arg_val is None:
+                code.append(f"    {arg_name}: {arg_type},\n")
+            else:
+                code.append(f"    {arg_name}: {arg_type} = {arg_val},\n")
         return code
 
+    def generate_ix_func_args(self):
+        return self.render_func_params(self.get_ix_func_params())
+
+    def get_account_signer_expr(self, account, account_name) -> str:
+        """
+        Returns the expression of the is_signer flag of the account's meta
+        """
+        return str(account.is_signer)
+
     def generate_ix_func_key_preprocessor(self, account, account_name):
         self.editor.add_from_import("solmate.utils", "to_account_meta")
+        is_signer = self.get_account_signer_expr(account, account_name)
 
         if account.is_array:
             if account.is_optional:
@@ -328,7 +467,7 @@ class InstructionCodeGen:
                     f"            if isinstance({account_name}[i], (str, PublicKey)):\n",
                     f"                {account_name}[i] = to_account_meta(\n",
                     f"                    {account_name}[i],\n",
-                    f"                    is_signer={account.is_signer},\n",
+                    f"                    is_signer={is_signer},\n",
                     f"                    is_writable={account.is_mut},\n",
                     f"                )\n",
                 ]
@@ -338,7 +477,7 @@ class InstructionCodeGen:
                     f"        if isinstance({account_name}[i], (str, PublicKey)):\n",
                     f"            {account_name}[i] = to_account_meta(\n",
                     f"                {account_name}[i],\n",
-                    f"                is_signer={account.is_signer},\n",
+                    f"                is_signer={is_signer},\n",
                     f"                is_writable={account.is_mut},\n",
                     f"            )\n",
                 ]
@@ -348,7 +487,7 @@ class InstructionCodeGen:
                 f"    if isinstance({account_name}, (str, PublicKey)):\n",
                 f"        {account_name} = to_account_meta(\n",
                 f"            {account_name},\n",
-                f"            is_signer={account.is_signer},\n",
+                f"            is_signer={is_signer},\n",
                 f"            is_writable={account.is_mut},\n",
                 f"        )\n",
             ]
@@ -385,12 +524,146 @@ class InstructionCodeGen:
 
         return code
 
+    def supports_many(self) -> bool:
+        """
+        Whether a <name>_many builder is generated, subclasses whose helper functions preprocess
+        their arguments (beyond converting them to account metas) should return False
+        """
+        return True
+
+    def generate_ix_many_func(self):
+        """
+        Generates <name>_many, which builds many instructions from columns of accounts and args
+        (see solmate.batch)
+        """
+        editor = self.editor
+        instr = self.instr
+        instr_name = self.instr_name
+        ix_cls = f"{snake_to_pascal(instr_name)}Ix"
+        self.module_editor.add_from_import(f".{instr_name}", f"{instr_name}_many")
+
+        editor.add_from_import("solmate.batch", "AccountColumn")
+        editor.add_from_import("solmate.batch", "batch_size")
+        editor.add_from_import("solmate.batch", "meta_column")
+        if any(account.is_array for account, _ in self.instr_accounts):
+            editor.add_from_import("solmate.batch", "copy_metas")
+        editor.add_from_import("typing", "Sequence")
+        editor.add_from_import("solana.transaction", "TransactionInstruction")
+
+        # the columns are the single accounts and the args, the arrays of accounts are copied into
+        # every instruction
+        single_accounts = [
+            (account, name)
+            for account, name in self.instr_accounts
+            if not account.is_array
+        ]
+        columns = [name for _, name in single_accounts]
+        columns += [arg.py_name for arg in instr.args]
+
+        account_columns = {name for _, name in single_accounts}
+        params = []
+        for arg_name, arg_type, default in self.get_ix_func_params():
+            if arg_name in account_columns:
+                arg_type = "AccountColumn"
+            elif arg_name in columns:
+                arg_type = f"Union[{arg_type}, Sequence[{arg_type}]]"
+            params.append((arg_name, arg_type, default))
+
+        code = [f"def {instr_name}_many(\n"]
+        code += self.render_func_params(params)
+        code += [
+            ") -> List[TransactionInstruction]:\n",
+            f"    n_instructions = batch_size({', '.join(columns)})\n",
+            "\n",
+        ]
+
+        for account, account_name in self.instr_accounts:
+            if account.is_array:
+                code += self.generate_ix_func_key_preprocessor(account, account_name)
+                code.append("\n")
+
+        for account, account_name in single_accounts:
+            is_signer = self.get_account_signer_expr(account, account_name)
+            code += [
+                f"    {account_name} = meta_column(\n",
+                f"        {account_name},\n",
+                f"        n_instructions,\n",
+                f"        is_signer={is_signer},\n",
+                f"        is_writable={account.is_mut},\n",
+                f"    )\n",
+            ]
+        code.append("\n")
+
+        data_layout = self.get_data_layout()
+        if data_layout is None:
+            # the data is encoded instruction by instruction
+            editor.add_from_import("solmate.batch", "column")
+            row = ", ".join(f"{name}_" for name in columns)
+            values = [name for _, name in single_accounts]
+            values += [f"column({arg.py_name}, n_instructions)" for arg in instr.args]
+            code += [
+                "    return [\n",
+                f"        {ix_cls}(\n",
+                "            program_id=program_id,\n",
+            ]
+            for account, account_name in self.instr_accounts:
+                if account.is_array:
+                    value = f"copy_metas({account_name})"
+                else:
+                    value = f"{account_name}_"
+                code.append(f"            {account_name}={value},\n")
+            for arg in instr.args:
+                code.append(f"            {arg.py_name}={arg.py_name}_,\n")
+            code += [
+                "        ).to_instruction()\n",
+                f"        for {row} in zip({', '.join(values)})\n",
+                "    ]\n",
+                "\n",
+            ]
+            return code
+
+        editor.add_from_import("solmate.batch", "pack_many")
+        tag = self.codegen.get_instr_tag_value(instr)
+        arg_names = "".join(f"{arg.py_name}, " for arg in instr.args)
+        code += [
+            "    payloads = pack_many(\n",
+            f"        {ix_cls}._data_layout, {tag}, ({arg_names}), n_instructions\n",
+            "    )\n",
+            "\n",
+        ]
+
+        keys = []
+        for account, account_name in self.instr_accounts:
+            if account.is_array:
+                keys.append(f"*(copy_metas({account_name}) or ())")
+            else:
+                keys.append(f"{account_name}_")
+        keys = f"[{', '.join(keys)}]"
+        if any(account.is_optional for account, _ in single_accounts):
+            keys = f"[key for key in {keys} if key is not None]"
+
+        row = "".join(f"{name}_, " for _, name in single_accounts)
+        accounts = "".join(f"{name}, " for _, name in single_accounts)
+        code += [
+            "    return [\n",
+            "        TransactionInstruction(\n",
+            f"            keys={keys},\n",
+            "            program_id=program_id,\n",
+            "            data=payload,\n",
+            "        )\n",
+            f"        for {row}payload in zip({accounts}payloads)\n",
+            "    ]\n",
+            "\n",
+        ]
+        return code
+
     def generate(self):
         """
         Generates python files for constructing and serializing each instruction in the idl
         """
         self.editor = self.codegen.get_editor(
-            f"{self.codegen.root_module}.instructions.{self.instr_name}"
+            f"{self.codegen.root_module}.instructions.{self.instr_name}",
+            inputs=(self.instr, self.codegen.get_instr_tag_value(self.instr)),
         )
 
         ix_cls = self.generate_ix_cls()
@@ -400,6 +673,15 @@ class InstructionCodeGen:
         ix_func = self.generate_ix_func()
         self.editor.set_with_lock(f"ix_fn({self.instr_name})", ix_func)
 
+        ix_many_lock = f"ix_many_fn({self.instr_name})"
+        if self.supports_many():
+            ix_many_func = self.generate_ix_many_func()
+            if ix_many_lock not in self.editor:
+                self.editor.add_lines("\n", "\n")
+            self.editor.set_with_lock(ix_many_lock, ix_many_func)
+        elif ix_many_lock in self.editor:
+            del self.editor[ix_many_lock]
+
 
 class AccountsCodeGen:
     codegen: "CodeGen"
@@ -470,13 +752,92 @@ class AccountsCodeGen:
             )
 
             variant_name = pascal_to_snake(account.name).upper()
-            variant_inst = f"{variant_type}(field={account.name})"
+            if variant_type == "AccountDiscriminant":
+                value = self.codegen.get_accnt_tag_value(account)
+                variant_inst = (
+                    f"{variant_type}(value=0x{value:016X}, field={account.name})"
+                )
+            else:
+                variant_inst = f"{variant_type}(field={account.name})"
             code += [f"    {variant_name} = {variant_inst}\n"]
 
         return code
 
     def generate_accounts_cls_packing_logic(self):
-        return []
+        if self.codegen.accnt_tag_values != "anchor":
+            return []
+
+        self.module_editor.add_from_import("podite", "BYTES_CATALOG")
+        return [
+            "\n",
+            "    @classmethod\n",
+            "    def _inner_from_bytes_partial(cls, buffer, **kwargs):\n",
+            "        discriminator = buffer.read(8)\n",
+            "        entry = _ACCOUNTS_BY_DISCRIMINATOR.get(discriminator)\n",
+            "        if entry is None:\n",
+            '            raise ValueError(f"Unknown account discriminator {discriminator.hex()}")\n',
+            "\n",
+            "        variant, account_type = entry\n",
+            "        return variant(BYTES_CATALOG.unpack_partial(account_type, buffer, **kwargs))\n",
+            "\n",
+        ]
+
+    def generate_accounts_dispatch_table(self):
+        """
+        Generates the module-level table used by the packing logic to find the variant of an account
+        """
+        if self.codegen.accnt_tag_values != "anchor":
+            return None, []
+
+        code = [
+            "# account discriminator to (variant, account type)\n",
+            "_ACCOUNTS_BY_DISCRIMINATOR = {\n",
+        ]
+        for account in self.accounts:
+            variant = pascal_to_snake(account.name).upper()
+            value = self.codegen.get_accnt_tag_value(account)
+            discriminator = "".join(f"\\x{b:02x}" for b in value.to_bytes(8, "little"))
+            code.append(
+                f'    b"{discriminator}": (Accounts.{variant}, {account.name}),\n'
+            )
+        code.append("}\n")
+
+        return "accounts_by_discriminator", code
+
+    def generate_accounts_filters(self):
+        """
+        Generates the getProgramAccounts filter builders (see solmate.filters) of the accounts whose
+        fields have a fixed layout
+        """
+        editor = self.module_editor
+        code = []
+        for account in self.accounts:
+            if self.codegen.get_struct_layout(account) is None:
+                continue
+
+            view_type = f"{account.name}View"
+            editor.add_from_import(
+                f"{self.codegen.root_module}.types.{pascal_to_snake(account.name)}",
+                view_type,
+            )
+            editor.add_from_import("solmate.filters", "FilterBuilder")
+
+            variant = pascal_to_snake(account.name).upper()
+            if self.codegen.accnt_tag_values == "anchor":
+                value = self.codegen.get_accnt_tag_value(account)
+                discriminator = "".join(
+                    f"\\x{b:02x}" for b in value.to_bytes(8, "little")
+                )
+                code.append(
+                    f'    {variant} = FilterBuilder({view_type}, discriminator=b"{discriminator}")\n'
+                )
+            else:
+                code.append(f"    {variant} = FilterBuilder({view_type})\n")
+
+        if not code:
+            return []
+
+        return ["class Filters:\n"] + code
 
     def generate_accounts_cls_packing_methods(self):
         add_packing_methods(self.module_editor, is_struct=True)
@@ -489,6 +850,20 @@ class AccountsCodeGen:
         if self.module_editor.set_with_lock("accounts", code):
             self.generate_accounts_cls_packing_methods()
 
+        lock_name, table = self.generate_accounts_dispatch_table()
+        if table:
+            if lock_name not in self.module_editor:
+                self.module_editor.add_lines("\n", "\n")
+            self.module_editor.set_with_lock(lock_name, table)
+
+        filters = self.generate_accounts_filters()
+        if filters:
+            if "filters" not in self.module_editor:
+                self.module_editor.add_lines("\n", "\n")
+            self.module_editor.set_with_lock("filters", filters)
+        elif "filters" in self.module_editor:
+            del self.module_editor["filters"]
+
     def generate(self):
         codegen = self.codegen
 
@@ -519,6 +894,14 @@ class CodeGen:
                               argument defaults for convenience
     :param instr_tag_values: Determines how large the instruction tag should be. For anchor programs use "anchor" or omit the arg
     :param accnt_tag_values: Determines how large the account tag should be. For anchor programs use "anchor" or omit the arg
+    :param incremental: If true, a manifest of idl-fragment hashes is kept next to the generated code and modules
+                        whose inputs did not change are neither re-read nor re-written
+    :param lazy_imports: If true, the generated packages import their submodules on first attribute access
+    :param specialized_codecs: If true, types get generated straight-line (borsh) codecs instead of relying on
+                               podite's per-field reflection. The encoding does not change.
+    :param bundle: If true, the whole client is written into a single module (<root_module>.py) that exports
+                   the same names (and submodules) as the package that is generated otherwise
+    :param profiler: A CodeGenProfiler that records the time and i/o of every generation phase and idl item
     """
 
     idl: Idl
@@ -546,7 +929,16 @@ class CodeGen:
         ]
     ]
 
+    incremental: bool
+    lazy_imports: bool
+    specialized_codecs: bool
+    bundle: bool
+    profiler: NullProfiler
+
     _editors: Dict[str, CodeEditor]
+    _manifest: Dict[str, str]  # module name to fingerprint of the previous run
+    _fingerprints: Dict[str, str]  # module name to fingerprint of this run
+    _fresh: Set[str]  # modules whose fingerprint did not change since the previous run
     _all_defined_types: Set[str]  # all type names for this module
     _defined_types: Set[str]  # all type names for which code is generated
     _expected_types: Set[str]  # all type names used somewhere in this module
@@ -563,13 +955,28 @@ class CodeGen:
         instr_tag_values="incremental[U8]",
         accnt_tag_values="incremental[U8]",
         skip_types=None,
+        incremental=False,
+        lazy_imports=False,
+        specialized_codecs=False,
+        bundle=False,
+        profiler=None,
     ):
+        if bundle and (incremental or lazy_imports):
+            raise ValueError(
+                "bundle cannot be combined with incremental or lazy_imports"
+            )
+
         self.idl = idl
         self.addresses = addresses
         self.root_module = root_module
         self.source_path = source_path
         self.instr_tag_values = instr_tag_values  # type: ignore
         self.accnt_tag_values = accnt_tag_values  # type: ignore
+        self.incremental = incremental
+        self.lazy_imports = lazy_imports
+        self.specialized_codecs = specialized_codecs
+        self.bundle = bundle
+        self.profiler = NullProfiler() if profiler is None else profiler
 
         if external_types is None:
             self.external_types = dict()
@@ -595,7 +1002,117 @@ class CodeGen:
         for type_def in self.get_type_definitions():
             self._all_defined_types.add(type_def.name)
 
-    def get_editor(self, name, is_file=True) -> CodeEditor:
+        # instruction (by identity) to its position in the idl, for the incremental tags
+        self._instr_indices = {
+            id(instr): i for i, instr in enumerate(self.idl.instructions or [])
+        }
+
+        self._fingerprints = {}
+        self._fresh = set()
+        self._manifest = self.load_manifest() if incremental else {}
+        self._previous_modules = self.load_previous_modules() if incremental else set()
+
+    @property
+    def bundle_path(self):
+        subpath = self.root_module.replace(".", "/")
+        return os.path.join(self.source_path, f"{subpath}.py")
+
+    @property
+    def manifest_path(self):
+        subpath = self.root_module.replace(".", "/")
+        return os.path.join(self.source_path, subpath, MANIFEST_FILENAME)
+
+    def get_config_fingerprint(self):
+        """
+        Fingerprint of everything (other than the idl fragment itself) that affects the generated code
+        """
+        config = (
+            solmate.__version__,
+            f"{type(self).__module__}.{type(self).__qualname__}",
+            self.root_module,
+            self.instr_tag_values,
+            self.accnt_tag_values,
+            self.addresses,
+            self.default_accounts,
+            self.external_types,
+            sorted(self.skip_types),
+            sorted(self._all_defined_types),
+            self.lazy_imports,
+            self.specialized_codecs,
+        )
+        return sha256(stable_repr(config).encode()).hexdigest()
+
+    def get_fingerprint(self, inputs):
+        preimage = self.get_config_fingerprint() + stable_repr(inputs)
+        return sha256(preimage.encode()).hexdigest()
+
+    def read_manifest(self) -> Optional[dict]:
+        if not os.path.exists(self.manifest_path):
+            return None
+
+        with open(self.manifest_path, "r") as fin:
+            manifest = json.load(fin)
+
+        if manifest.get("version") != MANIFEST_VERSION:
+            return None
+
+        return manifest
+
+    def load_manifest(self) -> Dict[str, str]:
+        manifest = self.read_manifest()
+        if manifest is None or manifest.get("config") != self.get_config_fingerprint():
+            return {}
+
+        return manifest["modules"]
+
+    def load_previous_modules(self) -> Set[str]:
+        """
+        Returns the modules written by the previous run, whatever its config (e.g. removing a type
+        changes the config but its module still has to be deleted)
+        """
+        manifest = self.read_manifest()
+        if manifest is None:
+            return set()
+
+        return set(manifest["modules"])
+
+    def get_stale_files(self) -> List[str]:
+        """
+        Returns the files of the modules written by the previous run that this run did not generate,
+        e.g. the modules of the types and instructions removed from the idl
+        """
+        stale_files = []
+        for name in sorted(self._previous_modules.difference(self._fingerprints)):
+            filepath = os.path.join(self.source_path, name.replace(".", "/") + ".py")
+            if os.path.exists(filepath):
+                stale_files.append(filepath)
+
+        return stale_files
+
+    def get_manifest_source(self) -> Optional[str]:
+        """
+        Returns the content of the manifest file or None if it does not need to be updated
+        """
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "config": self.get_config_fingerprint(),
+            "modules": dict(sorted(self._fingerprints.items())),
+        }
+        if self._manifest == manifest["modules"] and os.path.exists(
+            self.manifest_path
+        ):
+            return None
+
+        return json.dumps(manifest, indent=2) + "\n"
+
+    def get_editor(self, name, is_file=True, inputs=None) -> CodeEditor:
+        """
+        Returns the editor of the given module.
+
+        :param inputs: The idl fragment(s) that fully determine the module's content. In incremental mode,
+                       if the fingerprint of inputs matches the previous run, the file is not loaded and
+                       the returned editor is only used in memory (it is never saved).
+        """
         if name not in self._editors:
             subpath = name.replace(".", "/")
             if not is_file:
@@ -603,8 +1120,23 @@ class CodeGen:
             subpath += ".py"
 
             fullpath = os.path.join(self.source_path, subpath)
-            self._editors[name] = CodeEditor(fullpath)
-            self._editors[name].load()
+            editor = CodeEditor(
+                fullpath,
+                lazy_imports=self.lazy_imports and not is_file,
+                profiler=self.profiler,
+            )
+            self._editors[name] = editor
+
+            if self.incremental and inputs is not None:
+                fingerprint = self.get_fingerprint(inputs)
+                self._fingerprints[name] = fingerprint
+                if self._manifest.get(name) == fingerprint and os.path.exists(
+                    fullpath
+                ):
+                    self._fresh.add(name)
+                    return editor
+
+            editor.load()
 
         return self._editors[name]
 
@@ -690,118 +1222,542 @@ class CodeGen:
             return
 
         module_editor = self.get_editor(f"{self.root_module}.types", is_file=False)
+        preceding_types = []
         for type_def in type_definitions:
-            editor = self.get_editor(
-                f"{self.root_module}.types.{camel_to_snake(type_def.name)}"
-            )
-            editor.add_from_import("podite", "pod")
+            with self.profiler.phase("type", type_def.name):
+                self.generate_type(module_editor, type_def, preceding_types)
+            preceding_types = preceding_types + [type_def.name]
 
-            class_code = ["@pod\n"]
-            if type_def.type.is_a(IdlTypeDefinitionTy.STRUCT):
-                class_code += [f"class {type_def.name}:\n"]
-                has_field = False
-                for field in type_def.type.field.fields:
-                    field_name = camel_to_snake(field.name)
-                    field_type = self.get_type_as_string(
-                        field.type, editor, within_types=True
-                    )
-                    class_code.append(f"    {field_name}: {field_type}\n")
-                    has_field = True
-
-                if not has_field:
-                    class_code += ["    pass\n"]
+    def generate_type(self, module_editor, type_def, preceding_types):
+        """
+        Generates the python file of a single type defined in the idl
+        """
+        layout = self.get_struct_layout(type_def)
+        editor = self.get_editor(
+            f"{self.root_module}.types.{camel_to_snake(type_def.name)}",
+            inputs=(
+                type_def,
+                preceding_types,
+                layout,
+                self.get_referenced_type_kinds(type_def),
+            ),
+        )
+        editor.add_from_import("podite", "pod")
 
+        class_code = ["@pod\n"]
+        if type_def.type.is_a(IdlTypeDefinitionTy.STRUCT):
+            class_code += [f"class {type_def.name}:\n"]
+            has_field = False
+            for field in type_def.type.field.fields:
+                field_name = camel_to_snake(field.name)
+                field_type = self.get_type_as_string(
+                    field.type, editor, within_types=True
+                )
+                class_code.append(f"    {field_name}: {field_type}\n")
+                has_field = True
+
+            if not has_field:
+                class_code += ["    pass\n"]
+
+            codec_code, codec_tables = self.generate_struct_codec(type_def, editor)
+            class_code += codec_code
+
+        else:
+            editor.add_from_import("podite", "Enum")
+
+            metadata = type_def.metadata or {}
+            tag_type = metadata.get("repr", None)
+            if tag_type is None:
+                tag_type = "AutoTagType"
+            elif tag_type in ["u8", "u16", "u32", "u64", "u128"]:
+                tag_type = tag_type.upper()
             else:
-                editor.add_from_import("podite", "Enum")
-
-                metadata = type_def.metadata or {}
-                tag_type = metadata.get("repr", None)
-                if tag_type is None:
-                    tag_type = "AutoTagType"
-                elif tag_type in ["u8", "u16", "u32", "u64", "u128"]:
-                    tag_type = tag_type.upper()
+                raise ValueError(f"Unknown tag type {tag_type}")
+
+            editor.add_from_import("podite", tag_type)
+            class_code += [f"class {type_def.name}(Enum[{tag_type}]):\n"]
+            variants = type_def.type.field.variants
+            is_flags = metadata.get("flags", False)
+            for i, variant in enumerate(variants):
+                if is_flags:
+                    variant_value = f"2 ** {i}"
+                else:
+                    variant_value = f"{i}"
+
+                variant_field = None
+
+                if variant.fields is None:
+                    pass
+
+                elif variant.fields.is_a(EnumFields.NAMED):
+                    editor.add_from_import("podite", "named_fields")
+                    editor.add_from_import("podite", "Option")
+
+                    named_fields = []
+                    for field in variant.fields.field:
+                        field_name = field.name
+                        field_type = self.get_type_as_string(
+                            field.type,
+                            editor,
+                            within_types=True,
+                            explicit_forward_ref=True,
+                        )
+                        named_fields.append(f"{field_name}={field_type}")
+
+                    if len(named_fields) > 0:
+                        variant_field = (
+                            "field=named_fields(" + ", ".join(named_fields) + ")"
+                        )
                 else:
-                    raise ValueError(f"Unknown tag type {tag_type}")
-
-                editor.add_from_import("podite", tag_type)
-                class_code += [f"class {type_def.name}(Enum[{tag_type}]):\n"]
-                variants = type_def.type.field.variants
-                is_flags = metadata.get("flags", False)
-                for i, variant in enumerate(variants):
-                    if is_flags:
-                        variant_value = f"2 ** {i}"
-                    else:
-                        variant_value = f"{i}"
-
-                    variant_field = None
-
-                    if variant.fields is None:
-                        pass
-
-                    elif variant.fields.is_a(EnumFields.NAMED):
-                        editor.add_from_import("podite", "named_fields")
-                        editor.add_from_import("podite", "Option")
-
-                        named_fields = []
-                        for field in variant.fields.field:
-                            field_name = field.name
-                            field_type = self.get_type_as_string(
-                                field.type,
+                    tuple_fields = []
+                    for field_type in variant.fields.field:
+                        tuple_fields.append(
+                            self.get_type_as_string(
+                                field_type,
                                 editor,
                                 within_types=True,
                                 explicit_forward_ref=True,
                             )
-                            named_fields.append(f"{field_name}={field_type}")
+                        )
+
+                    if len(tuple_fields) == 1:
+                        variant_field = tuple_fields[0]
+                    elif len(tuple_fields) > 1:
+                        editor.add_from_import("typing", "Tuple")
+                        variant_field = "Tuple[" + ", ".join(tuple_fields) + "]"
+
+                variant_name = pascal_to_snake(variant.name).upper()
+                variant_params = []
+                if variant_value is not None:
+                    variant_params.append(variant_value)
+                if variant_field is not None:
+                    variant_params.append(variant_field)
+
+                editor.add_from_import("podite", "Variant")
+                variant_type = "Variant(" + ", ".join(variant_params) + ")"
+                class_code += [f"    {variant_name} = {variant_type}\n"]
+
+            if not variants:
+                class_code += ["    pass\n"]
+
+            codec_code, codec_tables = self.generate_enum_codec(
+                type_def, tag_type, editor
+            )
+            class_code += codec_code
 
-                        if len(named_fields) > 0:
-                            variant_field = (
-                                "field=named_fields("
-                                + ", ".join(named_fields)
-                                + ")"
-                            )
-                    else:
-                        tuple_fields = []
-                        for field_type in variant.fields.field:
-                            tuple_fields.append(
-                                self.get_type_as_string(
-                                    field_type,
-                                    editor,
-                                    within_types=True,
-                                    explicit_forward_ref=True,
-                                )
-                            )
+        if editor.set_with_lock(
+            f"class({type_def.name})", class_code, footer_indent="    "
+        ):
+            add_packing_methods(editor, type_def.type.is_a(IdlTypeDefinitionTy.STRUCT))
+
+        codec_lock = f"codec({type_def.name})"
+        if codec_tables:
+            if codec_lock not in editor:
+                editor.add_lines("\n", "\n")
+            editor.set_with_lock(codec_lock, codec_tables)
+        elif codec_lock in editor:
+            del editor[codec_lock]
+
+        module_editor.add_from_import(
+            f".{camel_to_snake(type_def.name)}", type_def.name
+        )
+
+        if layout:
+            view_code = self.generate_view(type_def, layout, editor)
+            view_lock = f"view({type_def.name})"
+            if view_lock not in editor:
+                editor.add_lines("\n", "\n")
+            editor.set_with_lock(view_lock, view_code)
+            module_editor.add_from_import(
+                f".{camel_to_snake(type_def.name)}", f"{type_def.name}View"
+            )
+
+        self._defined_types.add(type_def.name)
+        self._package_editor.add_import(f"{self.root_module}.types", "types")
 
-                        if len(tuple_fields) == 1:
-                            variant_field = tuple_fields[0]
-                        elif len(tuple_fields) > 1:
-                            editor.add_from_import("typing", "Tuple")
-                            variant_field = "Tuple[" + ", ".join(tuple_fields) + "]"
-
-                    variant_name = pascal_to_snake(variant.name).upper()
-                    variant_params = []
-                    if variant_value is not None:
-                        variant_params.append(variant_value)
-                    if variant_field is not None:
-                        variant_params.append(variant_field)
-
-                    editor.add_from_import("podite", "Variant")
-                    variant_type = "Variant(" + ", ".join(variant_params) + ")"
-                    class_code += [f"    {variant_name} = {variant_type}\n"]
-
-                if not variants:
-                    class_code += ["    pass\n"]
-
-            if editor.set_with_lock(f"class({type_def.name})", class_code):
-                add_packing_methods(
-                    editor, type_def.type.is_a(IdlTypeDefinitionTy.STRUCT)
+    def generate_struct_codec(self, type_def: IdlTypeDefinition, editor: CodeEditor):
+        """
+        Generates straight-line _to_bytes_partial and _from_bytes_partial methods of a struct. Runs of
+        consecutive fixed-size fields are packed with a single struct.Struct and the other fields go
+        through BYTES_CATALOG.
+
+        :return: The code of the methods (within the class) and of the module-level structs
+        """
+        fields = type_def.type.field.fields
+        if not self.specialized_codecs or not fields:
+            return [], []
+
+        editor.add_from_import("podite", "BYTES_CATALOG")
+
+        prefix = f"_{pascal_to_snake(type_def.name).upper()}"
+        tables = []
+        to_code = [
+            "\n",
+            "    @classmethod\n",
+            "    def _to_bytes_partial(cls, buffer, obj, **kwargs):\n",
+        ]
+        from_code = [
+            "\n",
+            "    @classmethod\n",
+            "    def _from_bytes_partial(cls, buffer, **kwargs):\n",
+        ]
+        values = []
+
+        run = []
+
+        def flush_run():
+            if not run:
+                return
+
+            editor.add_from_import("struct", "Struct")
+            run_name = f"{prefix}_RUN_{len(tables)}"
+            layout = "<" + "".join(STRUCT_FORMATS[field.type] for field in run)
+            tables.append(f'{run_name} = Struct("{layout}")\n')
+
+            names = [codec_var_name(field) for field in run]
+            packed = []
+            for field in run:
+                if field.type.is_a(IdlType.PUBLIC_KEY):
+                    packed.append(f"bytes(obj.{camel_to_snake(field.name)})")
+                else:
+                    packed.append(f"obj.{camel_to_snake(field.name)}")
+            to_code.append(
+                f"        buffer.write({run_name}.pack({', '.join(packed)}))\n"
+            )
+
+            targets = ", ".join(names) if len(names) > 1 else f"({names[0]},)"
+            from_code.append(
+                f"        {targets} = {run_name}.unpack(buffer.read({run_name}.size))\n"
+            )
+            run.clear()
+
+        for field in fields:
+            field_name = camel_to_snake(field.name)
+            var_name = codec_var_name(field)
+            if field.type.is_a(IdlType.PUBLIC_KEY):
+                editor.add_from_import("solana.publickey", "PublicKey")
+                values.append(f"{field_name}=PublicKey({var_name})")
+            else:
+                values.append(f"{field_name}={var_name}")
+
+            if field.type in STRUCT_FORMATS:
+                run.append(field)
+                continue
+
+            flush_run()
+            field_type = self.get_type_as_string(field.type, editor, within_types=True)
+            to_code.append(
+                f"        BYTES_CATALOG.pack_partial({field_type}, buffer, obj.{field_name}, **kwargs)\n"
+            )
+            from_code.append(
+                f"        {var_name} = BYTES_CATALOG.unpack_partial({field_type}, buffer, **kwargs)\n"
+            )
+
+        flush_run()
+        from_code.append(f"        return cls({', '.join(values)})\n")
+
+        return to_code + from_code, tables
+
+    def generate_enum_codec(
+        self, type_def: IdlTypeDefinition, tag_type: str, editor: CodeEditor
+    ):
+        """
+        Generates _inner_to_bytes_partial and _inner_from_bytes_partial methods of an enum, which
+        read/write the tag with a struct.Struct and find the variant in a dict table.
+        Enums with AutoTagType only take this path when the tag is a u8 (i.e. in the borsh format).
+
+        :return: The code of the methods (within the class) and of the module-level tables
+        """
+        variants = type_def.type.field.variants
+        if (
+            not self.specialized_codecs
+            or not variants
+            or tag_type not in TAG_STRUCT_FORMATS
+            and tag_type != "AutoTagType"
+        ):
+            return [], []
+
+        editor.add_from_import("podite", "BYTES_CATALOG")
+        editor.add_from_import("struct", "Struct")
+
+        prefix = f"_{pascal_to_snake(type_def.name).upper()}"
+        tag_format = TAG_STRUCT_FORMATS.get(tag_type, "B")
+        tables = [
+            f'{prefix}_TAG = Struct("<{tag_format}")\n',
+            "# tag to (variant, field type)\n",
+            f"{prefix}_BY_TAG = {{\n",
+        ]
+        for variant in variants:
+            variant_name = pascal_to_snake(variant.name).upper()
+            variant_expr = f"{type_def.name}.{variant_name}"
+            if variant.fields is None or not variant.fields.field:
+                field_type = "None"
+            else:
+                field_type = f'{type_def.name}._get_variant("{variant_name}").concrete_field_type'
+            tables.append(f"    int({variant_expr}): ({variant_expr}, {field_type}),\n")
+        tables.append("}\n")
+
+        if tag_type == "AutoTagType":
+            editor.add_from_import("podite", "U8")
+            editor.add_from_import("podite._utils", "AutoTagTypeValueManager")
+            to_fallback = [
+                "        if AutoTagTypeValueManager.get_tag() is not U8:\n",
+                "            return super()._inner_to_bytes_partial(buffer, instance, **kwargs)\n",
+                "\n",
+            ]
+            from_fallback = [
+                "        if AutoTagTypeValueManager.get_tag() is not U8:\n",
+                "            return super()._inner_from_bytes_partial(buffer, **kwargs)\n",
+                "\n",
+            ]
+        else:
+            to_fallback = []
+            from_fallback = []
+
+        code = [
+            "\n",
+            "    @classmethod\n",
+            "    def _inner_to_bytes_partial(cls, buffer, instance, **kwargs):\n",
+            *to_fallback,
+            f"        buffer.write({prefix}_TAG.pack(instance))\n",
+            f"        _, field_type = {prefix}_BY_TAG[int(instance)]\n",
+            "        if field_type is not None:\n",
+            "            BYTES_CATALOG.pack_partial(field_type, buffer, instance.field, **kwargs)\n",
+            "\n",
+            "    @classmethod\n",
+            "    def _inner_from_bytes_partial(cls, buffer, **kwargs):\n",
+            *from_fallback,
+            f"        (tag,) = {prefix}_TAG.unpack(buffer.read({prefix}_TAG.size))\n",
+            f"        entry = {prefix}_BY_TAG.get(tag)\n",
+            "        if entry is None:\n",
+            f'            raise ValueError(f"Unknown {type_def.name} tag {{tag}}")\n',
+            "\n",
+            "        variant, field_type = entry\n",
+            "        if field_type is None:\n",
+            "            return variant\n",
+            "        return variant(BYTES_CATALOG.unpack_partial(field_type, buffer, **kwargs))\n",
+        ]
+
+        return code, tables
+
+    def get_referenced_type_names(self, field_type, names: Set[str]):
+        if field_type.is_a(IdlType.DEFINED):
+            names.add(field_type.field)
+        elif field_type.is_a(IdlType.ARRAY):
+            self.get_referenced_type_names(field_type.field[0], names)
+        elif int(field_type) in (
+            int(IdlType.OPTION),
+            int(IdlType.COPTION),
+            int(IdlType.STATIC),
+            int(IdlType.VEC),
+        ):
+            self.get_referenced_type_names(field_type.field, names)
+
+    def get_referenced_type_kinds(self, type_def: IdlTypeDefinition):
+        """
+        Returns the (name, kind) of the defined types used by the fields of type_def, the kind being
+        "struct", "enum", "external" or "undefined"
+        """
+        names = set()
+        if type_def.type.is_a(IdlTypeDefinitionTy.STRUCT):
+            for field in type_def.type.field.fields:
+                self.get_referenced_type_names(field.type, names)
+        else:
+            for variant in type_def.type.field.variants:
+                if variant.fields is None:
+                    continue
+                if variant.fields.is_a(EnumFields.NAMED):
+                    for field in variant.fields.field:
+                        self.get_referenced_type_names(field.type, names)
+                else:
+                    for field_type in variant.fields.field:
+                        self.get_referenced_type_names(field_type, names)
+
+        kinds = []
+        for name in sorted(names):
+            referenced = self.get_type_definition(name)
+            if referenced is not None:
+                kind = "struct"
+                if not referenced.type.is_a(IdlTypeDefinitionTy.STRUCT):
+                    kind = "enum"
+            elif name in self.external_types:
+                kind = "external"
+            else:
+                kind = "undefined"
+            kinds.append((name, kind))
+
+        return kinds
+
+    def get_type_definition(self, name) -> Optional[IdlTypeDefinition]:
+        for type_def in self.get_type_definitions():
+            if type_def.name == name:
+                return type_def
+
+        return None
+
+    def get_type_size(self, field_type) -> Optional[int]:
+        """
+        Returns the (borsh) size of the type if it is fixed, otherwise None
+        """
+        if field_type in PRIMITIVE_SIZES:
+            return PRIMITIVE_SIZES[field_type]
+        elif field_type.is_a(IdlType.ARRAY):
+            elem_type, n_elem = field_type.field
+            elem_size = self.get_type_size(elem_type)
+            return None if elem_size is None else elem_size * n_elem
+        elif field_type.is_a(IdlType.DEFINED):
+            type_def = self.get_type_definition(field_type.field)
+            if type_def is None:
+                return None
+
+            if type_def.type.is_a(IdlTypeDefinitionTy.STRUCT):
+                layout = self.get_struct_layout(type_def)
+                if layout is None:
+                    return None
+                return sum(size for _, _, size in layout)
+
+            # only enums without fields and with an explicit tag type have a fixed size
+            tag_type = (type_def.metadata or {}).get("repr", None)
+            if tag_type not in TAG_SIZES:
+                return None
+            for variant in type_def.type.field.variants:
+                if variant.fields is not None and variant.fields.field:
+                    return None
+            return TAG_SIZES[tag_type]
+
+        return None
+
+    def get_struct_layout(self, type_def: IdlTypeDefinition):
+        """
+        Returns a list of (field, offset, size) if the type is a struct with fixed-size fields, otherwise None
+        """
+        if not type_def.type.is_a(IdlTypeDefinitionTy.STRUCT):
+            return None
+
+        layout = []
+        offset = 0
+        for field in type_def.type.field.fields:
+            size = self.get_type_size(field.type)
+            if size is None:
+                return None
+
+            layout.append((field, offset, size))
+            offset += size
+
+        return layout
+
+    def generate_view(self, type_def: IdlTypeDefinition, layout, editor: CodeEditor):
+        """
+        Generates a zero-copy view class that decodes the fields of a fixed-size struct lazily
+        """
+        editor.add_from_import("solmate.views", "View")
+
+        size = sum(size for _, _, size in layout)
+        code = [
+            f"class {type_def.name}View(View):\n",
+            "    __slots__ = ()\n",
+            "\n",
+            f"    pod_type = {type_def.name}\n",
+            f"    size = {size}\n",
+        ]
+
+        descrs = [self.get_type_dtype(field.type, editor) for field, _, _ in layout]
+        if all(descr is not None for descr in descrs):
+            code.append("    dtype_descr = [\n")
+            for (field, _, _), descr in zip(layout, descrs):
+                code.append(f'        ("{camel_to_snake(field.name)}", {descr}),\n')
+            code.append("    ]\n")
+
+        # public keys are "32s", the fields without a struct format are decoded by their property
+        code.append("    field_layout = {\n")
+        for field, offset, size in layout:
+            field_format = VIEW_STRUCT_FORMATS.get(field.type)
+            field_format = "None" if field_format is None else f'"{field_format}"'
+            code.append(
+                f'        "{camel_to_snake(field.name)}": ({offset}, {size}, {field_format}),\n'
+            )
+        code.append("    }\n")
+
+        for field, offset, size in layout:
+            code += ["\n", "    @property\n"]
+            code += self.generate_view_property(field, offset, size, editor)
+        code.append("\n")
+
+        return code
+
+    def get_type_dtype(self, field_type, editor: CodeEditor) -> Optional[str]:
+        """
+        Returns the code of the numpy descr of a fixed-size type, or None if there is none
+        """
+        if field_type in PRIMITIVE_DTYPES:
+            return f'"{PRIMITIVE_DTYPES[field_type]}"'
+        elif field_type.is_a(IdlType.ARRAY):
+            elem_type, n_elem = field_type.field
+            elem_descr = self.get_type_dtype(elem_type, editor)
+            return None if elem_descr is None else f"({elem_descr}, ({n_elem},))"
+        elif field_type.is_a(IdlType.DEFINED):
+            type_def = self.get_type_definition(field_type.field)
+            if type_def is None or self.get_type_size(field_type) is None:
+                return None
+
+            if type_def.type.is_a(IdlTypeDefinitionTy.STRUCT):
+                view_type = f"{field_type.field}View"
+                editor.add_from_import(
+                    f"{self.root_module}.types.{pascal_to_snake(field_type.field)}",
+                    view_type,
                 )
+                return f"{view_type}.dtype_descr"
 
-            module_editor.add_from_import(
-                f".{camel_to_snake(type_def.name)}", type_def.name
+            return f'"{TAG_DTYPES[self.get_type_size(field_type)]}"'
+
+        return None
+
+    def generate_view_property(self, field, offset, size, editor: CodeEditor):
+        field_name = camel_to_snake(field.name)
+        field_type = field.type
+        stop = offset + size
+
+        if field_type in VIEW_UNPACKERS:
+            unpacker = VIEW_UNPACKERS[field_type]
+            editor.add_from_import("solmate.views", unpacker)
+            expr = f"{unpacker}(self._buffer, {offset})[0]"
+        elif field_type.is_a(IdlType.BOOL):
+            expr = f"self._buffer[{offset}] != 0"
+        elif field_type.is_a(IdlType.U128) or field_type.is_a(IdlType.I128):
+            signed = field_type.is_a(IdlType.I128)
+            expr = f'int.from_bytes(self._buffer[{offset}:{stop}], "little", signed={signed})'
+        elif field_type.is_a(IdlType.PUBLIC_KEY):
+            editor.add_from_import("solana.publickey", "PublicKey")
+            expr = f"PublicKey(self._buffer[{offset}:{stop}].tobytes())"
+        elif field_type.is_a(IdlType.DEFINED) and self.get_struct_layout(
+            self.get_type_definition(field_type.field)
+        ):
+            view_type = f"{field_type.field}View"
+            editor.add_from_import(
+                f"{self.root_module}.types.{pascal_to_snake(field_type.field)}",
+                view_type,
+            )
+            return [
+                f'    def {field_name}(self) -> "{view_type}":\n',
+                f"        return {view_type}(self._buffer, {offset})\n",
+            ]
+        else:
+            editor.add_from_import("podite", "BYTES_CATALOG")
+            type_str = self.get_type_as_string(
+                field_type, editor, within_types=True, explicit_forward_ref=True
+            )
+            expr = (
+                f"BYTES_CATALOG.unpack({type_str}, self._buffer[{offset}:{stop}].tobytes(), "
+                f'format="FORMAT_BORSH")'
             )
 
-            self._defined_types.add(type_def.name)
-            self._package_editor.add_import(f"{self.root_module}.types", "types")
+        type_str = self.get_type_as_string(
+            field_type, editor, within_types=True, explicit_forward_ref=True
+        )
+        return [
+            f'    def {field_name}(self) -> "{type_str}":\n',
+            f"        return {expr}\n",
+        ]
 
     def generate_addresses(self):
         editor = self.get_editor(f"{self.root_module}.addrs")
@@ -834,6 +1790,36 @@ class CodeGen:
     def generate_instruction(self, module_editor, instr):
         return InstructionCodeGen(self, module_editor, instr).generate()
 
+    def get_instr_tag_format(self) -> Optional[str]:
+        """
+        Returns the struct format of the instruction tag or None if it has none (i.e., U128)
+        """
+        if self.instr_tag_values == "anchor":
+            return "Q"
+
+        return TAG_STRUCT_FORMATS.get(self.instr_tag_values.split(":")[1])
+
+    def get_instr_tag_size(self) -> int:
+        if self.instr_tag_values == "anchor":
+            return 8
+
+        return TAG_SIZES[self.instr_tag_values.split(":")[1].lower()]
+
+    def get_instr_tag_value(self, instr: IdlInstruction) -> int:
+        if self.instr_tag_values == "anchor":
+            return sighash("global", camel_to_snake(instr.name).lower())
+
+        index = self._instr_indices.get(id(instr))
+        if index is None:
+            # e.g. a copy of an instruction of the idl
+            index = self.idl.instructions.index(instr)
+        return index
+
+    def get_accnt_tag_value(self, account: IdlTypeDefinition) -> int:
+        # mirrors AccountDiscriminant.assign_value on the name of the variant
+        variant_name = pascal_to_snake(account.name).upper()
+        return sighash("account", snake_to_pascal(variant_name.lower()))
+
     def generate_instructions(self):
         if not self.idl.instructions:
             return
@@ -842,7 +1828,8 @@ class CodeGen:
             f"{self.root_module}.instructions", is_file=False
         )
         for instr in self.idl.instructions:
-            self.generate_instruction(module_editor, instr)
+            with self.profiler.phase("instruction", instr.name):
+                self.generate_instruction(module_editor, instr)
 
         # generating InstructionTag class
         instr_tag_editor = self.get_editor(
@@ -868,15 +1855,91 @@ class CodeGen:
         ]
         for instr in self.idl.instructions:
             instr_tag_name = camel_to_snake(instr.name).upper()
-            instr_tag_code.append(f"    {instr_tag_name} = {variant_type}()\n")
+            if self.instr_tag_values == "anchor":
+                value = self.get_instr_tag_value(instr)
+                instr_tag_code.append(
+                    f"    {instr_tag_name} = {variant_type}(value=0x{value:016X})\n"
+                )
+            else:
+                instr_tag_code.append(f"    {instr_tag_name} = {variant_type}()\n")
 
         instr_tag_editor.set_with_lock(f"instruction_tag", instr_tag_code)
         module_editor.add_from_import(".instruction_tag", "InstructionTag")
 
+        self.generate_instruction_decoder(module_editor)
+
         self._package_editor.add_import(
             f"{self.root_module}.instructions", "instructions"
         )
 
+    def generate_instruction_decoder(self, module_editor: CodeEditor):
+        """
+        Generates decode_instruction, which finds the instruction class of an instruction from its tag
+        """
+        editor = self.get_editor(f"{self.root_module}.instructions.decoder")
+        editor.add_from_import("solana.transaction", "TransactionInstruction")
+        editor.add_from_import("solana.publickey", "PublicKey")
+        editor.add_from_import("typing", "Iterable")
+        editor.add_from_import("typing", "Optional")
+
+        tag_size = self.get_instr_tag_size()
+        tag_format = self.get_instr_tag_format()
+        code = [
+            "# instruction tag to instruction class\n",
+            "_INSTRUCTIONS_BY_TAG = {\n",
+        ]
+        for instr in self.idl.instructions:
+            instr_name = camel_to_snake(instr.name)
+            ix_cls = f"{snake_to_pascal(instr_name)}Ix"
+            editor.add_from_import(f".{instr_name}", ix_cls)
+
+            value = self.get_instr_tag_value(instr)
+            value = f"0x{value:016X}" if self.instr_tag_values == "anchor" else value
+            code.append(f"    {value}: {ix_cls},\n")
+        code.append("}\n")
+
+        if tag_format is None:
+            tag = f'int.from_bytes(ix.data[:{tag_size}], "little")'
+        else:
+            editor.add_from_import("struct", "Struct")
+            code.append(f'_INSTRUCTION_TAG = Struct("<{tag_format}")\n')
+            tag = "_INSTRUCTION_TAG.unpack_from(ix.data)[0]"
+
+        code += [
+            "\n",
+            "\n",
+            "def decode_instruction(ix: TransactionInstruction):\n",
+            '    """\n',
+            "    Decodes an instruction of the program into its instruction class (i.e. the inverse of\n",
+            "    to_instruction), dispatching on the instruction tag\n",
+            '    """\n',
+            f"    if len(ix.data) < {tag_size}:\n",
+            '        raise ValueError("The instruction data is shorter than the instruction tag")\n',
+            "\n",
+            f"    ix_cls = _INSTRUCTIONS_BY_TAG.get({tag})\n",
+            "    if ix_cls is None:\n",
+            f'        raise ValueError(f"Unknown instruction tag {{ix.data[:{tag_size}].hex()}}")\n',
+            "\n",
+            "    return ix_cls.from_instruction(ix)\n",
+            "\n",
+            "\n",
+            "def decode_instructions(\n",
+            "    instructions: Iterable[TransactionInstruction],\n",
+            "    program_id: Optional[PublicKey] = None,\n",
+            "):\n",
+            '    """\n',
+            "    Lazily decodes a stream of instructions, skipping the instructions of the other programs\n",
+            "    if program_id is given\n",
+            '    """\n',
+            "    for ix in instructions:\n",
+            "        if program_id is None or ix.program_id == program_id:\n",
+            "            yield decode_instruction(ix)\n",
+        ]
+        editor.set_with_lock("decoder", code, footer_indent="")
+
+        module_editor.add_from_import(".decoder", "decode_instruction")
+        module_editor.add_from_import(".decoder", "decode_instructions")
+
     def generate_events(self):
         if not self.idl.events:
             return
@@ -922,16 +1985,21 @@ class CodeGen:
         print("Skipping state...")
 
     def generate_code(self, check_missing_types=False):
-        self._package_editor = self.get_editor(self.root_module, is_file=False)
-
-        self.generate_addresses()
-        self.generate_types()
-        self.generate_constants()
-        self.generate_accounts()
-        self.generate_instructions()
-        self.generate_events()
-        self.generate_errors()
-        self.generate_state()
+        with self.profiler.phase("package"):
+            self._package_editor = self.get_editor(self.root_module, is_file=False)
+
+        for phase, generate in (
+            ("addresses", self.generate_addresses),
+            ("types", self.generate_types),
+            ("constants", self.generate_constants),
+            ("accounts", self.generate_accounts),
+            ("instructions", self.generate_instructions),
+            ("events", self.generate_events),
+            ("errors", self.generate_errors),
+            ("state", self.generate_state),
+        ):
+            with self.profiler.phase(phase):
+                generate()
 
         undefined_types = self._expected_types.difference(self._defined_types)
         if undefined_types:
@@ -944,9 +2012,152 @@ class CodeGen:
                     f"The following types are used but not defined: {undefined_types}"
                 )
 
+    def get_outputs(self) -> Dict[str, Optional[str]]:
+        """
+        Returns a dict from file path to source code for every file that has to be (re-)written,
+        the source code being None for the stale files that have to be deleted
+        """
+        if self.bundle:
+            return self.get_bundle_outputs()
+
+        outputs = {}
+        with self.profiler.phase("render"):
+            for name, editor in self._editors.items():
+                if name in self._fresh:
+                    continue
+
+                source = editor.get_source_code()
+                if source != editor.loaded_source:
+                    outputs[editor.filepath] = source
+
+        if self.incremental:
+            for filepath in self.get_stale_files():
+                outputs[filepath] = None
+
+            manifest_source = self.get_manifest_source()
+            if manifest_source is not None:
+                outputs[self.manifest_path] = manifest_source
+
+        return outputs
+
+    def get_bundle_outputs(self) -> Dict[str, str]:
+        with self.profiler.phase("render"):
+            sources = {
+                name: editor.get_source_code() for name, editor in self._editors.items()
+            }
+
+        with self.profiler.phase("bundle"):
+            source = bundle_modules(self.root_module, sources)
+
+        if os.path.exists(self.bundle_path):
+            with open(self.bundle_path, "r") as fin:
+                if fin.read() == source:
+                    return {}
+
+        return {self.bundle_path: source}
+
     def save_modules(self):
-        for editor in self._editors.values():
-            editor.save()
+        outputs = self.get_outputs()
+        with self.profiler.phase("save_modules"):
+            for filepath, source in outputs.items():
+                if source is None:
+                    remove_source(filepath)
+                    continue
+
+                write_source(filepath, source)
+                self.profiler.on_write(filepath, len(source.encode()))
+
+
+# struct formats of the fixed-size primitives (bool and 128-bit integers are left to podite)
+STRUCT_FORMATS = {
+    IdlType.U8: "B",
+    IdlType.I8: "b",
+    IdlType.U16: "H",
+    IdlType.I16: "h",
+    IdlType.U32: "I",
+    IdlType.I32: "i",
+    IdlType.U64: "Q",
+    IdlType.I64: "q",
+    IdlType.PUBLIC_KEY: "32s",
+}
+TAG_STRUCT_FORMATS = {"U8": "B", "U16": "H", "U32": "I", "U64": "Q"}
+TAG_SIZES = {"u8": 1, "u16": 2, "u32": 4, "u64": 8, "u128": 16}
+TAG_DTYPES = {1: "u1", 2: "<u2", 4: "<u4", 8: "<u8", 16: "V16"}
+
+PRIMITIVE_SIZES = {
+    IdlType.BOOL: 1,
+    IdlType.U8: 1,
+    IdlType.I8: 1,
+    IdlType.U16: 2,
+    IdlType.I16: 2,
+    IdlType.U32: 4,
+    IdlType.I32: 4,
+    IdlType.U64: 8,
+    IdlType.I64: 8,
+    IdlType.U128: 16,
+    IdlType.I128: 16,
+    IdlType.PUBLIC_KEY: 32,
+}
+PRIMITIVE_DTYPES = {
+    IdlType.BOOL: "?",
+    IdlType.U8: "u1",
+    IdlType.I8: "i1",
+    IdlType.U16: "<u2",
+    IdlType.I16: "<i2",
+    IdlType.U32: "<u4",
+    IdlType.I32: "<i4",
+    IdlType.U64: "<u8",
+    IdlType.I64: "<i8",
+    IdlType.U128: "V16",
+    IdlType.I128: "V16",
+    IdlType.PUBLIC_KEY: "V32",
+}
+VIEW_STRUCT_FORMATS = {IdlType.BOOL: "?", **STRUCT_FORMATS}
+VIEW_UNPACKERS = {
+    IdlType.U8: "unpack_u8",
+    IdlType.I8: "unpack_i8",
+    IdlType.U16: "unpack_u16",
+    IdlType.I16: "unpack_i16",
+    IdlType.U32: "unpack_u32",
+    IdlType.I32: "unpack_i32",
+    IdlType.U64: "unpack_u64",
+    IdlType.I64: "unpack_i64",
+}
+
+
+def codec_var_name(field: IdlField) -> str:
+    # local variable holding the field in the generated codecs (avoiding the method's own names)
+    name = camel_to_snake(field.name)
+    if name in ("cls", "buffer", "obj", "kwargs"):
+        name += "_"
+    return name
+
+
+MANIFEST_FILENAME = ".solmate-manifest.json"
+MANIFEST_VERSION = 1
+
+
+def stable_repr(value):
+    """
+    Like repr, but stable across processes for the callables used in codegen configs
+    (i.e., functions, closures and partials do not include their memory address)
+    """
+    if isinstance(value, partial):
+        return (
+            f"partial({stable_repr(value.func)}, "
+            f"{stable_repr(value.args)}, {stable_repr(value.keywords)})"
+        )
+    elif isinstance(value, dict):
+        items = sorted((stable_repr(k), stable_repr(v)) for k, v in value.items())
+        return "{" + ", ".join(f"{k}: {v}" for k, v in items) + "}"
+    elif isinstance(value, (list, tuple)):
+        return "[" + ", ".join(stable_repr(v) for v in value) + "]"
+    elif callable(value) and hasattr(value, "__qualname__"):
+        closure = getattr(value, "__closure__", None) or ()
+        cells = [cell.cell_contents for cell in closure]
+        return f"{value.__module__}.{value.__qualname__}{stable_repr(cells)}"
+
+    return repr(value)
 
 
 #########################
@@ -969,6 +2180,44 @@ def program_error_type(editor: CodeEditor):
     return "ProgramError"
 
 
+def get_common_external_types() -> Dict[str, Callable[[CodeEditor], str]]:
+    return {
+        "usize": usize_type,
+        "UnixTimestamp": unix_timestamp_type,
+        "ProgramError": program_error_type,
+    }
+
+
+def import_qualified_name(qualified_name: str, editor: CodeEditor, as_clause=None):
+    """
+    Imports an object given its fully qualified name (e.g. "solana.sysvar.SYSVAR_RENT_PUBKEY")
+    """
+    from_clause, import_clause = qualified_name.rsplit(".", maxsplit=1)
+    if as_clause is None or as_clause == import_clause:
+        editor.add_from_import(from_clause, import_clause)
+        return import_clause
+
+    editor.add_from_import(from_clause, import_clause, as_clause)
+    return as_clause
+
+
+def import_defined_type(root_module: str, name: str, editor: CodeEditor):
+    editor.add_from_import(f"{root_module}.types.{pascal_to_snake(name)}", name)
+    return name
+
+
+def defined_types_to_imports(
+    root_module: str, type_names: Iterable[str]
+) -> Dict[str, Callable[[CodeEditor], str]]:
+    """
+    Returns external types that allow other idls to reference the types generated under root_module.
+    Unlike closures, the returned callables can be pickled (e.g., sent to worker processes).
+    """
+    return {
+        name: partial(import_defined_type, root_module, name) for name in type_names
+    }
+
+
 def cli(
     idl_path: str,
     addresses: Dict[str, str],
@@ -979,8 +2228,17 @@ def cli(
     instr_tag_values: Literal["anchor", "incremental"],
     accnt_tag_values: Literal["anchor", "incremental"],
     external_types: Dict[str, Callable[[CodeEditor], str]] = None,
+    incremental: bool = False,
+    lazy_imports: bool = False,
+    specialized_codecs: bool = False,
+    bundle: bool = False,
+    profiler: Optional[NullProfiler] = None,
 ):
-    idl = Idl.from_json_file(idl_path)
+    if profiler is None:
+        profiler = NullProfiler()
+
+    with profiler.phase("load_idl"):
+        idl = Idl.from_json_file(idl_path)
     idl.types = list(filter(lambda x: x.name not in skip_types, idl.types))
 
     external_types = {
@@ -1000,6 +2258,11 @@ def cli(
         instr_tag_values=instr_tag_values,
         accnt_tag_values=accnt_tag_values,
         skip_types=skip_types,
+        incremental=incremental,
+        lazy_imports=lazy_imports,
+        specialized_codecs=specialized_codecs,
+        bundle=bundle,
+        profiler=profiler,
     )
     codegen.generate_code(check_missing_types=not True)
     codegen.save_modules()
@@ -1,9 +1,13 @@
 import os
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from io import StringIO
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pathlib import Path
 
+from .profiler import NullProfiler
+
 LOCK_HEADER = "# LOCK-BEGIN["
 LOCK_FOOTER = "# LOCK-END"
 LOCK_WARNING = "]: DON'T MODIFY"
@@ -51,30 +55,152 @@ class ImportCollector:
 
         return code
 
+    def as_lazy_source_code(self):
+        """
+        Generates the imports of a package so that they are only executed on first access (PEP 562).
+        The eager imports are kept under TYPE_CHECKING for type checkers and IDEs.
+        """
+        attrs = []
+        for import_clause in sorted(self._imports):
+            module, _, name = import_clause.partition(" as ")
+            if not name:
+                module = name = module.split(".")[0]
+            attrs.append((name, module, None))
+
+        for from_clause, import_clauses in sorted(self._from_imports.items()):
+            for clause in sorted(import_clauses):
+                import_name, _, name = clause.partition(" as ")
+                attrs.append((name or import_name, from_clause, import_name))
+
+        if not attrs:
+            return []
+
+        code = [
+            "from typing import TYPE_CHECKING\n",
+            "\n",
+            "from solmate.lazy import lazy_attrs\n",
+            "\n",
+            "if TYPE_CHECKING:\n",
+        ]
+        code += [
+            f"    {line}" if line != "\n" else line
+            for line in self.as_source_code()[:-1]
+        ]
+        code += [
+            "\n",
+            "__getattr__, __dir__ = lazy_attrs(\n",
+            "    __name__,\n",
+            "    {\n",
+        ]
+        for name, module, import_name in sorted(attrs):
+            import_name = "None" if import_name is None else f'"{import_name}"'
+            code.append(f'        "{name}": ("{module}", {import_name}),\n')
+        code += [
+            "    },\n",
+            ")\n",
+            "\n",
+        ]
+
+        return code
+
+
+class _Piece:
+    """
+    A run of consecutive lines. Named pieces are locks; unnamed pieces hold free (user) code.
+    """
+
+    __slots__ = ("name", "lines")
+
+    def __init__(self, name, lines):
+        self.name = name
+        self.lines = lines
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __repr__(self):
+        return f"_Piece({self.name!r}, {len(self.lines)} lines)"
+
 
 class CodeEditor:
+    """
+    The lines of the file are stored as a list of pieces (a piece table) where every lock is exactly
+    one piece. Replacing the content of a lock or appending a new one is O(1) and does not touch the
+    other locks. Line-number based edits use a lazily (re)computed sorted index of piece offsets.
+    """
+
     _filepath: str
-    _lines: List[str]
-    _locks: Dict[str, slice]
+    _pieces: List[_Piece]
+    _locks: Dict[str, _Piece]
+    _n_lines: int
+    _offsets: Optional[List[int]]  # start line of each piece, None if stale
+    _index: Dict[str, int]  # lock name to index of its piece, valid when _offsets is
     _imports: ImportCollector
+    _source: Optional[str]  # content of the file when it was loaded
+    lazy_imports: bool  # whether the imports are generated as lazy (PEP 562) attributes
+    profiler: NullProfiler
 
-    def __init__(self, filepath):
+    def __init__(self, filepath, lazy_imports=False, profiler=None):
         self._filepath = filepath
-        self._lines = []
+        self._pieces = []
         self._locks = {}
+        self._n_lines = 0
+        self._offsets = None
+        self._index = {}
         self._imports = ImportCollector()
+        self._source = None
+        self.lazy_imports = lazy_imports
+        self.profiler = NullProfiler() if profiler is None else profiler
+
+    @property
+    def filepath(self):
+        return self._filepath
+
+    @property
+    def loaded_source(self):
+        return self._source
 
     @property
     def locks(self):
-        return self._locks.copy()
+        offsets = self._get_offsets()
+        return {
+            piece.name: slice(offset, offset + len(piece))
+            for offset, piece in zip(offsets, self._pieces)
+            if piece.name is not None
+        }
 
     @property
     def imports(self):
         return self._imports
 
+    @property
+    def lines(self):
+        return [line for piece in self._pieces for line in piece.lines]
+
+    def _get_offsets(self):
+        if self._offsets is None:
+            offsets = []
+            index = {}
+            offset = 0
+            for i, piece in enumerate(self._pieces):
+                offsets.append(offset)
+                offset += len(piece)
+                if piece.name is not None:
+                    index[piece.name] = i
+
+            self._offsets = offsets
+            self._index = index
+
+        return self._offsets
+
+    def _get_lock_slice(self, name):
+        offsets = self._get_offsets()
+        start = offsets[self._index[name]]
+        return slice(start, start + len(self._locks[name]))
+
     def _to_slice(self, key):
         if isinstance(key, str):
-            key = self._locks[key]
+            key = self._get_lock_slice(key)
         elif isinstance(key, int):
             key = slice(key, key + 1)
         elif not isinstance(key, slice):
@@ -83,7 +209,7 @@ class CodeEditor:
         return key
 
     def __len__(self):
-        return len(self._lines)
+        return self._n_lines
 
     def __str__(self):
         return f"CodeEditor({self._filepath})"
@@ -95,92 +221,163 @@ class CodeEditor:
         self[key] = []
 
     def __getitem__(self, key):
-        key = self._to_slice(key)
-
-        return self._lines[key]
-
-    def __setitem__(self, key, new_lines):
         if isinstance(key, str):
-            name = key
-            if name not in self._locks:
-                key = slice(len(self), len(self))
-        else:
-            name = None
+            return list(self._locks[key].lines)
 
         key = self._to_slice(key)
-        start = key.start if key.start is not None else 0
-        stop = key.stop if key.stop is not None else len(self)
 
-        contained = self._get_contained_locks(start, stop)
-        for name, count in contained.items():
-            if count == 1:
-                raise ValueError(f"Lines {key} have intersection with lock {name}")
-
-        for name in contained:
-            del self._locks[name]
+        return self.lines[key]
 
+    def __setitem__(self, key, new_lines):
         if isinstance(new_lines, str):
             new_lines = [new_lines]
+        new_lines = list(new_lines)
 
-        self._lines = self._lines[:start] + new_lines + self._lines[stop:]
-        self._shift_lock_boundaries(start, len(new_lines) - (stop - start))
-        if name is not None:
-            self.set_lock(name, start, start + len(new_lines), check=False)
+        if isinstance(key, str):
+            piece = self._locks.get(key)
+            if piece is None:
+                self._append_piece(_Piece(key, new_lines))
+            else:
+                self._n_lines += len(new_lines) - len(piece)
+                if len(new_lines) != len(piece):
+                    self._offsets = None
+                piece.lines = new_lines
+            return
+
+        key = self._to_slice(key)
+        start, stop, _ = key.indices(len(self))
+        self._replace(start, max(start, stop), new_lines)
 
     def __contains__(self, key):
         return key in self._locks
 
-    def _shift_lock_boundaries(self, origin, diff):
-        locks = {}
-        for name, lock in self._locks.items():
-            start = lock.start
-            stop = lock.stop
-
-            if start > origin:
-                start += diff
-
-            if stop > origin:
-                stop += diff
-
-            if start < stop:
-                locks[name] = slice(start, stop)
-
-        self._locks = locks
+    def _append_piece(self, piece):
+        if self._offsets is not None:
+            self._offsets.append(self._n_lines)
+            if piece.name is not None:
+                self._index[piece.name] = len(self._pieces)
+
+        self._pieces.append(piece)
+        self._n_lines += len(piece)
+        if piece.name is not None:
+            self._locks[piece.name] = piece
+
+    def _find_enclosing(self, lineno):
+        """
+        Returns the index of the piece that strictly contains lineno (i.e., start < lineno < stop) or None
+        """
+        offsets = self._get_offsets()
+        index = bisect_left(offsets, lineno) - 1
+        if index >= 0 and lineno < offsets[index] + len(self._pieces[index]):
+            return index
+
+        return None
+
+    def _split(self, lineno):
+        """
+        Makes sure lineno is a piece boundary by splitting the free piece containing it
+        """
+        index = self._find_enclosing(lineno)
+        if index is None:
+            return
 
-    def _get_contained_locks(self, start, stop):
+        piece = self._pieces[index]
+        assert piece.name is None
+        at = lineno - self._offsets[index]
+        self._pieces[index : index + 1] = [
+            _Piece(None, piece.lines[:at]),
+            _Piece(None, piece.lines[at:]),
+        ]
+        self._offsets = None
+
+    def _find_lock(self, start, stop):
+        """
+        Returns the index of the lock that contains lines [start, stop) or None. Insertions at the
+        boundaries of a lock are not considered to be inside it.
+        """
         if start == stop:
-            return {}
+            index = self._find_enclosing(start)
+        else:
+            offsets = self._get_offsets()
+            index = bisect_right(offsets, start) - 1
+            if index < 0 or stop > offsets[index] + len(self._pieces[index]):
+                return None
+
+        if index is None or self._pieces[index].name is None:
+            return None
+
+        return index
+
+    def _replace(self, start, stop, new_lines, name=None):
+        if name is None:
+            index = self._find_lock(start, stop)
+            if index is not None:
+                # edits inside a lock change the content of the lock
+                piece = self._pieces[index]
+                lock_start = self._offsets[index]
+                piece.lines[start - lock_start : stop - lock_start] = new_lines
+                self._n_lines += len(new_lines) - (stop - start)
+                self._offsets = None
+                if not piece.lines:
+                    del self._pieces[index]
+                    del self._locks[piece.name]
+                return
+
+        for lineno in (start, stop):
+            index = self._find_enclosing(lineno)
+            if index is not None and self._pieces[index].name is not None:
+                key = slice(start, stop)
+                raise ValueError(
+                    f"Lines {key} have intersection with lock {self._pieces[index].name}"
+                )
+
+        self._split(start)
+        self._split(stop)
+        offsets = self._get_offsets()
+
+        begin = bisect_left(offsets, start)
+        if start < stop:
+            end = bisect_left(offsets, stop)
+        else:
+            # insertions go after empty pieces and before the piece starting at this line
+            while begin < len(self._pieces) and not self._pieces[begin].lines:
+                begin += 1
+            end = begin
 
-        counts = {}
-        for name, lock in self._locks.items():
-            if start == lock.start or stop == lock.stop:
-                if start < lock.start or lock.stop < stop:
-                    counts[name] = 2
-            else:
-                include_start = (start <= lock.start) and (lock.start < stop)
-                include_end = (start < lock.stop) and (lock.stop <= stop)
-                n_overlaps = include_start + include_end
+        for piece in self._pieces[begin:end]:
+            if piece.name is not None:
+                del self._locks[piece.name]
 
-                if n_overlaps > 0:
-                    counts[name] = n_overlaps
+        new_pieces = []
+        if name is not None:
+            if name in self._locks:
+                self._locks.pop(name).name = None
+            new_pieces.append(_Piece(name, new_lines))
+            self._locks[name] = new_pieces[0]
+        elif new_lines:
+            new_pieces.append(_Piece(None, new_lines))
 
-        return counts
+        self._pieces[begin:end] = new_pieces
+        self._n_lines += len(new_lines) - (stop - start)
+        self._offsets = None
 
     def add_lines(self, *lines, lineno=None):
         if lineno is None:
-            lineno = len(self)
+            self._append_piece(_Piece(None, list(lines)))
+            return
 
         self[lineno:lineno] = list(lines)
 
     def set_lock(self, name, start, stop, check=True):
         if check:
-            for lock in self._locks.values():
+            for lock in self.locks.values():
                 # checking if new lock has intersection with an existing one
                 if max(start, lock.start) <= min(stop, lock.stop):
                     raise RuntimeError(
                         "Failed to set the lock due to non-empty intersection with existing lock."
                     )
-        self._locks[name] = slice(start, stop)
+
+        self._replace(start, stop, self[start:stop], name=name)
 
     @staticmethod
     def _get_indent(line: str):
@@ -196,6 +393,7 @@ class CodeEditor:
         self, name, lines, header_indent=None, footer_indent=None, lineno=None
     ):
         existed = name in self
+        self.profiler.on_lock_edit(self._filepath, name)
         code = self.wrap_with_lock(
             name,
             lines,
@@ -205,7 +403,7 @@ class CodeEditor:
         if lineno is None:
             self[name] = code
         else:
-            self[lineno:lineno] = code
+            self._replace(lineno, lineno, code, name=name)
 
         return not existed
 
@@ -235,24 +433,36 @@ class CodeEditor:
         self._imports.add_from_import(from_clause, import_clause, as_clause)
 
     def get_source_code(self):
-        imports = self._imports.as_source_code()
+        if self.lazy_imports:
+            imports = self._imports.as_lazy_source_code()
+        else:
+            imports = self._imports.as_source_code()
 
         if "imports" in self:
             self.set_with_lock("imports", imports)
         elif self._imports:
-            post_new_line = len(self._lines) > 0
+            post_new_line = len(self) > 0
             self.set_with_lock("imports", imports, lineno=0)
 
             if post_new_line:
                 self.add_lines("\n", "\n", lineno=len(imports) + 2)
 
-        return "".join(self._lines)
+        return "".join(line for piece in self._pieces for line in piece.lines)
+
+    def _set_lines(self, lines):
+        self._pieces = [_Piece(None, lines)] if lines else []
+        self._locks = {}
+        self._n_lines = len(lines)
+        self._offsets = None
 
     def infer_locks(self):
+        lines = self.lines
+        pieces = []
         locks = {}
         name = None
         start = None
-        for lineno, line in enumerate(self._lines):
+        free_start = 0
+        for lineno, line in enumerate(lines):
             stripped = line.strip()
             if stripped.startswith(LOCK_HEADER):
                 if start is not None:
@@ -263,29 +473,65 @@ class CodeEditor:
 
                 start = lineno
                 name = stripped[len(LOCK_HEADER) : -len(LOCK_WARNING)]
-            elif stripped == LOCK_FOOTER:
-                locks[name] = slice(start, lineno + 1)
+            elif stripped == LOCK_FOOTER and start is not None:
+                if free_start < start:
+                    pieces.append(_Piece(None, lines[free_start:start]))
+
+                if name in locks:
+                    locks[name].name = None
+
+                locks[name] = _Piece(name, lines[start : lineno + 1])
+                pieces.append(locks[name])
+                free_start = lineno + 1
                 name = None
                 start = None
 
         if start is not None:
             raise RuntimeError(f"Lock '{name}' never ended.")
 
+        if free_start < len(lines):
+            pieces.append(_Piece(None, lines[free_start:]))
+
+        self._pieces = pieces
         self._locks = locks
+        self._offsets = None
 
     def load(self, infer=True):
         if not os.path.exists(self._filepath):
             return
 
-        with open(self._filepath, "r") as file:
-            self._lines = file.readlines()
+        with self.profiler.phase("load"):
+            with open(self._filepath, "r") as file:
+                self._source = file.read()
+                self._set_lines(StringIO(self._source).readlines())
+            self.profiler.on_read(self._filepath, len(self._source))
 
         if infer:
-            self.infer_locks()
+            with self.profiler.phase("infer_locks"):
+                self.infer_locks()
 
     def save(self):
-        path = Path(self._filepath)
-        path.parent.mkdir(parents=True, exist_ok=True)
+        """
+        Writes the source code to the file unless it is identical to what was loaded,
+        in which case the file (and its mtime) is left untouched. Returns True if written.
+        """
+        source = self.get_source_code()
+        if source == self._source:
+            return False
+
+        write_source(self._filepath, source)
+        self._source = source
+        return True
+
+
+def write_source(filepath, source):
+    path = Path(filepath)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, "w") as file:
+        file.write(source)
+
 
-        with open(path, "w") as file:
-            file.write(self.get_source_code())
+def remove_source(filepath):
+    if os.path.exists(filepath):
+        os.remove(filepath)
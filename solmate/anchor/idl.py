@@ -1,4 +1,8 @@
 import json
+import os
+import pickle
+import sys
+from hashlib import sha256
 from itertools import chain
 from typing import Optional, Tuple  # pylint: disable=unused-import
 
@@ -6,7 +10,8 @@ from podite import pod_json, field, named_fields, Vec, Enum, Variant
 from podite.types.enum import ENUM_TAG_NAME, ENUM_TAG_NAME_MAP
 from podite.json import POD_OPTIONS_RENAME
 
-from solmate.utils import camel_to_snake
+import solmate
+from solmate.utils import camel_to_snake, get_cache_dir
 
 
 def camel_case(name):
@@ -82,6 +87,20 @@ class IdlEnumVariant:
     metadata: Optional[object] = field(default=None)
 
 
+def _named_fields(name, **kwargs):
+    """
+    Same as named_fields, but the class is named so that it (and the idl) can be pickled
+    """
+    cls = named_fields(**kwargs)
+    cls.__name__ = cls.__qualname__ = name
+    cls.__module__ = __name__
+    return cls
+
+
+IdlStructFields = _named_fields("IdlStructFields", fields=Vec[IdlField])
+IdlEnumVariants = _named_fields("IdlEnumVariants", variants=Vec[IdlEnumVariant])
+
+
 @pod_json
 class IdlTypeDefinitionTy(Enum):
     __enum_options__ = {
@@ -89,8 +108,8 @@ class IdlTypeDefinitionTy(Enum):
         ENUM_TAG_NAME_MAP: "lower",
     }
 
-    STRUCT = Variant(field=named_fields(fields=Vec[IdlField]))
-    ENUM = Variant(field=named_fields(variants=Vec[IdlEnumVariant]))
+    STRUCT = Variant(field=IdlStructFields)
+    ENUM = Variant(field=IdlEnumVariants)
 
 
 @pod_json
@@ -204,7 +223,229 @@ class Idl:
     metadata: Optional[object] = field(default=None)
 
     @staticmethod
-    def from_json_file(filename):
-        with open(filename, "r") as fin:
-            idl_dict = json.load(fin)
-            return Idl.from_dict(idl_dict)
+    def from_json_file(filename, use_cache=True):
+        """
+        Loads the idl, using the parse cache (see `get_idl_cache_dir`) if enabled
+        """
+        with open(filename, "rb") as fin:
+            content = fin.read()
+
+        cache_path = None
+        if use_cache and get_idl_cache_dir():
+            key = sha256(IDL_CACHE_STAMP.encode() + content).hexdigest()
+            cache_path = os.path.join(get_idl_cache_dir(), f"{key}.pickle")
+            idl = _read_idl_cache(cache_path)
+            if idl is not None:
+                return idl
+
+        idl = load_idl(json.loads(content))
+        if cache_path is not None:
+            _write_idl_cache(cache_path, idl)
+
+        return idl
+
+
+###########################
+# Non-reflective loading  #
+###########################
+
+_PRIMITIVE_TYPES = {
+    camel_case(name): IdlType[name]
+    for name in (
+        "BOOL",
+        "U8",
+        "I8",
+        "U16",
+        "I16",
+        "U32",
+        "I32",
+        "U64",
+        "I64",
+        "U128",
+        "I128",
+        "BYTES",
+        "STRING",
+        "PUBLIC_KEY",
+    )
+}
+_NESTED_TYPES = {
+    "option": IdlType.OPTION,
+    "coption": IdlType.COPTION,
+    "static": IdlType.STATIC,
+    "vec": IdlType.VEC,
+}
+
+
+def _load_type(raw) -> IdlType:
+    if isinstance(raw, str):
+        return _PRIMITIVE_TYPES[raw]
+
+    ((name, value),) = raw.items()
+    if name == "defined":
+        assert isinstance(value, str)
+        return IdlType.DEFINED(value)
+    elif name == "array":
+        elem_type, n_elem = value
+        return IdlType.ARRAY((_load_type(elem_type), int(n_elem)))
+
+    return _NESTED_TYPES[name](_load_type(value))
+
+
+def _load_field(raw) -> IdlField:
+    return IdlField(raw["name"], _load_type(raw["type"]), raw.get("metadata"))
+
+
+def _load_type_definition(raw) -> IdlTypeDefinition:
+    ty = raw["type"]
+    kind = ty["kind"]
+    if kind == "struct":
+        fields = IdlStructFields(fields=[_load_field(f) for f in ty["fields"]])
+        type_ = IdlTypeDefinitionTy.STRUCT(fields)
+    elif kind == "enum":
+        variants = []
+        for variant in ty["variants"]:
+            fields = variant.get("fields")
+            if fields is None:
+                pass
+            elif len(fields) == 0 or "name" in fields[0]:
+                fields = EnumFields.NAMED([_load_field(f) for f in fields])
+            else:
+                fields = EnumFields.TUPLE([_load_type(f) for f in fields])
+
+            variants.append(
+                IdlEnumVariant(variant["name"], fields, variant.get("metadata"))
+            )
+        type_ = IdlTypeDefinitionTy.ENUM(IdlEnumVariants(variants=variants))
+    else:
+        raise ValueError(f"Unknown type definition kind {kind}")
+
+    return IdlTypeDefinition(raw["name"], type_, raw.get("metadata"))
+
+
+def _load_account_item(raw) -> IdlAccountItem:
+    if "accounts" in raw:
+        sub_accounts = [_load_account_item(a) for a in raw["accounts"]]
+        return IdlAccountItem.IDL_ACCOUNTS(IdlAccounts(raw["name"], sub_accounts))
+
+    account = IdlAccount(
+        raw["name"],
+        raw["isMut"],
+        raw["isSigner"],
+        raw.get("isOptional", False),
+        raw.get("isArray", False),
+        raw.get("metadata"),
+    )
+    return IdlAccountItem.IDL_ACCOUNT(account)
+
+
+def _load_instruction(raw) -> IdlInstruction:
+    return IdlInstruction(
+        raw["name"],
+        [_load_account_item(a) for a in raw["accounts"]],
+        [_load_field(f) for f in raw["args"]],
+        raw.get("metadata"),
+    )
+
+
+def _load_event(raw) -> IdlEvent:
+    fields = [
+        IdlEventField(f["name"], _load_type(f["type"]), f["index"], f.get("metadata"))
+        for f in raw.get("fields", [])
+    ]
+    return IdlEvent(raw["name"], fields, raw.get("metadata"))
+
+
+def _load_idl(raw) -> Idl:
+    state = raw.get("state")
+    if state is not None:
+        state = IdlState(
+            _load_type_definition(state["struct"]),
+            [_load_instruction(m) for m in state["methods"]],
+            state.get("metadata"),
+        )
+
+    return Idl(
+        version=raw["version"],
+        name=raw["name"],
+        constants=[
+            IdlConst(c["name"], _load_type(c["type"]), c["value"], c.get("metadata"))
+            for c in raw.get("constants", [])
+        ],
+        instructions=[_load_instruction(i) for i in raw.get("instructions", [])],
+        state=state,
+        accounts=[_load_type_definition(a) for a in raw.get("accounts", [])],
+        types=[_load_type_definition(t) for t in raw.get("types", [])],
+        events=[_load_event(e) for e in raw.get("events", [])],
+        errors=[
+            IdlErrorCode(e["code"], e["name"], e.get("msg"), e.get("metadata"))
+            for e in raw.get("errors", [])
+        ],
+        metadata=raw.get("metadata"),
+    )
+
+
+def load_idl(raw: dict) -> Idl:
+    """
+    Equivalent to `Idl.from_dict(raw)` but without going through podite's reflective converters.
+    Inputs that the fast path does not understand are handed over to `Idl.from_dict`.
+    """
+    try:
+        return _load_idl(raw)
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return Idl.from_dict(raw)
+
+
+###########################
+# Parse cache             #
+###########################
+
+IDL_CACHE_VERSION = 1
+
+
+def _get_loader_hash() -> str:
+    # the pickles depend on the classes and loader of this module, which can change (e.g. in a
+    # dev checkout) without a new solmate version
+    try:
+        with open(__file__, "rb") as fin:
+            return sha256(fin.read()).hexdigest()[:16]
+    except OSError:
+        return ""
+
+
+IDL_CACHE_STAMP = (
+    f"solmate-idl-cache:{IDL_CACHE_VERSION}:{solmate.__version__}:{_get_loader_hash()}:"
+    f"{sys.version_info.major}.{sys.version_info.minor}"
+)
+
+
+def get_idl_cache_dir() -> Optional[str]:
+    """
+    Directory of the idl parse cache: $SOLMATE_CACHE_DIR/idl (defaults to ~/.cache/solmate/idl).
+    Setting SOLMATE_CACHE_DIR to an empty string disables the cache.
+    """
+    return get_cache_dir("idl")
+
+
+def _read_idl_cache(cache_path) -> Optional[Idl]:
+    try:
+        with open(cache_path, "rb") as fin:
+            stamp, idl = pickle.load(fin)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+
+    if stamp != IDL_CACHE_STAMP:
+        return None
+
+    return idl
+
+
+def _write_idl_cache(cache_path, idl: Idl):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fout:
+            pickle.dump((IDL_CACHE_STAMP, idl), fout, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # the cache is only an optimization
+        pass
@@ -0,0 +1,281 @@
+"""
+Driver for generating the clients of many idls at once.
+
+The cross-idl type registry (see `defined_types_to_imports`) is built once in the parent process,
+then each idl is generated independently in a worker process. Workers do not touch the file system;
+they return the rendered sources which are merged (and checked for conflicts) before being written.
+"""
+
+import importlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .codegen import (
+    CodeGen,
+    defined_types_to_imports,
+    get_common_external_types,
+    import_qualified_name,
+)
+from .editor import CodeEditor, remove_source, write_source
+from .idl import Idl
+
+
+def import_object(qualified_name: str):
+    module_name, attr = qualified_name.rsplit(".", maxsplit=1)
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def normalize_tag(tag: str) -> str:
+    if tag == "incremental":
+        return "incremental:U8"
+    return tag
+
+
+@dataclass
+class ProgramConfig:
+    """
+    Codegen settings of a single idl in a manifest.
+
+    :param idl: Path to the idl file
+    :param module: Name of the python module
+    :param codegen: Fully qualified name of the CodeGen (sub)class used for this idl
+    :param lazy_imports: Whether the generated packages import their submodules lazily
+    :param specialized_codecs: Whether the types get generated straight-line codecs
+    :param bundle: Whether the client is generated into a single module
+    """
+
+    idl: str
+    module: str
+    addrs: Dict[str, str] = field(default_factory=dict)
+    default_accounts: Dict[str, str] = field(default_factory=dict)
+    skip_types: List[str] = field(default_factory=list)
+    instruction_tag: str = "anchor"
+    account_tag: str = "anchor"
+    codegen: str = "solmate.anchor.codegen.CodeGen"
+    lazy_imports: bool = False
+    specialized_codecs: bool = False
+    bundle: bool = False
+
+    @classmethod
+    def from_dict(cls, raw: dict, base_dir: str) -> "ProgramConfig":
+        raw = dict(raw)
+        raw["idl"] = os.path.join(base_dir, raw["idl"])
+        return cls(**raw)
+
+    def get_default_accounts(self) -> Dict[str, object]:
+        default_accounts = {}
+        for name, value in self.default_accounts.items():
+            if "." in value:
+                default_accounts[name] = partial_import(value, name.upper())
+            else:
+                default_accounts[name] = value
+        return default_accounts
+
+    def get_exported_type_names(self) -> List[str]:
+        """
+        Reads the names of the types (and accounts) defined by the idl without fully parsing it
+        """
+        with open(self.idl, "r") as fin:
+            raw = json.load(fin)
+
+        names = [ty["name"] for ty in raw.get("types", []) + raw.get("accounts", [])]
+        return [name for name in names if name not in self.skip_types]
+
+
+def partial_import(qualified_name: str, as_clause: str):
+    return partial(import_qualified_name, qualified_name, as_clause=as_clause)
+
+
+@dataclass
+class Manifest:
+    """
+    Describes a set of idls that are generated together (and may reference each other's types).
+
+    Example::
+
+        {
+          "root_dir": "..",
+          "external_types": {"Side": "dexterity.utils.aob.state.base.Side"},
+          "programs": [
+            {
+              "idl": "idls/dex.json",
+              "module": "dexterity.codegen.dex",
+              "addrs": {"PROGRAM_ID": "..."},
+              "default_accounts": {"program_id": "dexterity.codegen.dex.addrs.PROGRAM_ID"}
+            }
+          ]
+        }
+
+    Relative paths are resolved against the directory of the manifest file.
+    """
+
+    root_dir: str
+    programs: List[ProgramConfig]
+    external_types: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_json_file(cls, path: str) -> "Manifest":
+        with open(path, "r") as fin:
+            raw = json.load(fin)
+
+        base_dir = os.path.dirname(os.path.abspath(path))
+        return cls(
+            root_dir=os.path.join(base_dir, raw.get("root_dir", ".")),
+            programs=[ProgramConfig.from_dict(p, base_dir) for p in raw["programs"]],
+            external_types=raw.get("external_types", {}),
+        )
+
+    def get_external_types(self) -> Dict[str, Callable[[CodeEditor], str]]:
+        """
+        Builds the shared type registry: common types, manifest-level external types and every type
+        defined by an idl of the manifest. All values are picklable.
+        """
+        external_types = get_common_external_types()
+        for name, qualified_name in self.external_types.items():
+            external_types[name] = partial_import(qualified_name, name)
+
+        for program in self.programs:
+            external_types.update(
+                defined_types_to_imports(
+                    program.module, program.get_exported_type_names()
+                )
+            )
+
+        return external_types
+
+
+def generate_program(
+    program: ProgramConfig,
+    source_path: str,
+    external_types: Dict[str, Callable[[CodeEditor], str]],
+    incremental: bool = False,
+) -> Dict[str, Optional[str]]:
+    """
+    Generates the code of a single program and returns a dict from file path to source code
+    (None for the stale files to delete, see `CodeGen.get_outputs`)
+    """
+    skip_types = set(program.skip_types)
+
+    idl = Idl.from_json_file(program.idl)
+    idl.types = list(filter(lambda x: x.name not in skip_types, idl.types))
+    idl.accounts = list(filter(lambda x: x.name not in skip_types, idl.accounts))
+
+    codegen_cls = import_object(program.codegen)
+    codegen: CodeGen = codegen_cls(
+        idl=idl,
+        addresses=program.addrs,
+        root_module=program.module,
+        source_path=source_path,
+        external_types=external_types,
+        default_accounts=program.get_default_accounts(),
+        instr_tag_values=normalize_tag(program.instruction_tag),
+        accnt_tag_values=normalize_tag(program.account_tag),
+        skip_types=skip_types,
+        incremental=incremental,
+        lazy_imports=program.lazy_imports,
+        specialized_codecs=program.specialized_codecs,
+        bundle=program.bundle,
+    )
+    codegen.generate_code(check_missing_types=False)
+    return codegen.get_outputs()
+
+
+def merge_outputs(
+    results: List[Tuple[str, Dict[str, Optional[str]]]],
+) -> Dict[str, Optional[str]]:
+    """
+    Merges the outputs of the programs and fails if two programs write different content to the same file
+    """
+    merged = {}
+    owners = {}
+    for module, outputs in results:
+        for filepath, source in outputs.items():
+            if filepath in merged and merged[filepath] != source:
+                raise ValueError(
+                    f"Conflicting outputs for {filepath} from {owners[filepath]} and {module}"
+                )
+
+            merged[filepath] = source
+            owners[filepath] = module
+
+    return merged
+
+
+def generate(
+    manifest: Manifest,
+    jobs: Optional[int] = None,
+    incremental: bool = False,
+) -> Dict[str, Optional[str]]:
+    """
+    Generates the code of all the programs in the manifest and writes the outputs.
+
+    :param jobs: Number of worker processes. If 1, everything runs in the current process.
+                 If None, the number of processors is used.
+    :return: Dict from file path to source code of the files that were written (None for the
+             files that were deleted)
+    """
+    external_types = manifest.get_external_types()
+
+    if jobs == 1:
+        results = [
+            (
+                program.module,
+                generate_program(
+                    program, manifest.root_dir, external_types, incremental
+                ),
+            )
+            for program in manifest.programs
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(
+                    generate_program,
+                    program,
+                    manifest.root_dir,
+                    external_types,
+                    incremental,
+                )
+                for program in manifest.programs
+            ]
+            results = [
+                (program.module, future.result())
+                for program, future in zip(manifest.programs, futures)
+            ]
+
+    outputs = merge_outputs(results)
+    for filepath, source in outputs.items():
+        if source is None:
+            remove_source(filepath)
+            continue
+
+        write_source(filepath, source)
+
+    return outputs
+
+
+def cli(
+    manifest_path: str,
+    jobs: Optional[int] = None,
+    incremental: bool = False,
+    lazy_imports: bool = False,
+    specialized_codecs: bool = False,
+    bundle: bool = False,
+):
+    """
+    Generates the programs of a manifest. The lazy_imports, specialized_codecs and bundle flags
+    are enabled for every program, on top of the settings of the manifest.
+    """
+    manifest = Manifest.from_json_file(manifest_path)
+    for program in manifest.programs:
+        program.lazy_imports = program.lazy_imports or lazy_imports
+        program.specialized_codecs = program.specialized_codecs or specialized_codecs
+        program.bundle = program.bundle or bundle
+
+    print(f"Generating code for {len(manifest.programs)} idls from {manifest_path}...")
+    outputs = generate(manifest, jobs=jobs, incremental=incremental)
+    print(f"{len(outputs)} files were written")
@@ -0,0 +1,228 @@
+import cProfile
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    wall_s: float = 0.0  # including nested phases
+    self_s: float = 0.0  # excluding nested phases
+    files_read: int = 0
+    bytes_read: int = 0
+    files_written: int = 0
+    bytes_written: int = 0
+    lock_edits: int = 0
+
+    def add(self, other: "PhaseStats"):
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+
+class _Frame:
+    __slots__ = ("key", "start", "child_s")
+
+    def __init__(self, key, start):
+        self.key = key
+        self.start = start
+        self.child_s = 0.0
+
+
+class NullProfiler:
+    """
+    Profiler used when profiling is off, every hook is a no-op
+    """
+
+    def phase(self, name, item=None):
+        return nullcontext()
+
+    def on_read(self, filepath, n_bytes):
+        pass
+
+    def on_write(self, filepath, n_bytes):
+        pass
+
+    def on_lock_edit(self, filepath, name):
+        pass
+
+
+class CodeGenProfiler(NullProfiler):
+    """
+    Records wall time, files read/written, bytes written and lock edits of code generation per
+    phase (e.g. "types", "load", "save_modules") and per idl item (e.g. the type "Order" within
+    the phase "type"). Counters are attributed to the innermost open phase.
+
+    :param cprofile: If true, a cProfile.Profile is enabled while a phase is open so that a
+                     function-level profile can be dumped along with the phases
+    """
+
+    stats: Dict[Tuple[str, Optional[str]], PhaseStats]
+
+    def __init__(self, cprofile=False):
+        self.stats = {}
+        self._stack: List[_Frame] = []
+        self._events: List[Tuple[str, Tuple[str, Optional[str]], float]] = []
+        self._origin = None
+        self._total_s = 0.0
+        self._cprofile = cProfile.Profile() if cprofile else None
+
+    def _get_stats(self, key) -> PhaseStats:
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = PhaseStats()
+        return stats
+
+    def _current_stats(self) -> PhaseStats:
+        if self._stack:
+            return self._get_stats(self._stack[-1].key)
+        return self._get_stats(("other", None))
+
+    @contextmanager
+    def phase(self, name, item=None):
+        key = (name, item)
+        now = time.perf_counter()
+        if not self._stack:
+            self._origin = now if self._origin is None else self._origin
+            if self._cprofile is not None:
+                self._cprofile.enable()
+
+        frame = _Frame(key, now)
+        self._stack.append(frame)
+        self._events.append(("O", key, now - self._origin))
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._stack.pop()
+            self._events.append(("C", key, now - self._origin))
+
+            elapsed = now - frame.start
+            stats = self._get_stats(key)
+            stats.calls += 1
+            stats.wall_s += elapsed
+            stats.self_s += elapsed - frame.child_s
+            if self._stack:
+                self._stack[-1].child_s += elapsed
+            else:
+                self._total_s += elapsed
+                if self._cprofile is not None:
+                    self._cprofile.disable()
+
+    def on_read(self, filepath, n_bytes):
+        stats = self._current_stats()
+        stats.files_read += 1
+        stats.bytes_read += n_bytes
+
+    def on_write(self, filepath, n_bytes):
+        stats = self._current_stats()
+        stats.files_written += 1
+        stats.bytes_written += n_bytes
+
+    def on_lock_edit(self, filepath, name):
+        self._current_stats().lock_edits += 1
+
+    def get_report(self):
+        """
+        Returns a json-serializable dict with the totals per phase and the stats of each idl item
+        """
+        phases: Dict[str, PhaseStats] = {}
+        items = []
+        for (name, item), stats in self.stats.items():
+            phases.setdefault(name, PhaseStats()).add(stats)
+            if item is not None:
+                items.append(dict(phase=name, item=item, **asdict(stats)))
+
+        items.sort(key=lambda entry: entry["wall_s"], reverse=True)
+        return {
+            "total_s": self._total_s,
+            "phases": {
+                name: asdict(stats)
+                for name, stats in sorted(
+                    phases.items(), key=lambda kv: kv[1].self_s, reverse=True
+                )
+            },
+            "items": items,
+        }
+
+    def format_summary(self, n_items=10):
+        report = self.get_report()
+        lines = [
+            f"{'phase':<24} {'calls':>6} {'wall ms':>10} {'self ms':>10} "
+            f"{'read':>5} {'written':>7} {'bytes out':>10} {'locks':>6}"
+        ]
+        for name, stats in report["phases"].items():
+            lines.append(
+                f"{name:<24} {stats['calls']:>6} {stats['wall_s'] * 1e3:>10.1f} "
+                f"{stats['self_s'] * 1e3:>10.1f} {stats['files_read']:>5} "
+                f"{stats['files_written']:>7} {stats['bytes_written']:>10} "
+                f"{stats['lock_edits']:>6}"
+            )
+
+        if report["items"]:
+            lines.append("")
+            lines.append("slowest items:")
+            for entry in report["items"][:n_items]:
+                lines.append(
+                    f"  {entry['phase'] + ':' + entry['item']:<40} {entry['wall_s'] * 1e3:>10.1f} ms"
+                )
+
+        lines.append(f"total: {report['total_s'] * 1e3:.1f} ms")
+        return "\n".join(lines)
+
+    def get_speedscope(self):
+        """
+        Returns the timeline of the phases as an evented speedscope profile (https://www.speedscope.app)
+        """
+        frames = []
+        frame_ids = {}
+        events = []
+        for event_type, (name, item), at in self._events:
+            frame_name = name if item is None else f"{name}:{item}"
+            if frame_name not in frame_ids:
+                frame_ids[frame_name] = len(frames)
+                frames.append({"name": frame_name})
+            events.append(
+                {"type": event_type, "frame": frame_ids[frame_name], "at": at}
+            )
+
+        end = self._events[-1][2] if self._events else 0.0
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "evented",
+                    "name": "codegen",
+                    "unit": "seconds",
+                    "startValue": 0.0,
+                    "endValue": end,
+                    "events": events,
+                }
+            ],
+        }
+
+    def dump(self, path):
+        """
+        Writes the profile to path. The format depends on the extension:
+            *.prof            cProfile stats (requires cprofile=True), readable with pstats/snakeviz
+            *.speedscope.json timeline of the phases for speedscope
+            anything else     the json report of get_report
+        """
+        if path.endswith(".prof"):
+            if self._cprofile is None:
+                raise ValueError(
+                    "cProfile dumps require CodeGenProfiler(cprofile=True)"
+                )
+            self._cprofile.dump_stats(path)
+            return
+
+        if path.endswith(".speedscope.json"):
+            content = self.get_speedscope()
+        else:
+            content = self.get_report()
+
+        with open(path, "w") as fout:
+            json.dump(content, fout, indent=2)
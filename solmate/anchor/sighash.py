@@ -1,8 +1,10 @@
+from functools import lru_cache
 from hashlib import sha256
 
 from podite import U64
 
 
+@lru_cache(maxsize=4096)
 def sighash(namespace: str, name: str) -> int:
     preimage = f"{namespace}:{name}".encode()
     hash_bytes = sha256(preimage).digest()
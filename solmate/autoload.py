@@ -0,0 +1,237 @@
+"""
+Import hook that generates clients in memory from their idl on first import.
+
+    from solmate import autoload
+
+    autoload.install({"myprog": "path/to/idl.json"})
+
+    from myprog.instructions import initialize
+
+Nothing is written next to the idl: the generated sources are compiled in memory and their
+bytecode is cached under $SOLMATE_CACHE_DIR/autoload (see `solmate.utils.get_cache_dir`), keyed by
+the hash of the idls and their settings, so that later processes skip code generation entirely.
+"""
+
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import marshal
+import os
+import sys
+from dataclasses import asdict
+from hashlib import sha256
+from typing import Dict, Optional, Tuple, Union
+
+import solmate
+from solmate.anchor.codegen import stable_repr
+from solmate.anchor.multi import Manifest, ProgramConfig, generate_program
+from solmate.utils import get_cache_dir
+
+# prefix of the (virtual) file names of the generated modules, shown in tracebacks
+AUTOLOAD_ROOT = "<solmate-autoload>"
+
+AUTOLOAD_CACHE_VERSION = 1
+AUTOLOAD_CACHE_STAMP = (
+    f"solmate-autoload-cache:{AUTOLOAD_CACHE_VERSION}:{solmate.__version__}:"
+    f"{importlib.util.MAGIC_NUMBER.hex()}"
+)
+
+# module name to (is_package, source, code)
+Modules = Dict[str, Tuple[bool, str, object]]
+
+
+class IdlFinder(importlib.abc.MetaPathFinder, importlib.abc.InspectLoader):
+    """
+    Meta path finder (and loader) of the modules generated from the installed idls
+    """
+
+    manifest: Manifest
+    _modules: Dict[str, Modules]  # root module to its generated modules
+    _group_key: Optional[str]
+
+    def __init__(self, manifest: Manifest):
+        self.manifest = manifest
+        self._modules = {}
+        self._group_key = None
+
+    def get_program(self, fullname) -> Optional[ProgramConfig]:
+        for program in self.manifest.programs:
+            if fullname == program.module or fullname.startswith(program.module + "."):
+                return program
+
+        return None
+
+    def get_group_key(self) -> str:
+        """
+        Hash of everything that affects the generated code of any program. The programs are hashed
+        together because each one may import the types of the others.
+        """
+        if self._group_key is None:
+            digest = sha256(AUTOLOAD_CACHE_STAMP.encode())
+            digest.update(stable_repr(self.manifest.external_types).encode())
+            for program in self.manifest.programs:
+                digest.update(stable_repr(asdict(program)).encode())
+                with open(program.idl, "rb") as fin:
+                    digest.update(sha256(fin.read()).digest())
+            self._group_key = digest.hexdigest()
+
+        return self._group_key
+
+    def get_modules(self, program: ProgramConfig) -> Modules:
+        modules = self._modules.get(program.module)
+        if modules is not None:
+            return modules
+
+        cache_path = None
+        cache_dir = get_cache_dir("autoload")
+        if cache_dir:
+            key = sha256(
+                f"{self.get_group_key()}:{program.module}".encode()
+            ).hexdigest()
+            cache_path = os.path.join(cache_dir, f"{key}.marshal")
+            modules = _read_autoload_cache(cache_path)
+
+        if modules is None:
+            modules = self.generate_modules(program)
+            if cache_path is not None:
+                _write_autoload_cache(cache_path, modules)
+
+        self._modules[program.module] = modules
+        return modules
+
+    def generate_modules(self, program: ProgramConfig) -> Modules:
+        outputs = generate_program(
+            program, AUTOLOAD_ROOT, self.manifest.get_external_types()
+        )
+
+        modules = {}
+        for filepath, source in outputs.items():
+            name = os.path.relpath(filepath, AUTOLOAD_ROOT)[: -len(".py")]
+            is_package = os.path.basename(name) == "__init__"
+            if is_package:
+                name = os.path.dirname(name)
+
+            name = name.replace(os.sep, ".")
+            code = compile(source, filepath, "exec", dont_inherit=True)
+            modules[name] = (is_package, source, code)
+
+        return modules
+
+    def find_spec(self, fullname, path, target=None):
+        program = self.get_program(fullname)
+        if program is None:
+            return self.find_parent_spec(fullname, path, target)
+
+        entry = self.get_modules(program).get(fullname)
+        if entry is None:
+            return None
+
+        spec = importlib.util.spec_from_loader(
+            fullname, self, origin=entry[2].co_filename, is_package=entry[0]
+        )
+        # sets __file__ (to the virtual file name)
+        spec.has_location = True
+        return spec
+
+    def find_parent_spec(self, fullname, path, target=None):
+        """
+        The parents of dotted module names (e.g. "codegen" of "codegen.myprog") are served as
+        namespace packages unless another finder can import them
+        """
+        prefix = fullname + "."
+        if not any(p.module.startswith(prefix) for p in self.manifest.programs):
+            return None
+
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+
+            if finder.find_spec(fullname, path, target) is not None:
+                return None
+
+        return importlib.machinery.ModuleSpec(fullname, None, is_package=True)
+
+    def _get_entry(self, fullname):
+        program = self.get_program(fullname)
+        entry = None if program is None else self.get_modules(program).get(fullname)
+        if entry is None:
+            raise ImportError(f"{fullname} is not generated by solmate.autoload")
+        return entry
+
+    def is_package(self, fullname):
+        return self._get_entry(fullname)[0]
+
+    def get_source(self, fullname):
+        return self._get_entry(fullname)[1]
+
+    def get_code(self, fullname):
+        return self._get_entry(fullname)[2]
+
+    def exec_module(self, module):
+        exec(self.get_code(module.__name__), module.__dict__)
+
+
+def install(
+    programs: Dict[str, Union[str, dict]],
+    external_types: Dict[str, str] = None,
+    **defaults,
+) -> IdlFinder:
+    """
+    Makes the given programs importable without generating their code on disk.
+
+    :param programs: Dict from module name to the path of its idl, or to the ProgramConfig fields
+                     of the program (e.g. {"idl": "dex.json", "instruction_tag": "incremental"})
+    :param external_types: Dict from idl type name to the fully qualified name of its python type
+    :param defaults: ProgramConfig fields shared by all the programs (e.g. lazy_imports=True)
+    :return: The finder, which can be removed with `uninstall`
+    """
+    configs = []
+    for module, config in programs.items():
+        if isinstance(config, str):
+            config = {"idl": config}
+
+        config = {**defaults, **config, "module": module}
+        config["idl"] = os.path.abspath(config["idl"])
+        configs.append(ProgramConfig(**config))
+
+    manifest = Manifest(
+        root_dir=AUTOLOAD_ROOT,
+        programs=configs,
+        external_types=external_types if external_types is not None else {},
+    )
+    finder = IdlFinder(manifest)
+    sys.meta_path.insert(0, finder)
+    return finder
+
+
+def uninstall(finder: IdlFinder):
+    """
+    Removes the finder from sys.meta_path. Modules that were already imported stay in sys.modules.
+    """
+    if finder in sys.meta_path:
+        sys.meta_path.remove(finder)
+
+
+def _read_autoload_cache(cache_path) -> Optional[Modules]:
+    try:
+        with open(cache_path, "rb") as fin:
+            stamp, modules = marshal.load(fin)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if stamp != AUTOLOAD_CACHE_STAMP:
+        return None
+
+    return modules
+
+
+def _write_autoload_cache(cache_path, modules: Modules):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fout:
+            marshal.dump((AUTOLOAD_CACHE_STAMP, modules), fout)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # the cache is only an optimization
+        pass
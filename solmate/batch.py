@@ -0,0 +1,190 @@
+"""
+Helpers of the generated `<instruction>_many` builders, which build many instructions at once from
+columnar inputs.
+
+A column is a list, tuple or (numpy) array with one value per instruction. Any other value is a
+scalar and is broadcast to every instruction (e.g. the same mint or program id for all transfers).
+"""
+
+from itertools import repeat
+from struct import Struct
+from typing import Dict, List, Optional, Sequence, Union
+
+from solana.publickey import PublicKey
+from solana.transaction import AccountMeta
+
+from solmate.utils import intern_public_key
+
+AccountLike = Union[str, PublicKey, AccountMeta]
+# a single account (used by all the instructions) or one account per instruction
+AccountColumn = Union[AccountLike, Sequence[AccountLike]]
+
+# struct formats to numpy dtypes, used to pack all the payloads in one vectorized pass
+_NUMPY_FORMATS = {
+    "B": "u1",
+    "b": "i1",
+    "H": "<u2",
+    "h": "<i2",
+    "I": "<u4",
+    "i": "<i4",
+    "Q": "<u8",
+    "q": "<i8",
+    "32s": "S32",
+}
+
+
+def is_column(value) -> bool:
+    if isinstance(value, (list, tuple, range)):
+        return True
+
+    # numpy arrays (without importing numpy)
+    return getattr(value, "ndim", 0) > 0 and hasattr(value, "__array__")
+
+
+def batch_size(*values) -> int:
+    """
+    Returns the number of instructions, i.e. the common length of the columns among values
+    """
+    n = None
+    for value in values:
+        if not is_column(value):
+            continue
+
+        if n is None:
+            n = len(value)
+        elif len(value) != n:
+            raise ValueError(
+                f"All the columns must have the same length ({n} != {len(value)})"
+            )
+
+    if n is None:
+        raise ValueError("At least one of the arguments must be a column")
+
+    return n
+
+
+def column(value, n) -> Sequence:
+    """
+    Returns value if it is a column, otherwise a column of n times value
+    """
+    if is_column(value):
+        return value
+    return [value] * n
+
+
+def _copy_meta(meta: AccountMeta) -> AccountMeta:
+    return AccountMeta(
+        meta.pubkey, is_signer=meta.is_signer, is_writable=meta.is_writable
+    )
+
+
+def meta_column(
+    value, n, is_signer: bool, is_writable: bool
+) -> List[Optional[AccountMeta]]:
+    """
+    Converts a column of str, PublicKey or AccountMeta (or a single one of them) into a column of
+    AccountMeta. A key that appears multiple times is decoded once, but every instruction gets its
+    own AccountMeta since Transaction.compile_message changes their flags in place.
+    """
+    if not is_column(value):
+        if value is None:
+            return [None] * n
+        if isinstance(value, AccountMeta):
+            return [_copy_meta(value) for _ in range(n)]
+        if isinstance(value, str):
+            value = intern_public_key(value)
+        return [
+            AccountMeta(value, is_signer=is_signer, is_writable=is_writable)
+            for _ in range(n)
+        ]
+
+    pubkeys: Dict[Union[str, bytes, PublicKey], PublicKey] = {}
+    result = []
+    for key in value:
+        if key is None:
+            result.append(None)
+            continue
+        if isinstance(key, AccountMeta):
+            result.append(_copy_meta(key))
+            continue
+
+        pubkey = pubkeys.get(key)
+        if pubkey is None:
+            if isinstance(key, PublicKey):
+                pubkey = key
+            elif isinstance(key, str):
+                pubkey = intern_public_key(key)
+            else:
+                # e.g. the rows of an array of 32-byte keys
+                pubkey = PublicKey(bytes(key))
+            pubkeys[key] = pubkey
+        result.append(AccountMeta(pubkey, is_signer=is_signer, is_writable=is_writable))
+
+    return result
+
+
+def copy_metas(metas: Optional[List[AccountMeta]]) -> Optional[List[AccountMeta]]:
+    """
+    Copies an array of accounts (e.g. remaining_accounts) shared by all the instructions, so that
+    each instruction gets its own AccountMeta objects
+    """
+    if metas is None:
+        return None
+    return [_copy_meta(meta) for meta in metas]
+
+
+def pack_many(layout: Struct, tag: int, values: Sequence, n: int) -> List[bytes]:
+    """
+    Encodes the data of n instructions whose layout is a tag followed by fixed-size fields.
+
+    :param layout: Struct of the data, the first field is the tag
+    :param values: The value (or column of values) of each field after the tag
+    """
+    formats = _split_format(layout.format)
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    if numpy is not None and n > 1:
+        dtype = numpy.dtype(
+            [(f"f{i}", _NUMPY_FORMATS[fmt]) for i, fmt in enumerate(formats)]
+        )
+        if dtype.itemsize == layout.size:
+            records = numpy.empty(n, dtype=dtype)
+            records["f0"] = tag
+            for i, value in enumerate(values, start=1):
+                if formats[i] == "32s":
+                    value = _to_key_bytes(value, n)
+                records[f"f{i}"] = value
+
+            raw = records.tobytes()
+            size = layout.size
+            return [raw[i : i + size] for i in range(0, n * size, size)]
+
+    columns = [
+        [bytes(v) for v in column(value, n)] if fmt == "32s" else column(value, n)
+        for fmt, value in zip(formats[1:], values)
+    ]
+    return list(map(layout.pack, repeat(tag, n), *columns))
+
+
+def _to_key_bytes(value, n):
+    if not is_column(value):
+        return bytes(value)
+    if getattr(value, "dtype", None) is not None:
+        return value
+    return [bytes(v) for v in value]
+
+
+def _split_format(format: str) -> List[str]:
+    # e.g. "<BQ32sB" -> ["B", "Q", "32s", "B"]
+    formats = []
+    count = ""
+    for char in format.lstrip("<"):
+        if char.isdigit():
+            count += char
+        else:
+            formats.append(count + char)
+            count = ""
+    return formats
@@ -0,0 +1,28 @@
+import sys
+from types import ModuleType
+from typing import Dict, List
+
+
+def export_submodules(module_name: str, submodules: Dict[str, List[str]]):
+    """
+    Registers the submodules of a bundled client (see `CodeGen(bundle=True)`) so that they can be
+    imported and accessed as if the client was generated as a package.
+
+    :param module_name: __name__ of the bundle
+    :param submodules: Dict from the name of a submodule relative to the bundle (e.g. "types.account")
+                       to the names of the bundle it exports
+    """
+    module = sys.modules[module_name]
+    namespace = vars(module)
+    for name in sorted(submodules, key=lambda n: (n.count("."), n)):
+        submodule = ModuleType(f"{module_name}.{name}")
+        for attr in submodules[name]:
+            setattr(submodule, attr, namespace[attr])
+        sys.modules[submodule.__name__] = submodule
+
+        parent_name, _, attr = name.rpartition(".")
+        if not parent_name:
+            setattr(module, attr, submodule)
+        elif attr not in submodules[parent_name]:
+            # like in packages, the names imported by the parent shadow its submodules
+            setattr(sys.modules[f"{module_name}.{parent_name}"], attr, submodule)
@@ -1,7 +1,9 @@
 import argparse
 import os
+from functools import partial
 
-from solmate.anchor import codegen
+from solmate.anchor import codegen, multi
+from solmate.anchor.profiler import CodeGenProfiler
 
 TAG_TYPES = [
     "anchor",
@@ -15,34 +17,22 @@ TAG_TYPES = [
 
 
 def default_account_gen(name_, value_):
-    def _default_account(editor):
-        from_clause, import_clause = value_.rsplit(".", maxsplit=1)
-        as_clause = name_.upper()
-        if as_clause == import_clause:
-            editor.add_from_import(from_clause, import_clause)
-        else:
-            editor.add_from_import(from_clause, import_clause, name_.upper())
-        return name_.upper()
-
-    return _default_account
+    return partial(codegen.import_qualified_name, value_, as_clause=name_.upper())
 
 
 def get_parser():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--idl", type=str, required=True, help="Path to idl file")
+    parser.add_argument("--idl", type=str, help="Path to idl file")
     parser.add_argument(
-        "--addrs", nargs="+", type=str, required=True, default=[]
+        "--addrs", nargs="+", type=str, default=[]
     )  # TODO: @nimily how does this work? Can you correct the types and add a help message
     parser.add_argument(
         "--root-dir",
         type=str,
-        required=True,
         default=os.getcwd(),
         help="Path to output",
     )
-    parser.add_argument(
-        "--module", type=str, required=True, help="Name of the python module"
-    )
+    parser.add_argument("--module", type=str, help="Name of the python module")
     parser.add_argument(
         "--skip-types",
         nargs="+",
@@ -73,13 +63,75 @@ def get_parser():
         required=False,
         help="Type of account tag to use. Use 'anchor' if generating from an anchor idl",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only regenerate modules whose idl fragments changed since the previous run",
+    )
+    parser.add_argument(
+        "--lazy-imports",
+        action="store_true",
+        help="Generate packages that import their submodules on first attribute access",
+    )
+    parser.add_argument(
+        "--specialized-codecs",
+        action="store_true",
+        help="Generate straight-line (de)serialization methods for the types",
+    )
+    parser.add_argument(
+        "--bundle",
+        action="store_true",
+        help="Generate the whole client into a single module (<module>.py)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the time, files read/written and lock edits of every codegen phase",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=str,
+        default=None,
+        help="Path to dump the profile to (implies --profile): *.prof for cProfile stats, "
+        "*.speedscope.json for a speedscope timeline and any other path for a json report",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        help="Path to a json manifest listing multiple idls to generate together "
+        "(replaces --idl, --addrs, --module, ...)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes used with --manifest (defaults to the number of processors)",
+    )
     return parser
 
 
-def main(process_cmd):
+def main(process_cmd=codegen.cli):
     parser = get_parser()
     args = parser.parse_args()
 
+    profile = args.profile or args.profile_output is not None
+
+    if args.manifest is not None:
+        if profile:
+            parser.error("--profile is not supported with --manifest")
+        multi.cli(
+            args.manifest,
+            jobs=args.jobs,
+            incremental=args.incremental,
+            lazy_imports=args.lazy_imports,
+            specialized_codecs=args.specialized_codecs,
+            bundle=args.bundle,
+        )
+        return
+
+    if args.idl is None or args.module is None:
+        parser.error("the following arguments are required: --idl, --module")
+
     skip_types = set(args.skip_types)
 
     default_accounts = {}
@@ -103,6 +155,13 @@ def main(process_cmd):
     if account_tag == "incremental":
         account_tag = "incremental:U8"
 
+    profiler = None
+    if profile:
+        profiler = CodeGenProfiler(
+            cprofile=args.profile_output is not None
+            and args.profile_output.endswith(".prof")
+        )
+
     process_cmd(
         args.idl,
         addresses,
@@ -112,8 +171,18 @@ def main(process_cmd):
         default_accounts,
         instruction_tag,
         account_tag,
+        incremental=args.incremental,
+        lazy_imports=args.lazy_imports,
+        specialized_codecs=args.specialized_codecs,
+        bundle=args.bundle,
+        profiler=profiler,
     )
 
+    if profiler is not None:
+        print(profiler.format_summary())
+        if args.profile_output is not None:
+            profiler.dump(args.profile_output)
+
 
 if __name__ == "__main__":
     main(codegen.cli)
@@ -1,12 +1,57 @@
 from io import BytesIO
+from struct import Struct
 from typing import Type
 
-from podite import U32, U64, I64, Enum, Variant, Option, pod, BYTES_CATALOG
-from podite._utils import _GetitemToCall, get_calling_module, get_concrete_type
+from podite import (
+    U8,
+    I8,
+    U16,
+    I16,
+    U32,
+    I32,
+    U64,
+    I64,
+    Enum,
+    Variant,
+    Option,
+    pod,
+    BYTES_CATALOG,
+)
+from podite._utils import (
+    AutoTagTypeValueManager,
+    _GetitemToCall,
+    get_calling_module,
+    get_concrete_type,
+)
+from solana.publickey import PublicKey
+
+from solmate.utils import import_numpy
 
 Usize = U64  # Should it be U32?
 UnixTimestamp = I64
 
+# element types that Repeat decodes with struct and exposes to numpy without a podite round trip
+ELEM_STRUCTS = {
+    U8: Struct("<B"),
+    I8: Struct("<b"),
+    U16: Struct("<H"),
+    I16: Struct("<h"),
+    U32: Struct("<I"),
+    I32: Struct("<i"),
+    U64: Struct("<Q"),
+    I64: Struct("<q"),
+}
+ELEM_NUMPY_DTYPES = {
+    U8: "u1",
+    I8: "i1",
+    U16: "<u2",
+    I16: "<i2",
+    U32: "<u4",
+    I32: "<i4",
+    U64: "<u8",
+    I64: "<i8",
+}
+
 
 class Error(Variant):
     msg: str
@@ -63,11 +108,88 @@ class ProgramError(Enum):
         return variant.to_string(self)
 
 
+class TypeResolver:
+    """
+    Resolves a (possibly forward referenced) type declared in a module once, instead of on every
+    encode/decode. The resolution is redone only if the module is reloaded, which assigns it a new spec.
+    """
+
+    __slots__ = ("module", "type_", "_spec", "_type", "_reader", "_sizes")
+
+    def __init__(self, module, type_):
+        self.module = module
+        self.type_ = type_
+        self._spec = None
+        self._type = None
+        self._reader = None
+        self._sizes = {}
+
+    def _is_stale(self):
+        return (
+            self._type is None
+            or getattr(self.module, "__spec__", None) is not self._spec
+        )
+
+    def get(self):
+        if self._is_stale():
+            self._spec = getattr(self.module, "__spec__", None)
+            self._type = get_concrete_type(self.module, self.type_)
+            self._reader = get_fast_reader(self._type)
+            self._sizes = {}
+
+        return self._type
+
+    def get_reader(self):
+        """
+        Returns a function decoding the type directly from a buffer, or None if the type has no fast path
+        """
+        self.get()
+        return self._reader
+
+    def get_max_size(self):
+        type_ = self.get()
+        # the size of enums with AutoTagType depends on the format being used
+        tag = AutoTagTypeValueManager.get_tag()
+        size = self._sizes.get(tag)
+        if size is None:
+            size = self._sizes[tag] = BYTES_CATALOG.calc_max_size(type_)
+
+        return size
+
+
+def get_fast_reader(type_):
+    if type_ in ELEM_STRUCTS:
+        elem_struct = ELEM_STRUCTS[type_]
+        size = elem_struct.size
+        unpack = elem_struct.unpack
+
+        return lambda buffer: unpack(buffer.read(size))[0]
+    elif type_ is PublicKey:
+        return lambda buffer: PublicKey(buffer.read(32))
+
+    return None
+
+
+class ResolvedVariant(Variant):
+    """
+    Variant whose field type is resolved once by a TypeResolver
+    """
+
+    def __init__(self, /, value=None, field=None, module=None):
+        super().__init__(value, field, module)
+
+        self.resolver = TypeResolver(self.module, field)
+
+    @property
+    def concrete_field_type(self):
+        return self.resolver.get()
+
+
 def _coption(name, type_: Type):
     @pod
     class _COption(Enum[U32]):
         NONE = Variant()
-        SOME = Variant(field=type_, module=get_calling_module(4))
+        SOME = ResolvedVariant(field=type_, module=get_calling_module(4))
 
     _COption.__name__ = f"{name}[{type_}]"
     _COption.__qualname__ = _COption.__name__
@@ -77,9 +199,13 @@ def _coption(name, type_: Type):
 
 COption = _GetitemToCall("COption", _coption)
 
+_U32_STRUCT = Struct("<I")
+_TAG_NONE = _U32_STRUCT.pack(0)
+_TAG_SOME = _U32_STRUCT.pack(1)
+
 
 def _coptional(name, type_: Type):
-    module = get_calling_module()
+    resolver = TypeResolver(get_calling_module(), type_)
 
     @pod
     class _COptional(Enum[U32]):
@@ -89,27 +215,27 @@ def _coptional(name, type_: Type):
 
         @classmethod
         def _calc_max_size(cls):
-            return 4 + BYTES_CATALOG.calc_max_size(get_concrete_type(module, type_))
+            return 4 + resolver.get_max_size()
 
         @classmethod
         def _from_bytes_partial(cls, buffer, **kwargs):
-            has_value = BYTES_CATALOG.unpack_partial(U32, buffer)
+            (has_value,) = _U32_STRUCT.unpack(buffer.read(4))
             if has_value:
-                return BYTES_CATALOG.unpack_partial(
-                    get_concrete_type(module, type_), buffer
-                )
+                reader = resolver.get_reader()
+                if reader is not None:
+                    return reader(buffer)
+
+                return BYTES_CATALOG.unpack_partial(resolver.get(), buffer)
             else:
                 return None
 
         @classmethod
         def _to_bytes_partial(cls, buffer, obj, **kwargs):
             if obj is None:
-                BYTES_CATALOG.pack_partial(U32, buffer, 0)
+                buffer.write(_TAG_NONE)
             else:
-                BYTES_CATALOG.pack_partial(U32, buffer, 1)
-                BYTES_CATALOG.pack_partial(
-                    get_concrete_type(module, type_), buffer, obj
-                )
+                buffer.write(_TAG_SOME)
+                BYTES_CATALOG.pack_partial(resolver.get(), buffer, obj)
 
     _COptional.__name__ = f"{name}[{type_}]"
     _COptional.__qualname__ = _COptional.__name__
@@ -124,13 +250,26 @@ class Repeat:
     def __class_getitem__(
         cls, type_: Type, max_len=0, allow_remainder=False, ring=True
     ):
-        module = get_calling_module()
+        resolver = TypeResolver(get_calling_module(), type_)
 
         @pod(dataclass_fn=None)
         class _Repeat:
-            payload: bytes
+            payload: memoryview
             elem_size: int
 
+            _elem_type = None
+            _elem_struct = None
+
+            @classmethod
+            def _resolve(cls):
+                elem_type = resolver.get()
+                if elem_type is not cls._elem_type:
+                    cls._elem_struct = ELEM_STRUCTS.get(elem_type)
+                    cls._elem_size = resolver.get_max_size()
+                    cls._elem_type = elem_type
+
+                return elem_type
+
             @classmethod
             def _is_static(cls) -> bool:
                 return False
@@ -139,18 +278,19 @@ class Repeat:
             def _calc_max_size(cls):
                 if max_len == 0:
                     return 2 ** 32
-                return (
-                    BYTES_CATALOG.calc_max_size(get_concrete_type(module, type_))
-                    * max_len
-                )
+                cls._resolve()
+                return cls._elem_size * max_len
 
             @classmethod
             def _from_bytes_partial(cls, buffer, **kwargs):
+                cls._resolve()
+
+                # getvalue() shares the bytes the buffer was created from, so slicing a view of
+                # it avoids copying the payload
                 obj = _Repeat()
-                obj.payload = buffer.read()
-                obj.elem_size = BYTES_CATALOG.calc_max_size(
-                    get_concrete_type(module, type_)
-                )
+                obj.payload = memoryview(buffer.getvalue())[buffer.tell() :]
+                obj.elem_size = cls._elem_size
+                buffer.seek(0, 2)
 
                 if not allow_remainder and len(obj.payload) % obj.elem_size != 0:
                     raise RuntimeError(
@@ -172,8 +312,22 @@ class Repeat:
             def n_elem(self):
                 return len(self.payload) // self.elem_size
 
+            def __len__(self):
+                return self.n_elem
+
+            def _get_elem(self, index):
+                start = index * self.elem_size
+                if self._elem_struct is not None:
+                    return self._elem_struct.unpack_from(self.payload, start)[0]
+
+                buffer = BytesIO(self.payload[start : start + self.elem_size])
+                return BYTES_CATALOG.unpack_partial(self._elem_type, buffer)
+
             def __getitem__(self, item):
                 n_elem = self.n_elem
+                if isinstance(item, slice):
+                    return [self._get_elem(i) for i in range(*item.indices(n_elem))]
+
                 if not ring:
                     if item < 0 or item >= n_elem:
                         raise ValueError(
@@ -182,15 +336,92 @@ class Repeat:
                 else:
                     item = item % n_elem
 
-                start = item * self.elem_size
-                end = (item + 1) * self.elem_size
-                buffer = BytesIO(self.payload[start:end])
+                return self._get_elem(item)
+
+            def iter_range(self, start, stop):
+                """
+                Yields the elements with sequence numbers in [start, stop), where the element with
+                sequence number seq lives in slot seq % n_elem of the ring
+                """
+                if not ring:
+                    raise TypeError("Only ring repeats can be read by sequence numbers")
+
+                n_elem = self.n_elem
+                for seq in range(start, stop):
+                    yield self._get_elem(seq % n_elem)
 
-                return BYTES_CATALOG.unpack_partial(
-                    get_concrete_type(module, type_), buffer
-                )
+            def __iter__(self):
+                n_elem = self.n_elem
+                if self._elem_struct is not None:
+                    payload = self.payload[: n_elem * self.elem_size]
+                    for (value,) in self._elem_struct.iter_unpack(payload):
+                        yield value
+                else:
+                    for i in range(n_elem):
+                        yield self._get_elem(i)
+
+            def to_numpy(self, dtype=None):
+                """
+                Returns a read-only numpy array over the payload without copying it.
+                dtype defaults to the element type if it is an integer, pass the dtype of the
+                element's view (e.g. `FooView.dtype()`) for fixed-size structs.
+                """
+                numpy = import_numpy()
+                if dtype is None:
+                    dtype = ELEM_NUMPY_DTYPES.get(self._elem_type)
+                    if dtype is None:
+                        raise TypeError(
+                            f"{self._elem_type} has no default numpy dtype, pass one explicitly"
+                        )
+
+                dtype = numpy.dtype(dtype)
+                if dtype.itemsize != self.elem_size:
+                    raise ValueError(
+                        f"dtype has {dtype.itemsize} bytes but elements have {self.elem_size}"
+                    )
+
+                return numpy.frombuffer(self.payload, dtype=dtype, count=self.n_elem)
 
         _Repeat.__name__ = f"Repeat[{type_}]"
         _Repeat.__qualname__ = _Repeat.__name__
 
         return _Repeat
+
+
+class RingCursor:
+    """
+    Remembers how far a ring Repeat (e.g. an event queue) has been consumed so that each poll
+    decodes only the elements pushed since the previous one.
+
+    The ring is identified by a monotonic sequence number, i.e. the total number of elements
+    ever pushed, which is what on-chain queues keep in their headers. If more than n_elem
+    elements are pushed between two polls, the overwritten ones are counted in `missed`.
+    """
+
+    def __init__(self, seq_num=None):
+        # None means the cursor starts at whatever the head is at the first poll
+        self.seq_num = seq_num
+        self.missed = 0
+
+    def poll(self, repeat, seq_num):
+        """
+        Returns the elements of the snapshot `repeat` pushed since the last poll,
+        where `seq_num` is the sequence number of the snapshot
+        """
+        start = seq_num if self.seq_num is None else self.seq_num
+        if seq_num < start:
+            raise ValueError(
+                f"Sequence number went backwards from {start} to {seq_num}"
+            )
+
+        oldest = seq_num - repeat.n_elem
+        if start < oldest:
+            self.missed += oldest - start
+            start = oldest
+
+        self.seq_num = seq_num
+        if repeat.n_elem == 0:
+            # an empty ring keeps nothing (and its slots are taken modulo n_elem)
+            return []
+
+        return list(repeat.iter_range(start, seq_num))
@@ -0,0 +1,216 @@
+"""
+Builders of the getProgramAccounts filters of the generated account types, e.g.
+```
+from solmate.programs.token_program.accounts import Filters
+
+query = Filters.ACCOUNT.query(Filters.ACCOUNT.owner == owner, slice=("amount",))
+client.get_program_accounts(TOKEN_PROGRAM_ID, encoding="base64", **query)
+```
+The offsets come from the field layouts of the views (see `solmate.views.View`), shifted by the
+discriminator of anchor accounts. `LocalClient` evaluates the same filters without a node.
+"""
+
+import base64
+from dataclasses import fields
+from struct import Struct
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
+
+import base58
+from podite import BYTES_CATALOG
+from solana.publickey import PublicKey
+from solana.rpc.types import DataSliceOpts, MemcmpOpts
+
+from solmate.views import View
+
+
+class FieldFilter:
+    """
+    Field of an account type, comparing it to a value (`==`) builds a memcmp filter
+    """
+
+    __hash__ = None
+
+    def __init__(self, builder: "FilterBuilder", name: str):
+        self.builder = builder
+        self.name = name
+        self.offset, self.size, self.format = builder.get_field_layout(name)
+
+    def encode(self, value) -> bytes:
+        """
+        Encodes a value of the field as it is laid out in the account data
+        """
+        if isinstance(value, (bytes, bytearray)):
+            raw = bytes(value)
+        elif self.format == "32s":
+            raw = bytes(PublicKey(value))
+        elif self.format is not None:
+            raw = Struct("<" + self.format).pack(value)
+        else:
+            field_type = self.builder.get_field_type(self.name)
+            raw = BYTES_CATALOG.pack(field_type, value, format="FORMAT_BORSH")
+
+        if len(raw) != self.size:
+            raise ValueError(
+                f"{self.name} is {self.size} bytes long but the value is encoded in {len(raw)} bytes"
+            )
+        return raw
+
+    def __eq__(self, value) -> MemcmpOpts:
+        return MemcmpOpts(
+            offset=self.offset, bytes=base58.b58encode(self.encode(value)).decode()
+        )
+
+    def __repr__(self):
+        return f"FieldFilter({self.builder.view_cls.__name__}.{self.name})"
+
+
+class FilterBuilder:
+    """
+    Filters of the accounts of one type.
+
+    :param view_cls: View of the account type, which gives the offsets of the fields
+    :param discriminator: Bytes preceding the fields in the account data (the anchor discriminator)
+    """
+
+    def __init__(self, view_cls: Type[View], discriminator: bytes = b""):
+        self.view_cls = view_cls
+        self.discriminator = discriminator
+        self._fields: Dict[str, FieldFilter] = {}
+
+    def __getattr__(self, name) -> FieldFilter:
+        if name.startswith("_") or name not in self.view_cls.field_layout:
+            raise AttributeError(
+                f"{self.view_cls.pod_type.__name__} has no field {name}"
+            )
+
+        field = self._fields.get(name)
+        if field is None:
+            field = FieldFilter(self, name)
+            self._fields[name] = field
+        return field
+
+    def get_field_layout(self, name):
+        offset, size, field_format = self.view_cls.field_layout[name]
+        return len(self.discriminator) + offset, size, field_format
+
+    def get_field_type(self, name):
+        for field in fields(self.view_cls.pod_type):
+            if field.name == name:
+                return field.type
+
+        raise AttributeError(f"{self.view_cls.pod_type.__name__} has no field {name}")
+
+    @property
+    def data_size(self) -> int:
+        return len(self.discriminator) + self.view_cls.size
+
+    def type_filters(self) -> Tuple[List[MemcmpOpts], Optional[int]]:
+        """
+        Returns the memcmp filters and the data size selecting the accounts of this type: anchor
+        accounts are matched by discriminator (they can be bigger than their fields), the others by size
+        """
+        if self.discriminator:
+            discriminator = base58.b58encode(self.discriminator).decode()
+            return [MemcmpOpts(offset=0, bytes=discriminator)], None
+
+        return [], self.data_size
+
+    def slice(self, *names: str) -> DataSliceOpts:
+        """
+        Returns the data slice spanning the given fields (from the first to the last one)
+        """
+        if not names:
+            raise ValueError("At least one field is required")
+
+        layouts = [getattr(self, name) for name in names]
+        start = min(field.offset for field in layouts)
+        stop = max(field.offset + field.size for field in layouts)
+        return DataSliceOpts(offset=start, length=stop - start)
+
+    def query(
+        self, *memcmp_opts: MemcmpOpts, slice: Optional[Sequence[str]] = None
+    ) -> Dict:
+        """
+        Returns the filter kwargs of `Client.get_program_accounts` selecting the accounts of this
+        type that match all the memcmp filters
+        """
+        type_memcmp_opts, data_size = self.type_filters()
+        return {
+            "memcmp_opts": type_memcmp_opts + list(memcmp_opts),
+            "data_size": data_size,
+            "data_slice": None if slice is None else self.slice(*slice),
+        }
+
+    def __repr__(self):
+        return f"FilterBuilder({self.view_cls.__name__})"
+
+
+def matches(
+    data: bytes,
+    memcmp_opts: Optional[Sequence[MemcmpOpts]] = None,
+    data_size: Optional[int] = None,
+) -> bool:
+    """
+    Evaluates getProgramAccounts filters on account data like the rpc nodes do
+    """
+    if data_size is not None and len(data) != data_size:
+        return False
+
+    for opt in memcmp_opts or ():
+        expected = base58.b58decode(opt.bytes)
+        if data[opt.offset : opt.offset + len(expected)] != expected:
+            return False
+
+    return True
+
+
+class LocalClient:
+    """
+    In-memory stand-in of `solana.rpc.api.Client` answering getProgramAccounts (for tests)
+    """
+
+    def __init__(self):
+        # address to (owner, data)
+        self.accounts: Dict[str, tuple] = {}
+
+    def add_account(
+        self,
+        address: Union[str, PublicKey],
+        owner: Union[str, PublicKey],
+        data: bytes,
+    ):
+        self.accounts[str(address)] = (str(owner), bytes(data))
+
+    def get_program_accounts(
+        self,
+        pubkey: Union[str, PublicKey],
+        commitment=None,
+        encoding: Optional[str] = None,
+        data_slice: Optional[DataSliceOpts] = None,
+        data_size: Optional[int] = None,
+        memcmp_opts: Optional[List[MemcmpOpts]] = None,
+    ) -> Dict:
+        if encoding not in (None, "base64"):
+            raise ValueError(f"Unsupported encoding {encoding}")
+
+        result = []
+        for address, (owner, data) in sorted(self.accounts.items()):
+            if owner != str(pubkey) or not matches(data, memcmp_opts, data_size):
+                continue
+
+            if data_slice is not None:
+                data = data[data_slice.offset : data_slice.offset + data_slice.length]
+            result.append(
+                {
+                    "pubkey": address,
+                    "account": {
+                        "data": [base64.b64encode(data).decode(), "base64"],
+                        "executable": False,
+                        "lamports": 0,
+                        "owner": owner,
+                        "rentEpoch": 0,
+                    },
+                }
+            )
+
+        return {"jsonrpc": "2.0", "result": result, "id": 0}
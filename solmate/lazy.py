@@ -0,0 +1,35 @@
+from importlib import import_module
+from typing import Dict, Optional, Tuple
+
+
+def lazy_attrs(module_name: str, attrs: Dict[str, Tuple[str, Optional[str]]]):
+    """
+    Returns the module-level (PEP 562) __getattr__ and __dir__ of a package whose attributes are
+    imported on first access.
+
+    :param module_name: __name__ of the package, used to resolve relative imports
+    :param attrs: Dict from attribute name to (module, name within the module). If the name is None,
+                  the attribute is the module itself.
+    """
+    module_globals = vars(import_module(module_name))
+
+    def __getattr__(name):
+        try:
+            from_module, import_name = attrs[name]
+        except KeyError:
+            raise AttributeError(
+                f"module {module_name!r} has no attribute {name!r}"
+            ) from None
+
+        value = import_module(from_module, module_name)
+        if import_name is not None:
+            value = getattr(value, import_name)
+
+        # later lookups don't go through __getattr__ anymore
+        module_globals[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(module_globals) | set(attrs))
+
+    return __getattr__, __dir__
@@ -0,0 +1,557 @@
+"""
+Parallel decoding of block dumps, e.g. to backfill the history of a program
+```
+from solmate.pipeline import BlockPipeline
+
+pipeline = BlockPipeline(jobs=8)
+for decoded in pipeline.decode(["dumps/"]):
+    print(decoded.slot, decoded.signature, decoded.ix)
+```
+The dumps are split into chunks of records that are handed to the worker processes through shared
+memory. Workers only build the instructions of the filtered programs, decode them with the generated
+`decode_instruction` functions and send back the decoded instructions (or columns of them).
+
+Supported dumps (the format is inferred from the suffix of the file):
+ - `.json`: a single block as returned by getBlock (with the "json" or "base64" transaction encoding),
+   optionally wrapped in its rpc response
+ - `.jsonl`: one such block per line
+ - `.bin`: records of `<slot: u64><size: u32><serialized transaction>` (little endian). The address
+   lookup tables of v0 transactions are not resolved: the instructions using loaded accounts are
+   skipped (or raise ValueError with `strict=True`).
+
+getBlock does not return the slot of the block, dumpers are expected to store it under "slot".
+"""
+
+import base64
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from multiprocessing import shared_memory
+import struct
+from struct import Struct
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import base58
+from solana.publickey import PublicKey
+from solana.transaction import AccountMeta, TransactionInstruction
+
+from solmate.utils import to_account_meta
+
+DEFAULT_CHUNK_SIZE = 1 << 22
+
+FORMATS_BY_SUFFIX = {
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".bin": "binary",
+}
+
+_RECORD_HEADER = Struct("<QI")
+
+# decode_instruction function of each program id
+Decoders = Dict[Union[str, PublicKey], Callable[[TransactionInstruction], object]]
+
+
+class DecodedInstruction(NamedTuple):
+    """
+    Decoded instruction and its location in the chain
+
+    :param index: Index of the instruction in its transaction
+    :param inner_index: Index of the instruction among the instructions invoked by the instruction at
+                        `index` (None for the instructions of the transaction itself)
+    """
+
+    slot: Optional[int]
+    signature: str
+    index: int
+    inner_index: Optional[int]
+    ix: object
+
+
+class Message(NamedTuple):
+    """
+    Message of a transaction, with the addresses loaded from lookup tables appended to account_keys
+    """
+
+    signature: str
+    account_keys: List[str]
+    num_signed: int
+    num_readonly_signed: int
+    num_readonly_unsigned: int
+    num_static: int
+    num_loaded_writable: int
+    # (program id index, account indices, data or base58 encoded data)
+    instructions: List[Tuple[int, List[int], Union[bytes, str]]]
+
+    def is_writable(self, i: int) -> bool:
+        if i >= self.num_static:
+            return i < self.num_static + self.num_loaded_writable
+        if i < self.num_signed:
+            return i < self.num_signed - self.num_readonly_signed
+        return i < self.num_static - self.num_readonly_unsigned
+
+    def get_account_key(self, i: int) -> str:
+        if i >= len(self.account_keys):
+            raise ValueError(
+                f"Account {i} is loaded from an address lookup table which is not resolved "
+                f"(the transaction has {len(self.account_keys)} account keys)"
+            )
+        return self.account_keys[i]
+
+    def get_instruction(
+        self, program_id: str, accounts: List[int], data: Union[bytes, str]
+    ) -> TransactionInstruction:
+        keys = [
+            to_account_meta(
+                self.get_account_key(i),
+                is_signer=i < self.num_signed,
+                is_writable=self.is_writable(i),
+            )
+            for i in accounts
+        ]
+        if isinstance(data, str):
+            data = base58.b58decode(data)
+        return TransactionInstruction(
+            keys=keys, program_id=PublicKey(program_id), data=data
+        )
+
+
+def _read_shortvec(raw: bytes, offset: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = raw[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+def parse_wire_transaction(raw: bytes) -> Message:
+    """
+    Parses a serialized (legacy or v0) transaction. The addresses of the lookup tables of v0
+    transactions are not resolved, so Message.get_instruction raises ValueError for the
+    instructions using them.
+    """
+    num_signatures, offset = _read_shortvec(raw, 0)
+    signature = base58.b58encode(raw[offset : offset + 64]).decode()
+    offset += 64 * num_signatures
+
+    if raw[offset] & 0x80:
+        offset += 1
+
+    num_signed, num_readonly_signed, num_readonly_unsigned = raw[offset : offset + 3]
+    num_keys, offset = _read_shortvec(raw, offset + 3)
+    account_keys = [
+        base58.b58encode(raw[start : start + 32]).decode()
+        for start in range(offset, offset + 32 * num_keys, 32)
+    ]
+    # skips the recent blockhash
+    offset += 32 * num_keys + 32
+
+    instructions = []
+    num_instructions, offset = _read_shortvec(raw, offset)
+    for _ in range(num_instructions):
+        program_index = raw[offset]
+        num_accounts, offset = _read_shortvec(raw, offset + 1)
+        accounts = list(raw[offset : offset + num_accounts])
+        size, offset = _read_shortvec(raw, offset + num_accounts)
+        instructions.append((program_index, accounts, raw[offset : offset + size]))
+        offset += size
+
+    return Message(
+        signature=signature,
+        account_keys=account_keys,
+        num_signed=num_signed,
+        num_readonly_signed=num_readonly_signed,
+        num_readonly_unsigned=num_readonly_unsigned,
+        num_static=num_keys,
+        num_loaded_writable=0,
+        instructions=instructions,
+    )
+
+
+def parse_json_transaction(tx: dict) -> Message:
+    """
+    Parses a transaction of a getBlock response, resolving its loaded addresses from the metadata
+    """
+    transaction = tx["transaction"]
+    if isinstance(transaction, list):
+        data, encoding = transaction
+        if encoding != "base64":
+            raise ValueError(f"Unsupported transaction encoding {encoding}")
+        message = parse_wire_transaction(base64.b64decode(data))
+    else:
+        raw_message = transaction["message"]
+        account_keys = raw_message["accountKeys"]
+        if account_keys and not isinstance(account_keys[0], str):
+            raise ValueError("Parsed transactions (jsonParsed) are not supported")
+
+        header = raw_message["header"]
+        message = Message(
+            signature=transaction["signatures"][0],
+            account_keys=account_keys,
+            num_signed=header["numRequiredSignatures"],
+            num_readonly_signed=header["numReadonlySignedAccounts"],
+            num_readonly_unsigned=header["numReadonlyUnsignedAccounts"],
+            num_static=len(account_keys),
+            num_loaded_writable=0,
+            instructions=[
+                (ix["programIdIndex"], ix["accounts"], ix["data"])
+                for ix in raw_message["instructions"]
+            ],
+        )
+
+    loaded = (tx.get("meta") or {}).get("loadedAddresses")
+    if loaded and (loaded["writable"] or loaded["readonly"]):
+        message = message._replace(
+            account_keys=message.account_keys + loaded["writable"] + loaded["readonly"],
+            num_loaded_writable=len(loaded["writable"]),
+        )
+
+    return message
+
+
+class BlockPipeline:
+    """
+    Decodes the instructions of some programs in block dumps.
+
+    :param decoders: decode_instruction function of each program to decode, defaults to the bundled
+                     token and system programs. The functions are sent to the workers so they must
+                     be importable (e.g. the generated `<program>.instructions.decode_instruction`).
+    :param jobs: Number of worker processes. If 1, everything runs in the current process.
+                 If None, the number of processors is used.
+    :param chunk_size: Number of bytes of the dumps handed to a worker at once (a record, i.e. a
+                       block or a binary transaction, is never split)
+    :param inner: Whether the instructions invoked by other instructions are decoded
+    :param include_failed: Whether the instructions of failed transactions are decoded
+    :param strict: Whether the instructions that cannot be decoded raise (otherwise they are skipped),
+                   including those using accounts of unresolved lookup tables
+    """
+
+    def __init__(
+        self,
+        decoders: Optional[Decoders] = None,
+        jobs: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        inner: bool = True,
+        include_failed: bool = False,
+        strict: bool = False,
+    ):
+        if decoders is None:
+            decoders = get_default_decoders()
+
+        self.decoders = {
+            str(program_id): decoder for program_id, decoder in decoders.items()
+        }
+        self.jobs = jobs
+        self.chunk_size = chunk_size
+        self.inner = inner
+        self.include_failed = include_failed
+        self.strict = strict
+
+    def decode(
+        self, paths: Union[str, Iterable[str]], format: Optional[str] = None
+    ) -> Iterator[DecodedInstruction]:
+        """
+        Lazily decodes the dumps (files or directories of files), in order
+        """
+        for decoded in self._run(paths, format, columnar=False):
+            yield from decoded
+
+    def decode_batches(
+        self, paths: Union[str, Iterable[str]], format: Optional[str] = None
+    ) -> Iterator[Dict[str, Dict[str, list]]]:
+        """
+        Lazily decodes the dumps into one batch of columns per chunk (see `to_columns`), which are
+        much cheaper to send back from the workers than instruction objects
+        """
+        return self._run(paths, format, columnar=True)
+
+    def decode_records(self, records: Iterable[bytes], format: str):
+        decoded = []
+        for slot, message, meta in iter_messages(records, format, self.include_failed):
+            for index, inner_index, program_index, accounts, data in iter_instructions(
+                message, meta, self.inner
+            ):
+                try:
+                    program_id = message.get_account_key(program_index)
+                    decoder = self.decoders.get(program_id)
+                    if decoder is None:
+                        continue
+
+                    ix = message.get_instruction(program_id, accounts, data)
+                    decoded_ix = decoder(ix)
+                except (ValueError, struct.error):
+                    if self.strict:
+                        raise
+                    continue
+
+                decoded.append(
+                    DecodedInstruction(
+                        slot, message.signature, index, inner_index, decoded_ix
+                    )
+                )
+
+        return decoded
+
+    def _run(self, paths, format, columnar):
+        chunks = iter_chunks(get_dump_files(paths), format, self.chunk_size)
+
+        if self.jobs == 1:
+            for chunk_format, records in chunks:
+                decoded = self.decode_records(records, chunk_format)
+                yield to_columns(decoded) if columnar else decoded
+            return
+
+        max_pending = 2 * (self.jobs or os.cpu_count() or 1)
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            try:
+                for chunk_format, records in chunks:
+                    memory, ends = share_records(records)
+                    future = executor.submit(
+                        _decode_shared_records,
+                        self,
+                        memory.name,
+                        ends,
+                        chunk_format,
+                        columnar,
+                    )
+                    pending.append((memory, future))
+
+                    if len(pending) >= max_pending:
+                        yield _collect(*pending.popleft())
+
+                while pending:
+                    yield _collect(*pending.popleft())
+            finally:
+                executor.shutdown(cancel_futures=True)
+                for memory, _ in pending:
+                    release_shared_memory(memory)
+
+
+def get_default_decoders() -> Decoders:
+    from solmate.programs import system_program, token_program
+
+    return {
+        token_program.PROGRAM_ID: token_program.instructions.decode_instruction,
+        system_program.PROGRAM_ID: system_program.instructions.decode_instruction,
+    }
+
+
+def get_dump_files(paths: Union[str, Iterable[str]]) -> List[str]:
+    if isinstance(paths, str):
+        paths = [paths]
+
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name)
+                for name in sorted(os.listdir(path))
+                if os.path.splitext(name)[1] in FORMATS_BY_SUFFIX
+            )
+        else:
+            files.append(path)
+
+    return files
+
+
+def get_dump_format(path: str) -> str:
+    suffix = os.path.splitext(path)[1]
+    if suffix not in FORMATS_BY_SUFFIX:
+        raise ValueError(f"Unknown dump format of {path}")
+    return FORMATS_BY_SUFFIX[suffix]
+
+
+def iter_records(path: str, format: str) -> Iterator[bytes]:
+    """
+    Reads the records of a dump: the block of a json file, the lines of a jsonl file or the
+    transactions (with their header) of a binary file
+    """
+    with open(path, "rb") as f:
+        if format == "json":
+            yield f.read()
+        elif format == "jsonl":
+            for line in f:
+                if line.strip():
+                    yield line
+        elif format == "binary":
+            while True:
+                header = f.read(_RECORD_HEADER.size)
+                if not header:
+                    break
+
+                _, size = _RECORD_HEADER.unpack(header)
+                record = header + f.read(size)
+                if len(record) != _RECORD_HEADER.size + size:
+                    raise ValueError(f"Truncated record at the end of {path}")
+                yield record
+        else:
+            raise ValueError(f"Unknown dump format {format}")
+
+
+def iter_chunks(
+    paths: Iterable[str], format: Optional[str], chunk_size: int
+) -> Iterator[Tuple[str, List[bytes]]]:
+    """
+    Groups the records of the dumps into chunks of about chunk_size bytes (of a single format)
+    """
+    chunk_format = None
+    records = []
+    size = 0
+    for path in paths:
+        path_format = format or get_dump_format(path)
+        for record in iter_records(path, path_format):
+            if records and (size >= chunk_size or path_format != chunk_format):
+                yield chunk_format, records
+                records = []
+                size = 0
+
+            chunk_format = path_format
+            records.append(record)
+            size += len(record)
+
+    if records:
+        yield chunk_format, records
+
+
+def iter_messages(
+    records: Iterable[bytes], format: str, include_failed: bool = False
+) -> Iterator[Tuple[Optional[int], Message, Optional[dict]]]:
+    """
+    Parses the transactions of the records with their slot and metadata (None for binary dumps)
+    """
+    for record in records:
+        if format == "binary":
+            slot, _ = _RECORD_HEADER.unpack_from(record)
+            message = parse_wire_transaction(record[_RECORD_HEADER.size :])
+            yield slot, message, None
+            continue
+
+        block = json.loads(record)
+        if "jsonrpc" in block:
+            block = block["result"]
+        if block is None:
+            continue
+
+        slot = block.get("slot")
+        for tx in block.get("transactions", ()):
+            meta = tx.get("meta")
+            if not include_failed and meta is not None and meta.get("err") is not None:
+                continue
+            yield slot, parse_json_transaction(tx), meta
+
+
+def iter_instructions(
+    message: Message, meta: Optional[dict] = None, inner: bool = True
+) -> Iterator[Tuple[int, Optional[int], int, List[int], Union[bytes, str]]]:
+    """
+    Iterates over the (index, inner_index, program id index, accounts, data) of the instructions of
+    a message, the inner instructions (from the metadata) following the instruction invoking them
+    """
+    inner_instructions = {}
+    if inner:
+        for item in (meta or {}).get("innerInstructions") or ():
+            inner_instructions[item["index"]] = item["instructions"]
+
+    for index, (program_index, accounts, data) in enumerate(message.instructions):
+        yield index, None, program_index, accounts, data
+
+        for inner_index, ix in enumerate(inner_instructions.get(index, ())):
+            yield index, inner_index, ix["programIdIndex"], ix["accounts"], ix["data"]
+
+
+def _to_column_value(value):
+    if isinstance(value, AccountMeta):
+        return str(value.pubkey)
+    elif isinstance(value, PublicKey):
+        return str(value)
+    elif isinstance(value, list):
+        return [_to_column_value(v) for v in value]
+    return value
+
+
+def to_columns(decoded: Iterable[DecodedInstruction]) -> Dict[str, Dict[str, list]]:
+    """
+    Groups decoded instructions by instruction class into columns: the location of the instructions
+    (slot, signature, index and inner_index) and the fields of the instruction class, with the
+    accounts and public keys as base58 strings
+    """
+    columns = {}
+    for item in decoded:
+        ix_cls = type(item.ix)
+        ix_columns = columns.get(ix_cls.__name__)
+        if ix_columns is None:
+            names = list(DecodedInstruction._fields[:-1])
+            names.extend(field.name for field in fields(ix_cls))
+            ix_columns = {name: [] for name in names}
+            columns[ix_cls.__name__] = ix_columns
+
+        for name, value in zip(DecodedInstruction._fields[:-1], item):
+            ix_columns[name].append(value)
+        for field in fields(ix_cls):
+            ix_columns[field.name].append(
+                _to_column_value(getattr(item.ix, field.name))
+            )
+
+    return columns
+
+
+def share_records(records: List[bytes]) -> Tuple[shared_memory.SharedMemory, List[int]]:
+    """
+    Copies records into a new shared memory block, returns it with the end offsets of the records
+    """
+    ends = []
+    size = 0
+    for record in records:
+        size += len(record)
+        ends.append(size)
+
+    memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    start = 0
+    for record, end in zip(records, ends):
+        memory.buf[start:end] = record
+        start = end
+
+    return memory, ends
+
+
+def release_shared_memory(memory: shared_memory.SharedMemory):
+    memory.close()
+    memory.unlink()
+
+
+def _collect(memory: shared_memory.SharedMemory, future):
+    try:
+        return future.result()
+    finally:
+        release_shared_memory(memory)
+
+
+def _decode_shared_records(
+    pipeline: BlockPipeline, name: str, ends: List[int], format: str, columnar: bool
+):
+    # the block is unlinked by the parent process once the result is collected
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        starts = [0] + ends[:-1]
+        records = [bytes(memory.buf[start:end]) for start, end in zip(starts, ends)]
+    finally:
+        memory.close()
+
+    decoded = pipeline.decode_records(records, format)
+    return to_columns(decoded) if columnar else decoded
@@ -2,10 +2,12 @@
 from .advance_nonce_account import (
     AdvanceNonceAccountIx,
     advance_nonce_account,
+    advance_nonce_account_many,
 )
 from .allocate import (
     AllocateIx,
     allocate,
+    allocate_many,
 )
 from .allocate_with_seed import (
     AllocateWithSeedIx,
@@ -14,6 +16,7 @@ from .allocate_with_seed import (
 from .assign import (
     AssignIx,
     assign,
+    assign_many,
 )
 from .assign_with_seed import (
     AssignWithSeedIx,
@@ -22,23 +25,31 @@ from .assign_with_seed import (
 from .authorize_nonce_account import (
     AuthorizeNonceAccountIx,
     authorize_nonce_account,
+    authorize_nonce_account_many,
 )
 from .create_account import (
     CreateAccountIx,
     create_account,
+    create_account_many,
 )
 from .create_account_with_seed import (
     CreateAccountWithSeedIx,
     create_account_with_seed,
 )
+from .decoder import (
+    decode_instruction,
+    decode_instructions,
+)
 from .initialize_nonce_account import (
     InitializeNonceAccountIx,
     initialize_nonce_account,
+    initialize_nonce_account_many,
 )
 from .instruction_tag import InstructionTag
 from .transfer import (
     TransferIx,
     transfer,
+    transfer_many,
 )
 from .transfer_with_seed import (
     TransferWithSeedIx,
@@ -47,6 +58,7 @@ from .transfer_with_seed import (
 from .withdraw_nonce_account import (
     WithdrawNonceAccountIx,
     withdraw_nonce_account,
+    withdraw_nonce_account_many,
 )
 
 # LOCK-END
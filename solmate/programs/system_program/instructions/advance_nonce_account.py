@@ -1,18 +1,28 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
 from solana.publickey import PublicKey
 from solana.sysvar import SYSVAR_RECENT_BLOCKHASHES_PUBKEY as RECENT_BLOCKHASHES_SYSVAR
 from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    copy_metas,
+    meta_column,
+    pack_many,
+)
 from solmate.programs.system_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -30,6 +40,9 @@ class AdvanceNonceAccountIx:
     authority: AccountMeta
     remaining_accounts: Optional[List[AccountMeta]]
 
+    # InstructionTag.ADVANCE_NONCE_ACCOUNT followed by the data fields
+    _data_layout = Struct("<I")
+
     def to_instruction(self):
         keys = []
         keys.append(self.nonce_pubkey)
@@ -38,13 +51,29 @@ class AdvanceNonceAccountIx:
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.ADVANCE_NONCE_ACCOUNT))
+        data = self._data_layout.pack(4)
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("nonce_pubkey", False, False, False),
+        ("recent_blockhashes_sysvar", False, False, False),
+        ("authority", False, False, True),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "AdvanceNonceAccountIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
         )
 
 
@@ -102,3 +131,63 @@ def advance_nonce_account(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(advance_nonce_account)]: DON'T MODIFY
+def advance_nonce_account_many(
+    nonce_pubkey: AccountColumn,
+    authority: AccountColumn,
+    recent_blockhashes_sysvar: AccountColumn = RECENT_BLOCKHASHES_SYSVAR,
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(nonce_pubkey, recent_blockhashes_sysvar, authority)
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    nonce_pubkey = meta_column(
+        nonce_pubkey,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+    recent_blockhashes_sysvar = meta_column(
+        recent_blockhashes_sysvar,
+        n_instructions,
+        is_signer=False,
+        is_writable=False,
+    )
+    authority = meta_column(
+        authority,
+        n_instructions,
+        is_signer=True,
+        is_writable=False,
+    )
+
+    payloads = pack_many(AdvanceNonceAccountIx._data_layout, 4, (), n_instructions)
+
+    return [
+        TransactionInstruction(
+            keys=[
+                nonce_pubkey_,
+                recent_blockhashes_sysvar_,
+                authority_,
+                *(copy_metas(remaining_accounts) or ()),
+            ],
+            program_id=program_id,
+            data=payload,
+        )
+        for nonce_pubkey_, recent_blockhashes_sysvar_, authority_, payload in zip(
+            nonce_pubkey, recent_blockhashes_sysvar, authority, payloads
+        )
+    ]
+
+
+# LOCK-END
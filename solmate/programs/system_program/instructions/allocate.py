@@ -1,21 +1,28 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
-from podite import (
-    BYTES_CATALOG,
-    U64,
-)
+from podite import U64
 from solana.publickey import PublicKey
 from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    copy_metas,
+    meta_column,
+    pack_many,
+)
 from solmate.programs.system_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -34,20 +41,40 @@ class AllocateIx:
     # data fields
     space: U64
 
+    # InstructionTag.ALLOCATE followed by the data fields
+    _data_layout = Struct("<IQ")
+
     def to_instruction(self):
         keys = []
         keys.append(self.new_pubkey)
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.ALLOCATE))
-        buffer.write(BYTES_CATALOG.pack(U64, self.space))
+        data = self._data_layout.pack(8, self.space)
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("new_pubkey", False, False, True),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "AllocateIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        if len(ix.data) < cls._data_layout.size:
+            raise ValueError("The instruction data is shorter than the data layout")
+        _, space = cls._data_layout.unpack_from(ix.data)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            space=space,
         )
 
 
@@ -87,3 +114,43 @@ def allocate(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(allocate)]: DON'T MODIFY
+def allocate_many(
+    new_pubkey: AccountColumn,
+    space: Union[U64, Sequence[U64]],
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(new_pubkey, space)
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    new_pubkey = meta_column(
+        new_pubkey,
+        n_instructions,
+        is_signer=True,
+        is_writable=True,
+    )
+
+    payloads = pack_many(AllocateIx._data_layout, 8, (space,), n_instructions)
+
+    return [
+        TransactionInstruction(
+            keys=[new_pubkey_, *(copy_metas(remaining_accounts) or ())],
+            program_id=program_id,
+            data=payload,
+        )
+        for new_pubkey_, payload in zip(new_pubkey, payloads)
+    ]
+
+
+# LOCK-END
@@ -12,7 +12,11 @@ from solana.transaction import (
     TransactionInstruction,
 )
 from solmate.programs.system_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+    unpack_borsh,
+)
 from typing import (
     List,
     Optional,
@@ -58,6 +62,32 @@ class AllocateWithSeedIx:
             data=buffer.getvalue(),
         )
 
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("derived_pubkey", False, False, False),
+        ("base_pubkey", False, False, True),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "AllocateWithSeedIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        buffer = BytesIO(ix.data)
+        buffer.seek(4)
+        base = unpack_borsh(PublicKey, buffer)
+        seed = unpack_borsh(str, buffer)
+        space = unpack_borsh(U64, buffer)
+        owner = unpack_borsh(PublicKey, buffer)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            base=base,
+            seed=seed,
+            space=space,
+            owner=owner,
+        )
+
 
 # LOCK-END
 
@@ -1,18 +1,27 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
-from podite import BYTES_CATALOG
 from solana.publickey import PublicKey
 from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    copy_metas,
+    meta_column,
+    pack_many,
+)
 from solmate.programs.system_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -31,20 +40,40 @@ class AssignIx:
     # data fields
     owner: PublicKey
 
+    # InstructionTag.ASSIGN followed by the data fields
+    _data_layout = Struct("<I32s")
+
     def to_instruction(self):
         keys = []
         keys.append(self.pubkey)
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.ASSIGN))
-        buffer.write(BYTES_CATALOG.pack(PublicKey, self.owner))
+        data = self._data_layout.pack(1, bytes(self.owner))
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("pubkey", False, False, True),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "AssignIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        if len(ix.data) < cls._data_layout.size:
+            raise ValueError("The instruction data is shorter than the data layout")
+        _, owner = cls._data_layout.unpack_from(ix.data)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            owner=PublicKey(owner),
         )
 
 
@@ -84,3 +113,43 @@ def assign(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(assign)]: DON'T MODIFY
+def assign_many(
+    pubkey: AccountColumn,
+    owner: Union[PublicKey, Sequence[PublicKey]],
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(pubkey, owner)
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    pubkey = meta_column(
+        pubkey,
+        n_instructions,
+        is_signer=True,
+        is_writable=True,
+    )
+
+    payloads = pack_many(AssignIx._data_layout, 1, (owner,), n_instructions)
+
+    return [
+        TransactionInstruction(
+            keys=[pubkey_, *(copy_metas(remaining_accounts) or ())],
+            program_id=program_id,
+            data=payload,
+        )
+        for pubkey_, payload in zip(pubkey, payloads)
+    ]
+
+
+# LOCK-END
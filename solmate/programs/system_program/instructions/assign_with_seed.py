@@ -9,7 +9,11 @@ from solana.transaction import (
     TransactionInstruction,
 )
 from solmate.programs.system_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+    unpack_borsh,
+)
 from typing import (
     List,
     Optional,
@@ -53,6 +57,30 @@ class AssignWithSeedIx:
             data=buffer.getvalue(),
         )
 
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("derived_pubkey", False, False, False),
+        ("base_pubkey", False, False, True),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "AssignWithSeedIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        buffer = BytesIO(ix.data)
+        buffer.seek(4)
+        base = unpack_borsh(PublicKey, buffer)
+        seed = unpack_borsh(str, buffer)
+        owner = unpack_borsh(PublicKey, buffer)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            base=base,
+            seed=seed,
+            owner=owner,
+        )
+
 
 # LOCK-END
 
@@ -1,18 +1,27 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
-from podite import BYTES_CATALOG
 from solana.publickey import PublicKey
 from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    copy_metas,
+    meta_column,
+    pack_many,
+)
 from solmate.programs.system_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -32,6 +41,9 @@ class AuthorizeNonceAccountIx:
     # data fields
     new_authority: PublicKey
 
+    # InstructionTag.AUTHORIZE_NONCE_ACCOUNT followed by the data fields
+    _data_layout = Struct("<I32s")
+
     def to_instruction(self):
         keys = []
         keys.append(self.nonce_pubkey)
@@ -39,14 +51,32 @@ class AuthorizeNonceAccountIx:
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.AUTHORIZE_NONCE_ACCOUNT))
-        buffer.write(BYTES_CATALOG.pack(PublicKey, self.new_authority))
+        data = self._data_layout.pack(7, bytes(self.new_authority))
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("nonce_pubkey", False, False, False),
+        ("authority", False, False, True),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "AuthorizeNonceAccountIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        if len(ix.data) < cls._data_layout.size:
+            raise ValueError("The instruction data is shorter than the data layout")
+        _, new_authority = cls._data_layout.unpack_from(ix.data)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            new_authority=PublicKey(new_authority),
         )
 
 
@@ -95,3 +125,52 @@ def authorize_nonce_account(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(authorize_nonce_account)]: DON'T MODIFY
+def authorize_nonce_account_many(
+    nonce_pubkey: AccountColumn,
+    authority: AccountColumn,
+    new_authority: Union[PublicKey, Sequence[PublicKey]],
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(nonce_pubkey, authority, new_authority)
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    nonce_pubkey = meta_column(
+        nonce_pubkey,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+    authority = meta_column(
+        authority,
+        n_instructions,
+        is_signer=True,
+        is_writable=False,
+    )
+
+    payloads = pack_many(
+        AuthorizeNonceAccountIx._data_layout, 7, (new_authority,), n_instructions
+    )
+
+    return [
+        TransactionInstruction(
+            keys=[nonce_pubkey_, authority_, *(copy_metas(remaining_accounts) or ())],
+            program_id=program_id,
+            data=payload,
+        )
+        for nonce_pubkey_, authority_, payload in zip(nonce_pubkey, authority, payloads)
+    ]
+
+
+# LOCK-END
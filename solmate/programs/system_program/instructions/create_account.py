@@ -1,21 +1,28 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
-from podite import (
-    BYTES_CATALOG,
-    U64,
-)
+from podite import U64
 from solana.publickey import PublicKey
 from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    copy_metas,
+    meta_column,
+    pack_many,
+)
 from solmate.programs.system_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -37,6 +44,9 @@ class CreateAccountIx:
     space: U64
     owner: PublicKey
 
+    # InstructionTag.CREATE_ACCOUNT followed by the data fields
+    _data_layout = Struct("<IQQ32s")
+
     def to_instruction(self):
         keys = []
         keys.append(self.from_pubkey)
@@ -44,16 +54,34 @@ class CreateAccountIx:
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.CREATE_ACCOUNT))
-        buffer.write(BYTES_CATALOG.pack(U64, self.lamports))
-        buffer.write(BYTES_CATALOG.pack(U64, self.space))
-        buffer.write(BYTES_CATALOG.pack(PublicKey, self.owner))
+        data = self._data_layout.pack(0, self.lamports, self.space, bytes(self.owner))
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("from_pubkey", False, False, True),
+        ("to_pubkey", False, False, True),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "CreateAccountIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        if len(ix.data) < cls._data_layout.size:
+            raise ValueError("The instruction data is shorter than the data layout")
+        _, lamports, space, owner = cls._data_layout.unpack_from(ix.data)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            lamports=lamports,
+            space=space,
+            owner=PublicKey(owner),
         )
 
 
@@ -106,3 +134,61 @@ def create_account(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(create_account)]: DON'T MODIFY
+def create_account_many(
+    from_pubkey: AccountColumn,
+    to_pubkey: AccountColumn,
+    lamports: Union[U64, Sequence[U64]],
+    space: Union[U64, Sequence[U64]],
+    owner: Union[PublicKey, Sequence[PublicKey]],
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(from_pubkey, to_pubkey, lamports, space, owner)
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    from_pubkey = meta_column(
+        from_pubkey,
+        n_instructions,
+        is_signer=True,
+        is_writable=True,
+    )
+    to_pubkey = meta_column(
+        to_pubkey,
+        n_instructions,
+        is_signer=True,
+        is_writable=True,
+    )
+
+    payloads = pack_many(
+        CreateAccountIx._data_layout,
+        0,
+        (
+            lamports,
+            space,
+            owner,
+        ),
+        n_instructions,
+    )
+
+    return [
+        TransactionInstruction(
+            keys=[from_pubkey_, to_pubkey_, *(copy_metas(remaining_accounts) or ())],
+            program_id=program_id,
+            data=payload,
+        )
+        for from_pubkey_, to_pubkey_, payload in zip(from_pubkey, to_pubkey, payloads)
+    ]
+
+
+# LOCK-END
@@ -0,0 +1,72 @@
+# LOCK-BEGIN[imports]: DON'T MODIFY
+from .advance_nonce_account import AdvanceNonceAccountIx
+from .allocate import AllocateIx
+from .allocate_with_seed import AllocateWithSeedIx
+from .assign import AssignIx
+from .assign_with_seed import AssignWithSeedIx
+from .authorize_nonce_account import AuthorizeNonceAccountIx
+from .create_account import CreateAccountIx
+from .create_account_with_seed import CreateAccountWithSeedIx
+from .initialize_nonce_account import InitializeNonceAccountIx
+from .transfer import TransferIx
+from .transfer_with_seed import TransferWithSeedIx
+from .withdraw_nonce_account import WithdrawNonceAccountIx
+from solana.publickey import PublicKey
+from solana.transaction import TransactionInstruction
+from struct import Struct
+from typing import (
+    Iterable,
+    Optional,
+)
+
+# LOCK-END
+
+
+# LOCK-BEGIN[decoder]: DON'T MODIFY
+# instruction tag to instruction class
+_INSTRUCTIONS_BY_TAG = {
+    0: CreateAccountIx,
+    1: AssignIx,
+    2: TransferIx,
+    3: CreateAccountWithSeedIx,
+    4: AdvanceNonceAccountIx,
+    5: WithdrawNonceAccountIx,
+    6: InitializeNonceAccountIx,
+    7: AuthorizeNonceAccountIx,
+    8: AllocateIx,
+    9: AllocateWithSeedIx,
+    10: AssignWithSeedIx,
+    11: TransferWithSeedIx,
+}
+_INSTRUCTION_TAG = Struct("<I")
+
+
+def decode_instruction(ix: TransactionInstruction):
+    """
+    Decodes an instruction of the program into its instruction class (i.e. the inverse of
+    to_instruction), dispatching on the instruction tag
+    """
+    if len(ix.data) < 4:
+        raise ValueError("The instruction data is shorter than the instruction tag")
+
+    ix_cls = _INSTRUCTIONS_BY_TAG.get(_INSTRUCTION_TAG.unpack_from(ix.data)[0])
+    if ix_cls is None:
+        raise ValueError(f"Unknown instruction tag {ix.data[:4].hex()}")
+
+    return ix_cls.from_instruction(ix)
+
+
+def decode_instructions(
+    instructions: Iterable[TransactionInstruction],
+    program_id: Optional[PublicKey] = None,
+):
+    """
+    Lazily decodes a stream of instructions, skipping the instructions of the other programs
+    if program_id is given
+    """
+    for ix in instructions:
+        if program_id is None or ix.program_id == program_id:
+            yield decode_instruction(ix)
+
+
+# LOCK-END
@@ -1,8 +1,5 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
-from podite import BYTES_CATALOG
 from solana.publickey import PublicKey
 from solana.sysvar import (
     SYSVAR_RECENT_BLOCKHASHES_PUBKEY as RECENT_BLOCKHASHES_SYSVAR,
@@ -12,11 +9,23 @@ from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    copy_metas,
+    meta_column,
+    pack_many,
+)
 from solmate.programs.system_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -37,6 +46,9 @@ class InitializeNonceAccountIx:
     # data fields
     authority: PublicKey
 
+    # InstructionTag.INITIALIZE_NONCE_ACCOUNT followed by the data fields
+    _data_layout = Struct("<I32s")
+
     def to_instruction(self):
         keys = []
         keys.append(self.nonce_pubkey)
@@ -45,14 +57,33 @@ class InitializeNonceAccountIx:
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.INITIALIZE_NONCE_ACCOUNT))
-        buffer.write(BYTES_CATALOG.pack(PublicKey, self.authority))
+        data = self._data_layout.pack(6, bytes(self.authority))
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("nonce_pubkey", False, False, False),
+        ("recent_blockhashes_sysvar", False, False, False),
+        ("rent_sysvar", False, False, False),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "InitializeNonceAccountIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        if len(ix.data) < cls._data_layout.size:
+            raise ValueError("The instruction data is shorter than the data layout")
+        _, authority = cls._data_layout.unpack_from(ix.data)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            authority=PublicKey(authority),
         )
 
 
@@ -112,3 +143,68 @@ def initialize_nonce_account(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(initialize_nonce_account)]: DON'T MODIFY
+def initialize_nonce_account_many(
+    nonce_pubkey: AccountColumn,
+    authority: Union[PublicKey, Sequence[PublicKey]],
+    recent_blockhashes_sysvar: AccountColumn = RECENT_BLOCKHASHES_SYSVAR,
+    rent_sysvar: AccountColumn = RENT_SYSVAR,
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(
+        nonce_pubkey, recent_blockhashes_sysvar, rent_sysvar, authority
+    )
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    nonce_pubkey = meta_column(
+        nonce_pubkey,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+    recent_blockhashes_sysvar = meta_column(
+        recent_blockhashes_sysvar,
+        n_instructions,
+        is_signer=False,
+        is_writable=False,
+    )
+    rent_sysvar = meta_column(
+        rent_sysvar,
+        n_instructions,
+        is_signer=False,
+        is_writable=False,
+    )
+
+    payloads = pack_many(
+        InitializeNonceAccountIx._data_layout, 6, (authority,), n_instructions
+    )
+
+    return [
+        TransactionInstruction(
+            keys=[
+                nonce_pubkey_,
+                recent_blockhashes_sysvar_,
+                rent_sysvar_,
+                *(copy_metas(remaining_accounts) or ()),
+            ],
+            program_id=program_id,
+            data=payload,
+        )
+        for nonce_pubkey_, recent_blockhashes_sysvar_, rent_sysvar_, payload in zip(
+            nonce_pubkey, recent_blockhashes_sysvar, rent_sysvar, payloads
+        )
+    ]
+
+
+# LOCK-END
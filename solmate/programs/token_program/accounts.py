@@ -6,9 +6,19 @@ from podite import (
     Variant,
     pod,
 )
-from solmate.programs.token_program.types.account import Account
-from solmate.programs.token_program.types.mint import Mint
-from solmate.programs.token_program.types.multisig import Multisig
+from solmate.filters import FilterBuilder
+from solmate.programs.token_program.types.account import (
+    Account,
+    AccountView,
+)
+from solmate.programs.token_program.types.mint import (
+    Mint,
+    MintView,
+)
+from solmate.programs.token_program.types.multisig import (
+    Multisig,
+    MultisigView,
+)
 
 # LOCK-END
 
@@ -23,17 +33,12 @@ class Accounts(Enum[U8]):
     @classmethod
     def _from_bytes_partial(cls, buffer, **kwargs):
         account_len = buffer.getbuffer().nbytes - buffer.tell()
-        if account_len == Mint.calc_max_size():
-            obj = BYTES_CATALOG.unpack_partial(Mint, buffer)
-            return Accounts.MINT(obj)
+        entry = _ACCOUNTS_BY_SIZE.get(account_len)
+        if entry is None:
+            return None
 
-        if account_len == Account.calc_max_size():
-            obj = BYTES_CATALOG.unpack_partial(Account, buffer)
-            return Accounts.ACCOUNT(obj)
-
-        if account_len == Multisig.calc_max_size():
-            obj = BYTES_CATALOG.unpack_partial(Multisig, buffer)
-            return Accounts.MULTISIG(obj)
+        variant, account_type = entry
+        return variant(BYTES_CATALOG.unpack_partial(account_type, buffer))
 
     # LOCK-END
 
@@ -44,3 +49,21 @@ class Accounts(Enum[U8]):
     @classmethod
     def from_bytes(cls, raw, **kwargs):
         return cls.unpack(raw, converter="bytes", **kwargs)
+
+
+# LOCK-BEGIN[accounts_by_size]: DON'T MODIFY
+# account size to (variant, account type), computed once at import
+_ACCOUNTS_BY_SIZE = {
+    Mint.calc_max_size(): (Accounts.MINT, Mint),
+    Account.calc_max_size(): (Accounts.ACCOUNT, Account),
+    Multisig.calc_max_size(): (Accounts.MULTISIG, Multisig),
+}
+# LOCK-END
+
+
+# LOCK-BEGIN[filters]: DON'T MODIFY
+class Filters:
+    MINT = FilterBuilder(MintView)
+    ACCOUNT = FilterBuilder(AccountView)
+    MULTISIG = FilterBuilder(MultisigView)
+    # LOCK-END
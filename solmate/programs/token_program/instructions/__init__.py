@@ -2,58 +2,76 @@
 from .amount_to_ui_amount import (
     AmountToUiAmountIx,
     amount_to_ui_amount,
+    amount_to_ui_amount_many,
 )
 from .approve import (
     ApproveIx,
     approve,
+    approve_many,
 )
 from .approve_checked import (
     ApproveCheckedIx,
     approve_checked,
+    approve_checked_many,
 )
 from .burn import (
     BurnIx,
     burn,
+    burn_many,
 )
 from .burn_checked import (
     BurnCheckedIx,
     burn_checked,
+    burn_checked_many,
 )
 from .close_account import (
     CloseAccountIx,
     close_account,
+    close_account_many,
+)
+from .decoder import (
+    decode_instruction,
+    decode_instructions,
 )
 from .freeze_account import (
     FreezeAccountIx,
     freeze_account,
+    freeze_account_many,
 )
 from .get_account_data_size import (
     GetAccountDataSizeIx,
     get_account_data_size,
+    get_account_data_size_many,
 )
 from .initialize_account import (
     InitializeAccountIx,
     initialize_account,
+    initialize_account_many,
 )
 from .initialize_account2 import (
     InitializeAccount2Ix,
     initialize_account2,
+    initialize_account2_many,
 )
 from .initialize_account3 import (
     InitializeAccount3Ix,
     initialize_account3,
+    initialize_account3_many,
 )
 from .initialize_immutable_owner import (
     InitializeImmutableOwnerIx,
     initialize_immutable_owner,
+    initialize_immutable_owner_many,
 )
 from .initialize_mint import (
     InitializeMintIx,
     initialize_mint,
+    initialize_mint_many,
 )
 from .initialize_mint2 import (
     InitializeMint2Ix,
     initialize_mint2,
+    initialize_mint2_many,
 )
 from .initialize_multisig import (
     InitializeMultisigIx,
@@ -62,43 +80,53 @@ from .initialize_multisig import (
 from .initialize_multisig2 import (
     InitializeMultisig2Ix,
     initialize_multisig2,
+    initialize_multisig2_many,
 )
 from .instruction_tag import InstructionTag
 from .mint_to import (
     MintToIx,
     mint_to,
+    mint_to_many,
 )
 from .mint_to_checked import (
     MintToCheckedIx,
     mint_to_checked,
+    mint_to_checked_many,
 )
 from .revoke import (
     RevokeIx,
     revoke,
+    revoke_many,
 )
 from .set_authority import (
     SetAuthorityIx,
     set_authority,
+    set_authority_many,
 )
 from .sync_native import (
     SyncNativeIx,
     sync_native,
+    sync_native_many,
 )
 from .thaw_account import (
     ThawAccountIx,
     thaw_account,
+    thaw_account_many,
 )
 from .transfer import (
     TransferIx,
     transfer,
+    transfer_many,
 )
 from .transfer_checked import (
     TransferCheckedIx,
     transfer_checked,
+    transfer_checked_many,
 )
 from .ui_amount_to_amount import (
     UiAmountToAmountIx,
     ui_amount_to_amount,
+    ui_amount_to_amount_many,
 )
 
 # LOCK-END
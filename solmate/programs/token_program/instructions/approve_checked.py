@@ -1,10 +1,7 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
 from ..constants import MAX_SIGNERS
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
 from podite import (
-    BYTES_CATALOG,
     U64,
     U8,
 )
@@ -13,11 +10,23 @@ from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    copy_metas,
+    meta_column,
+    pack_many,
+)
 from solmate.programs.token_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -41,6 +50,9 @@ class ApproveCheckedIx:
     amount: U64
     decimals: U8
 
+    # InstructionTag.APPROVE_CHECKED followed by the data fields
+    _data_layout = Struct("<BQB")
+
     def to_instruction(self):
         keys = []
         keys.append(self.source)
@@ -52,15 +64,36 @@ class ApproveCheckedIx:
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.APPROVE_CHECKED))
-        buffer.write(BYTES_CATALOG.pack(U64, self.amount))
-        buffer.write(BYTES_CATALOG.pack(U8, self.decimals))
+        data = self._data_layout.pack(13, self.amount, self.decimals)
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("source", False, False, False),
+        ("mint", False, False, False),
+        ("delegate", False, False, False),
+        ("source_owner", False, False, True),
+        ("signers", True, True, True),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "ApproveCheckedIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        if len(ix.data) < cls._data_layout.size:
+            raise ValueError("The instruction data is shorter than the data layout")
+        _, amount, decimals = cls._data_layout.unpack_from(ix.data)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            amount=amount,
+            decimals=decimals,
         )
 
 
@@ -107,7 +140,7 @@ def approve_checked(
             is_writable=False,
         )
 
-    if len(signers) > MAX_SIGNERS:
+    if signers is not None and len(signers) > MAX_SIGNERS:
         raise ValueError(
             f"len(signers) cannot be bigger than {MAX_SIGNERS}, but was {len(signers)}"
         )
@@ -144,3 +177,97 @@ def approve_checked(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(approve_checked)]: DON'T MODIFY
+def approve_checked_many(
+    source: AccountColumn,
+    mint: AccountColumn,
+    delegate: AccountColumn,
+    source_owner: AccountColumn,
+    amount: Union[U64, Sequence[U64]],
+    decimals: Union[U8, Sequence[U8]],
+    signers: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(source, mint, delegate, source_owner, amount, decimals)
+
+    if signers is not None and len(signers) > MAX_SIGNERS:
+        raise ValueError(
+            f"len(signers) cannot be bigger than {MAX_SIGNERS}, but was {len(signers)}"
+        )
+
+    if isinstance(signers, list):
+        for i in range(len(signers)):
+            if isinstance(signers[i], (str, PublicKey)):
+                signers[i] = to_account_meta(
+                    signers[i],
+                    is_signer=True,
+                    is_writable=False,
+                )
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    source = meta_column(
+        source,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+    mint = meta_column(
+        mint,
+        n_instructions,
+        is_signer=False,
+        is_writable=False,
+    )
+    delegate = meta_column(
+        delegate,
+        n_instructions,
+        is_signer=False,
+        is_writable=False,
+    )
+    source_owner = meta_column(
+        source_owner,
+        n_instructions,
+        is_signer=False if signers else True,
+        is_writable=False,
+    )
+
+    payloads = pack_many(
+        ApproveCheckedIx._data_layout,
+        13,
+        (
+            amount,
+            decimals,
+        ),
+        n_instructions,
+    )
+
+    return [
+        TransactionInstruction(
+            keys=[
+                source_,
+                mint_,
+                delegate_,
+                source_owner_,
+                *(copy_metas(signers) or ()),
+                *(copy_metas(remaining_accounts) or ()),
+            ],
+            program_id=program_id,
+            data=payload,
+        )
+        for source_, mint_, delegate_, source_owner_, payload in zip(
+            source, mint, delegate, source_owner, payloads
+        )
+    ]
+
+
+# LOCK-END
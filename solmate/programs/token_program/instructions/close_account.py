@@ -1,18 +1,28 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
 from ..constants import MAX_SIGNERS
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
 from solana.publickey import PublicKey
 from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    copy_metas,
+    meta_column,
+    pack_many,
+)
 from solmate.programs.token_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -31,6 +41,9 @@ class CloseAccountIx:
     signers: Optional[List[AccountMeta]]
     remaining_accounts: Optional[List[AccountMeta]]
 
+    # InstructionTag.CLOSE_ACCOUNT followed by the data fields
+    _data_layout = Struct("<B")
+
     def to_instruction(self):
         keys = []
         keys.append(self.account)
@@ -41,13 +54,30 @@ class CloseAccountIx:
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.CLOSE_ACCOUNT))
+        data = self._data_layout.pack(9)
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("account", False, False, False),
+        ("destination", False, False, False),
+        ("account_owner", False, False, True),
+        ("signers", True, True, True),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "CloseAccountIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
         )
 
 
@@ -84,7 +114,7 @@ def close_account(
             is_writable=False,
         )
 
-    if len(signers) > MAX_SIGNERS:
+    if signers is not None and len(signers) > MAX_SIGNERS:
         raise ValueError(
             f"len(signers) cannot be bigger than {MAX_SIGNERS}, but was {len(signers)}"
         )
@@ -118,3 +148,79 @@ def close_account(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(close_account)]: DON'T MODIFY
+def close_account_many(
+    account: AccountColumn,
+    destination: AccountColumn,
+    account_owner: AccountColumn,
+    signers: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(account, destination, account_owner)
+
+    if signers is not None and len(signers) > MAX_SIGNERS:
+        raise ValueError(
+            f"len(signers) cannot be bigger than {MAX_SIGNERS}, but was {len(signers)}"
+        )
+
+    if isinstance(signers, list):
+        for i in range(len(signers)):
+            if isinstance(signers[i], (str, PublicKey)):
+                signers[i] = to_account_meta(
+                    signers[i],
+                    is_signer=True,
+                    is_writable=False,
+                )
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    account = meta_column(
+        account,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+    destination = meta_column(
+        destination,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+    account_owner = meta_column(
+        account_owner,
+        n_instructions,
+        is_signer=False if signers else True,
+        is_writable=False,
+    )
+
+    payloads = pack_many(CloseAccountIx._data_layout, 9, (), n_instructions)
+
+    return [
+        TransactionInstruction(
+            keys=[
+                account_,
+                destination_,
+                account_owner_,
+                *(copy_metas(signers) or ()),
+                *(copy_metas(remaining_accounts) or ()),
+            ],
+            program_id=program_id,
+            data=payload,
+        )
+        for account_, destination_, account_owner_, payload in zip(
+            account, destination, account_owner, payloads
+        )
+    ]
+
+
+# LOCK-END
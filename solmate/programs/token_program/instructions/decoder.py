@@ -0,0 +1,98 @@
+# LOCK-BEGIN[imports]: DON'T MODIFY
+from .amount_to_ui_amount import AmountToUiAmountIx
+from .approve import ApproveIx
+from .approve_checked import ApproveCheckedIx
+from .burn import BurnIx
+from .burn_checked import BurnCheckedIx
+from .close_account import CloseAccountIx
+from .freeze_account import FreezeAccountIx
+from .get_account_data_size import GetAccountDataSizeIx
+from .initialize_account import InitializeAccountIx
+from .initialize_account2 import InitializeAccount2Ix
+from .initialize_account3 import InitializeAccount3Ix
+from .initialize_immutable_owner import InitializeImmutableOwnerIx
+from .initialize_mint import InitializeMintIx
+from .initialize_mint2 import InitializeMint2Ix
+from .initialize_multisig import InitializeMultisigIx
+from .initialize_multisig2 import InitializeMultisig2Ix
+from .mint_to import MintToIx
+from .mint_to_checked import MintToCheckedIx
+from .revoke import RevokeIx
+from .set_authority import SetAuthorityIx
+from .sync_native import SyncNativeIx
+from .thaw_account import ThawAccountIx
+from .transfer import TransferIx
+from .transfer_checked import TransferCheckedIx
+from .ui_amount_to_amount import UiAmountToAmountIx
+from solana.publickey import PublicKey
+from solana.transaction import TransactionInstruction
+from struct import Struct
+from typing import (
+    Iterable,
+    Optional,
+)
+
+# LOCK-END
+
+
+# LOCK-BEGIN[decoder]: DON'T MODIFY
+# instruction tag to instruction class
+_INSTRUCTIONS_BY_TAG = {
+    0: InitializeMintIx,
+    1: InitializeAccountIx,
+    2: InitializeMultisigIx,
+    3: TransferIx,
+    4: ApproveIx,
+    5: RevokeIx,
+    6: SetAuthorityIx,
+    7: MintToIx,
+    8: BurnIx,
+    9: CloseAccountIx,
+    10: FreezeAccountIx,
+    11: ThawAccountIx,
+    12: TransferCheckedIx,
+    13: ApproveCheckedIx,
+    14: MintToCheckedIx,
+    15: BurnCheckedIx,
+    16: InitializeAccount2Ix,
+    17: SyncNativeIx,
+    18: InitializeAccount3Ix,
+    19: InitializeMultisig2Ix,
+    20: InitializeMint2Ix,
+    21: GetAccountDataSizeIx,
+    22: InitializeImmutableOwnerIx,
+    23: AmountToUiAmountIx,
+    24: UiAmountToAmountIx,
+}
+_INSTRUCTION_TAG = Struct("<B")
+
+
+def decode_instruction(ix: TransactionInstruction):
+    """
+    Decodes an instruction of the program into its instruction class (i.e. the inverse of
+    to_instruction), dispatching on the instruction tag
+    """
+    if len(ix.data) < 1:
+        raise ValueError("The instruction data is shorter than the instruction tag")
+
+    ix_cls = _INSTRUCTIONS_BY_TAG.get(_INSTRUCTION_TAG.unpack_from(ix.data)[0])
+    if ix_cls is None:
+        raise ValueError(f"Unknown instruction tag {ix.data[:1].hex()}")
+
+    return ix_cls.from_instruction(ix)
+
+
+def decode_instructions(
+    instructions: Iterable[TransactionInstruction],
+    program_id: Optional[PublicKey] = None,
+):
+    """
+    Lazily decodes a stream of instructions, skipping the instructions of the other programs
+    if program_id is given
+    """
+    for ix in instructions:
+        if program_id is None or ix.program_id == program_id:
+            yield decode_instruction(ix)
+
+
+# LOCK-END
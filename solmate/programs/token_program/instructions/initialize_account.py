@@ -1,18 +1,28 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
 from solana.publickey import PublicKey
 from solana.sysvar import SYSVAR_RENT_PUBKEY as RENT_SYSVAR
 from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    copy_metas,
+    meta_column,
+    pack_many,
+)
 from solmate.programs.token_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -31,6 +41,9 @@ class InitializeAccountIx:
     rent_sysvar: AccountMeta
     remaining_accounts: Optional[List[AccountMeta]]
 
+    # InstructionTag.INITIALIZE_ACCOUNT followed by the data fields
+    _data_layout = Struct("<B")
+
     def to_instruction(self):
         keys = []
         keys.append(self.account)
@@ -40,13 +53,30 @@ class InitializeAccountIx:
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.INITIALIZE_ACCOUNT))
+        data = self._data_layout.pack(1)
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("account", False, False, False),
+        ("mint", False, False, False),
+        ("owner_or_multisig", False, False, False),
+        ("rent_sysvar", False, False, False),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "InitializeAccountIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
         )
 
 
@@ -110,3 +140,71 @@ def initialize_account(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(initialize_account)]: DON'T MODIFY
+def initialize_account_many(
+    account: AccountColumn,
+    mint: AccountColumn,
+    owner_or_multisig: AccountColumn,
+    rent_sysvar: AccountColumn = RENT_SYSVAR,
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(account, mint, owner_or_multisig, rent_sysvar)
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    account = meta_column(
+        account,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+    mint = meta_column(
+        mint,
+        n_instructions,
+        is_signer=False,
+        is_writable=False,
+    )
+    owner_or_multisig = meta_column(
+        owner_or_multisig,
+        n_instructions,
+        is_signer=False,
+        is_writable=False,
+    )
+    rent_sysvar = meta_column(
+        rent_sysvar,
+        n_instructions,
+        is_signer=False,
+        is_writable=False,
+    )
+
+    payloads = pack_many(InitializeAccountIx._data_layout, 1, (), n_instructions)
+
+    return [
+        TransactionInstruction(
+            keys=[
+                account_,
+                mint_,
+                owner_or_multisig_,
+                rent_sysvar_,
+                *(copy_metas(remaining_accounts) or ()),
+            ],
+            program_id=program_id,
+            data=payload,
+        )
+        for account_, mint_, owner_or_multisig_, rent_sysvar_, payload in zip(
+            account, mint, owner_or_multisig, rent_sysvar, payloads
+        )
+    ]
+
+
+# LOCK-END
@@ -1,19 +1,28 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
-from podite import BYTES_CATALOG
 from solana.publickey import PublicKey
 from solana.sysvar import SYSVAR_RENT_PUBKEY as RENT_SYSVAR
 from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    copy_metas,
+    meta_column,
+    pack_many,
+)
 from solmate.programs.token_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -34,6 +43,9 @@ class InitializeAccount2Ix:
     # data fields
     owner: PublicKey
 
+    # InstructionTag.INITIALIZE_ACCOUNT2 followed by the data fields
+    _data_layout = Struct("<B32s")
+
     def to_instruction(self):
         keys = []
         keys.append(self.account)
@@ -42,14 +54,33 @@ class InitializeAccount2Ix:
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.INITIALIZE_ACCOUNT2))
-        buffer.write(BYTES_CATALOG.pack(PublicKey, self.owner))
+        data = self._data_layout.pack(16, bytes(self.owner))
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("account", False, False, False),
+        ("mint", False, False, False),
+        ("rent_sysvar", False, False, False),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "InitializeAccount2Ix":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        if len(ix.data) < cls._data_layout.size:
+            raise ValueError("The instruction data is shorter than the data layout")
+        _, owner = cls._data_layout.unpack_from(ix.data)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            owner=PublicKey(owner),
         )
 
 
@@ -106,3 +137,66 @@ def initialize_account2(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(initialize_account2)]: DON'T MODIFY
+def initialize_account2_many(
+    account: AccountColumn,
+    mint: AccountColumn,
+    owner: Union[PublicKey, Sequence[PublicKey]],
+    rent_sysvar: AccountColumn = RENT_SYSVAR,
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(account, mint, rent_sysvar, owner)
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    account = meta_column(
+        account,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+    mint = meta_column(
+        mint,
+        n_instructions,
+        is_signer=False,
+        is_writable=False,
+    )
+    rent_sysvar = meta_column(
+        rent_sysvar,
+        n_instructions,
+        is_signer=False,
+        is_writable=False,
+    )
+
+    payloads = pack_many(
+        InitializeAccount2Ix._data_layout, 16, (owner,), n_instructions
+    )
+
+    return [
+        TransactionInstruction(
+            keys=[
+                account_,
+                mint_,
+                rent_sysvar_,
+                *(copy_metas(remaining_accounts) or ()),
+            ],
+            program_id=program_id,
+            data=payload,
+        )
+        for account_, mint_, rent_sysvar_, payload in zip(
+            account, mint, rent_sysvar, payloads
+        )
+    ]
+
+
+# LOCK-END
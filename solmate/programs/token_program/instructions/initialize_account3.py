@@ -1,18 +1,27 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
-from podite import BYTES_CATALOG
 from solana.publickey import PublicKey
 from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    copy_metas,
+    meta_column,
+    pack_many,
+)
 from solmate.programs.token_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -32,6 +41,9 @@ class InitializeAccount3Ix:
     # data fields
     owner: PublicKey
 
+    # InstructionTag.INITIALIZE_ACCOUNT3 followed by the data fields
+    _data_layout = Struct("<B32s")
+
     def to_instruction(self):
         keys = []
         keys.append(self.account)
@@ -39,14 +51,32 @@ class InitializeAccount3Ix:
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.INITIALIZE_ACCOUNT3))
-        buffer.write(BYTES_CATALOG.pack(PublicKey, self.owner))
+        data = self._data_layout.pack(18, bytes(self.owner))
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("account", False, False, False),
+        ("mint", False, False, False),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "InitializeAccount3Ix":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        if len(ix.data) < cls._data_layout.size:
+            raise ValueError("The instruction data is shorter than the data layout")
+        _, owner = cls._data_layout.unpack_from(ix.data)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            owner=PublicKey(owner),
         )
 
 
@@ -94,3 +124,52 @@ def initialize_account3(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(initialize_account3)]: DON'T MODIFY
+def initialize_account3_many(
+    account: AccountColumn,
+    mint: AccountColumn,
+    owner: Union[PublicKey, Sequence[PublicKey]],
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(account, mint, owner)
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    account = meta_column(
+        account,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+    mint = meta_column(
+        mint,
+        n_instructions,
+        is_signer=False,
+        is_writable=False,
+    )
+
+    payloads = pack_many(
+        InitializeAccount3Ix._data_layout, 18, (owner,), n_instructions
+    )
+
+    return [
+        TransactionInstruction(
+            keys=[account_, mint_, *(copy_metas(remaining_accounts) or ())],
+            program_id=program_id,
+            data=payload,
+        )
+        for account_, mint_, payload in zip(account, mint, payloads)
+    ]
+
+
+# LOCK-END
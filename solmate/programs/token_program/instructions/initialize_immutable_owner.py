@@ -1,17 +1,27 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
 from solana.publickey import PublicKey
 from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    copy_metas,
+    meta_column,
+    pack_many,
+)
 from solmate.programs.token_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -27,19 +37,38 @@ class InitializeImmutableOwnerIx:
     account: AccountMeta
     remaining_accounts: Optional[List[AccountMeta]]
 
+    # InstructionTag.INITIALIZE_IMMUTABLE_OWNER followed by the data fields
+    _data_layout = Struct("<B")
+
     def to_instruction(self):
         keys = []
         keys.append(self.account)
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.INITIALIZE_IMMUTABLE_OWNER))
+        data = self._data_layout.pack(22)
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("account", False, False, False),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(
+        cls, ix: TransactionInstruction
+    ) -> "InitializeImmutableOwnerIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
         )
 
 
@@ -76,3 +105,44 @@ def initialize_immutable_owner(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(initialize_immutable_owner)]: DON'T MODIFY
+def initialize_immutable_owner_many(
+    account: AccountColumn,
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(account)
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    account = meta_column(
+        account,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+
+    payloads = pack_many(
+        InitializeImmutableOwnerIx._data_layout, 22, (), n_instructions
+    )
+
+    return [
+        TransactionInstruction(
+            keys=[account_, *(copy_metas(remaining_accounts) or ())],
+            program_id=program_id,
+            data=payload,
+        )
+        for account_, payload in zip(account, payloads)
+    ]
+
+
+# LOCK-END
@@ -13,11 +13,23 @@ from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    column,
+    copy_metas,
+    meta_column,
+)
 from solmate.programs.token_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+    unpack_borsh,
+)
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -60,6 +72,30 @@ class InitializeMintIx:
             data=buffer.getvalue(),
         )
 
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("mint", False, False, False),
+        ("rent_sysvar", False, False, False),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "InitializeMintIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        buffer = BytesIO(ix.data)
+        buffer.seek(1)
+        decimals = unpack_borsh(U8, buffer)
+        mint_authority = unpack_borsh(PublicKey, buffer)
+        freeze_authority = unpack_borsh(Static[Optional[PublicKey]], buffer)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            decimals=decimals,
+            mint_authority=mint_authority,
+            freeze_authority=freeze_authority,
+        )
+
 
 # LOCK-END
 
@@ -109,3 +145,64 @@ def initialize_mint(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(initialize_mint)]: DON'T MODIFY
+def initialize_mint_many(
+    mint: AccountColumn,
+    decimals: Union[U8, Sequence[U8]],
+    mint_authority: Union[PublicKey, Sequence[PublicKey]],
+    rent_sysvar: AccountColumn = RENT_SYSVAR,
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    freeze_authority: Union[
+        Static[Optional[PublicKey]], Sequence[Static[Optional[PublicKey]]]
+    ] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(
+        mint, rent_sysvar, decimals, mint_authority, freeze_authority
+    )
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    mint = meta_column(
+        mint,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+    rent_sysvar = meta_column(
+        rent_sysvar,
+        n_instructions,
+        is_signer=False,
+        is_writable=False,
+    )
+
+    return [
+        InitializeMintIx(
+            program_id=program_id,
+            mint=mint_,
+            rent_sysvar=rent_sysvar_,
+            remaining_accounts=copy_metas(remaining_accounts),
+            decimals=decimals_,
+            mint_authority=mint_authority_,
+            freeze_authority=freeze_authority_,
+        ).to_instruction()
+        for mint_, rent_sysvar_, decimals_, mint_authority_, freeze_authority_ in zip(
+            mint,
+            rent_sysvar,
+            column(decimals, n_instructions),
+            column(mint_authority, n_instructions),
+            column(freeze_authority, n_instructions),
+        )
+    ]
+
+
+# LOCK-END
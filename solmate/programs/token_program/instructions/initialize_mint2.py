@@ -12,11 +12,23 @@ from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    column,
+    copy_metas,
+    meta_column,
+)
 from solmate.programs.token_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+    unpack_borsh,
+)
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -57,6 +69,29 @@ class InitializeMint2Ix:
             data=buffer.getvalue(),
         )
 
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("mint", False, False, False),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "InitializeMint2Ix":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        buffer = BytesIO(ix.data)
+        buffer.seek(1)
+        decimals = unpack_borsh(U8, buffer)
+        mint_authority = unpack_borsh(PublicKey, buffer)
+        freeze_authority = unpack_borsh(Static[Optional[PublicKey]], buffer)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            decimals=decimals,
+            mint_authority=mint_authority,
+            freeze_authority=freeze_authority,
+        )
+
 
 # LOCK-END
 
@@ -97,3 +132,53 @@ def initialize_mint2(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(initialize_mint2)]: DON'T MODIFY
+def initialize_mint2_many(
+    mint: AccountColumn,
+    decimals: Union[U8, Sequence[U8]],
+    mint_authority: Union[PublicKey, Sequence[PublicKey]],
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    freeze_authority: Union[
+        Static[Optional[PublicKey]], Sequence[Static[Optional[PublicKey]]]
+    ] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(mint, decimals, mint_authority, freeze_authority)
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    mint = meta_column(
+        mint,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+
+    return [
+        InitializeMint2Ix(
+            program_id=program_id,
+            mint=mint_,
+            remaining_accounts=copy_metas(remaining_accounts),
+            decimals=decimals_,
+            mint_authority=mint_authority_,
+            freeze_authority=freeze_authority_,
+        ).to_instruction()
+        for mint_, decimals_, mint_authority_, freeze_authority_ in zip(
+            mint,
+            column(decimals, n_instructions),
+            column(mint_authority, n_instructions),
+            column(freeze_authority, n_instructions),
+        )
+    ]
+
+
+# LOCK-END
@@ -3,13 +3,8 @@ from ..constants import (
     MAX_SIGNERS,
     MIN_SIGNERS,
 )
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
-from podite import (
-    BYTES_CATALOG,
-    U8,
-)
+from podite import U8
 from solana.publickey import PublicKey
 from solana.sysvar import SYSVAR_RENT_PUBKEY as RENT_SYSVAR
 from solana.transaction import (
@@ -17,7 +12,11 @@ from solana.transaction import (
     TransactionInstruction,
 )
 from solmate.programs.token_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
@@ -41,6 +40,9 @@ class InitializeMultisigIx:
     # data fields
     m: U8
 
+    # InstructionTag.INITIALIZE_MULTISIG followed by the data fields
+    _data_layout = Struct("<BB")
+
     def to_instruction(self):
         keys = []
         keys.append(self.multisig)
@@ -49,14 +51,33 @@ class InitializeMultisigIx:
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.INITIALIZE_MULTISIG))
-        buffer.write(BYTES_CATALOG.pack(U8, self.m))
+        data = self._data_layout.pack(2, self.m)
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("multisig", False, False, False),
+        ("rent_sysvar", False, False, False),
+        ("signers", False, True, False),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "InitializeMultisigIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        if len(ix.data) < cls._data_layout.size:
+            raise ValueError("The instruction data is shorter than the data layout")
+        _, m = cls._data_layout.unpack_from(ix.data)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            m=m,
         )
 
 
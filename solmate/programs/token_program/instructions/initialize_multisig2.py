@@ -1,21 +1,28 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
-from podite import (
-    BYTES_CATALOG,
-    U8,
-)
+from podite import U8
 from solana.publickey import PublicKey
 from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    copy_metas,
+    meta_column,
+    pack_many,
+)
 from solmate.programs.token_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -34,20 +41,40 @@ class InitializeMultisig2Ix:
     # data fields
     m: U8
 
+    # InstructionTag.INITIALIZE_MULTISIG2 followed by the data fields
+    _data_layout = Struct("<BB")
+
     def to_instruction(self):
         keys = []
         keys.append(self.multisig)
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.INITIALIZE_MULTISIG2))
-        buffer.write(BYTES_CATALOG.pack(U8, self.m))
+        data = self._data_layout.pack(19, self.m)
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("multisig", False, False, False),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "InitializeMultisig2Ix":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        if len(ix.data) < cls._data_layout.size:
+            raise ValueError("The instruction data is shorter than the data layout")
+        _, m = cls._data_layout.unpack_from(ix.data)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            m=m,
         )
 
 
@@ -86,3 +113,43 @@ def initialize_multisig2(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(initialize_multisig2)]: DON'T MODIFY
+def initialize_multisig2_many(
+    multisig: AccountColumn,
+    m: Union[U8, Sequence[U8]],
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(multisig, m)
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    multisig = meta_column(
+        multisig,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+
+    payloads = pack_many(InitializeMultisig2Ix._data_layout, 19, (m,), n_instructions)
+
+    return [
+        TransactionInstruction(
+            keys=[multisig_, *(copy_metas(remaining_accounts) or ())],
+            program_id=program_id,
+            data=payload,
+        )
+        for multisig_, payload in zip(multisig, payloads)
+    ]
+
+
+# LOCK-END
@@ -1,21 +1,28 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
-from podite import (
-    BYTES_CATALOG,
-    U64,
-)
+from podite import U64
 from solana.publickey import PublicKey
 from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    copy_metas,
+    meta_column,
+    pack_many,
+)
 from solmate.programs.token_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -36,6 +43,9 @@ class MintToIx:
     # data fields
     amount: U64
 
+    # InstructionTag.MINT_TO followed by the data fields
+    _data_layout = Struct("<BQ")
+
     def to_instruction(self):
         keys = []
         keys.append(self.mint)
@@ -44,14 +54,33 @@ class MintToIx:
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.MINT_TO))
-        buffer.write(BYTES_CATALOG.pack(U64, self.amount))
+        data = self._data_layout.pack(7, self.amount)
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("mint", False, False, False),
+        ("account", False, False, False),
+        ("authority", False, False, True),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "MintToIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        if len(ix.data) < cls._data_layout.size:
+            raise ValueError("The instruction data is shorter than the data layout")
+        _, amount = cls._data_layout.unpack_from(ix.data)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            amount=amount,
         )
 
 
@@ -108,3 +137,59 @@ def mint_to(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(mint_to)]: DON'T MODIFY
+def mint_to_many(
+    mint: AccountColumn,
+    account: AccountColumn,
+    authority: AccountColumn,
+    amount: Union[U64, Sequence[U64]],
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(mint, account, authority, amount)
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    mint = meta_column(
+        mint,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+    account = meta_column(
+        account,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+    authority = meta_column(
+        authority,
+        n_instructions,
+        is_signer=True,
+        is_writable=False,
+    )
+
+    payloads = pack_many(MintToIx._data_layout, 7, (amount,), n_instructions)
+
+    return [
+        TransactionInstruction(
+            keys=[mint_, account_, authority_, *(copy_metas(remaining_accounts) or ())],
+            program_id=program_id,
+            data=payload,
+        )
+        for mint_, account_, authority_, payload in zip(
+            mint, account, authority, payloads
+        )
+    ]
+
+
+# LOCK-END
@@ -12,12 +12,24 @@ from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    column,
+    copy_metas,
+    meta_column,
+)
 from solmate.programs.token_program.addrs import PROGRAM_ID
 from solmate.programs.token_program.types import AuthorityType
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+    unpack_borsh,
+)
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -61,6 +73,29 @@ class SetAuthorityIx:
             data=buffer.getvalue(),
         )
 
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("mint_or_account", False, False, False),
+        ("source_owner", False, False, True),
+        ("signers", True, True, True),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "SetAuthorityIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        buffer = BytesIO(ix.data)
+        buffer.seek(1)
+        authority_type = unpack_borsh(AuthorityType, buffer)
+        new_authority = unpack_borsh(Static[Optional[PublicKey]], buffer)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            authority_type=authority_type,
+            new_authority=new_authority,
+        )
+
 
 # LOCK-END
 
@@ -89,7 +124,7 @@ def set_authority(
             is_writable=False,
         )
 
-    if len(signers) > MAX_SIGNERS:
+    if signers is not None and len(signers) > MAX_SIGNERS:
         raise ValueError(
             f"len(signers) cannot be bigger than {MAX_SIGNERS}, but was {len(signers)}"
         )
@@ -124,3 +159,77 @@ def set_authority(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(set_authority)]: DON'T MODIFY
+def set_authority_many(
+    mint_or_account: AccountColumn,
+    source_owner: AccountColumn,
+    authority_type: Union[AuthorityType, Sequence[AuthorityType]],
+    signers: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    new_authority: Union[
+        Static[Optional[PublicKey]], Sequence[Static[Optional[PublicKey]]]
+    ] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(
+        mint_or_account, source_owner, authority_type, new_authority
+    )
+
+    if signers is not None and len(signers) > MAX_SIGNERS:
+        raise ValueError(
+            f"len(signers) cannot be bigger than {MAX_SIGNERS}, but was {len(signers)}"
+        )
+
+    if isinstance(signers, list):
+        for i in range(len(signers)):
+            if isinstance(signers[i], (str, PublicKey)):
+                signers[i] = to_account_meta(
+                    signers[i],
+                    is_signer=True,
+                    is_writable=False,
+                )
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    mint_or_account = meta_column(
+        mint_or_account,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+    source_owner = meta_column(
+        source_owner,
+        n_instructions,
+        is_signer=False if signers else True,
+        is_writable=False,
+    )
+
+    return [
+        SetAuthorityIx(
+            program_id=program_id,
+            mint_or_account=mint_or_account_,
+            source_owner=source_owner_,
+            signers=copy_metas(signers),
+            remaining_accounts=copy_metas(remaining_accounts),
+            authority_type=authority_type_,
+            new_authority=new_authority_,
+        ).to_instruction()
+        for mint_or_account_, source_owner_, authority_type_, new_authority_ in zip(
+            mint_or_account,
+            source_owner,
+            column(authority_type, n_instructions),
+            column(new_authority, n_instructions),
+        )
+    ]
+
+
+# LOCK-END
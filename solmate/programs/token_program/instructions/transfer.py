@@ -1,22 +1,29 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
 from ..constants import MAX_SIGNERS
-from .instruction_tag import InstructionTag
 from dataclasses import dataclass
-from io import BytesIO
-from podite import (
-    BYTES_CATALOG,
-    U64,
-)
+from podite import U64
 from solana.publickey import PublicKey
 from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    copy_metas,
+    meta_column,
+    pack_many,
+)
 from solmate.programs.token_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+)
+from struct import Struct
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -38,6 +45,9 @@ class TransferIx:
     # data fields
     amount: U64
 
+    # InstructionTag.TRANSFER followed by the data fields
+    _data_layout = Struct("<BQ")
+
     def to_instruction(self):
         keys = []
         keys.append(self.source)
@@ -48,14 +58,34 @@ class TransferIx:
         if self.remaining_accounts is not None:
             keys.extend(self.remaining_accounts)
 
-        buffer = BytesIO()
-        buffer.write(InstructionTag.to_bytes(InstructionTag.TRANSFER))
-        buffer.write(BYTES_CATALOG.pack(U64, self.amount))
+        data = self._data_layout.pack(3, self.amount)
 
         return TransactionInstruction(
             keys=keys,
             program_id=self.program_id,
-            data=buffer.getvalue(),
+            data=data,
+        )
+
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("source", False, False, False),
+        ("destination", False, False, False),
+        ("source_owner", False, False, True),
+        ("signers", True, True, True),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "TransferIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        if len(ix.data) < cls._data_layout.size:
+            raise ValueError("The instruction data is shorter than the data layout")
+        _, amount = cls._data_layout.unpack_from(ix.data)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            amount=amount,
         )
 
 
@@ -93,7 +123,7 @@ def transfer(
             is_writable=False,
         )
 
-    if len(signers) > MAX_SIGNERS:
+    if signers is not None and len(signers) > MAX_SIGNERS:
         raise ValueError(
             f"len(signers) cannot be bigger than {MAX_SIGNERS}, but was {len(signers)}"
         )
@@ -128,3 +158,80 @@ def transfer(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(transfer)]: DON'T MODIFY
+def transfer_many(
+    source: AccountColumn,
+    destination: AccountColumn,
+    source_owner: AccountColumn,
+    amount: Union[U64, Sequence[U64]],
+    signers: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(source, destination, source_owner, amount)
+
+    if signers is not None and len(signers) > MAX_SIGNERS:
+        raise ValueError(
+            f"len(signers) cannot be bigger than {MAX_SIGNERS}, but was {len(signers)}"
+        )
+
+    if isinstance(signers, list):
+        for i in range(len(signers)):
+            if isinstance(signers[i], (str, PublicKey)):
+                signers[i] = to_account_meta(
+                    signers[i],
+                    is_signer=True,
+                    is_writable=False,
+                )
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    source = meta_column(
+        source,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+    destination = meta_column(
+        destination,
+        n_instructions,
+        is_signer=False,
+        is_writable=True,
+    )
+    source_owner = meta_column(
+        source_owner,
+        n_instructions,
+        is_signer=False if signers else True,
+        is_writable=False,
+    )
+
+    payloads = pack_many(TransferIx._data_layout, 3, (amount,), n_instructions)
+
+    return [
+        TransactionInstruction(
+            keys=[
+                source_,
+                destination_,
+                source_owner_,
+                *(copy_metas(signers) or ()),
+                *(copy_metas(remaining_accounts) or ()),
+            ],
+            program_id=program_id,
+            data=payload,
+        )
+        for source_, destination_, source_owner_, payload in zip(
+            source, destination, source_owner, payloads
+        )
+    ]
+
+
+# LOCK-END
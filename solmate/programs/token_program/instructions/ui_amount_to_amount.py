@@ -8,11 +8,23 @@ from solana.transaction import (
     AccountMeta,
     TransactionInstruction,
 )
+from solmate.batch import (
+    AccountColumn,
+    batch_size,
+    column,
+    copy_metas,
+    meta_column,
+)
 from solmate.programs.token_program.addrs import PROGRAM_ID
-from solmate.utils import to_account_meta
+from solmate.utils import (
+    split_account_metas,
+    to_account_meta,
+    unpack_borsh,
+)
 from typing import (
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -47,6 +59,25 @@ class UiAmountToAmountIx:
             data=buffer.getvalue(),
         )
 
+    # (name, is_optional, is_array, is_signer) of the accounts in key order
+    _accounts_layout = (
+        ("mint", False, False, False),
+        ("remaining_accounts", True, True, False),
+    )
+
+    @classmethod
+    def from_instruction(cls, ix: TransactionInstruction) -> "UiAmountToAmountIx":
+        accounts = split_account_metas(ix.keys, cls._accounts_layout)
+        buffer = BytesIO(ix.data)
+        buffer.seek(1)
+        ui_amount = unpack_borsh(str, buffer)
+
+        return cls(
+            program_id=ix.program_id,
+            **accounts,
+            ui_amount=ui_amount,
+        )
+
 
 # LOCK-END
 
@@ -83,3 +114,42 @@ def ui_amount_to_amount(
 
 
 # LOCK-END
+
+
+# LOCK-BEGIN[ix_many_fn(ui_amount_to_amount)]: DON'T MODIFY
+def ui_amount_to_amount_many(
+    mint: AccountColumn,
+    ui_amount: Union[str, Sequence[str]],
+    remaining_accounts: Optional[List[Union[str, PublicKey, AccountMeta]]] = None,
+    program_id: PublicKey = PROGRAM_ID,
+) -> List[TransactionInstruction]:
+    n_instructions = batch_size(mint, ui_amount)
+
+    if isinstance(remaining_accounts, list):
+        for i in range(len(remaining_accounts)):
+            if isinstance(remaining_accounts[i], (str, PublicKey)):
+                remaining_accounts[i] = to_account_meta(
+                    remaining_accounts[i],
+                    is_signer=False,
+                    is_writable=False,
+                )
+
+    mint = meta_column(
+        mint,
+        n_instructions,
+        is_signer=False,
+        is_writable=False,
+    )
+
+    return [
+        UiAmountToAmountIx(
+            program_id=program_id,
+            mint=mint_,
+            remaining_accounts=copy_metas(remaining_accounts),
+            ui_amount=ui_amount_,
+        ).to_instruction()
+        for mint_, ui_amount_ in zip(mint, column(ui_amount, n_instructions))
+    ]
+
+
+# LOCK-END
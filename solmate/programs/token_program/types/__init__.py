@@ -1,8 +1,17 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
-from .account import Account
+from .account import (
+    Account,
+    AccountView,
+)
 from .account_state import AccountState
 from .authority_type import AuthorityType
-from .mint import Mint
-from .multisig import Multisig
+from .mint import (
+    Mint,
+    MintView,
+)
+from .multisig import (
+    Multisig,
+    MultisigView,
+)
 
 # LOCK-END
@@ -1,5 +1,6 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
 from podite import (
+    BYTES_CATALOG,
     Static,
     U64,
     pod,
@@ -7,6 +8,10 @@ from podite import (
 from solana.publickey import PublicKey
 from solmate.dtypes import COptional
 from solmate.programs.token_program.types.account_state import AccountState
+from solmate.views import (
+    View,
+    unpack_u64,
+)
 
 # LOCK-END
 
@@ -31,3 +36,80 @@ class Account:
     @classmethod
     def from_bytes(cls, raw, **kwargs):
         return cls.unpack(raw, converter="bytes", **kwargs)
+
+
+# LOCK-BEGIN[view(Account)]: DON'T MODIFY
+class AccountView(View):
+    __slots__ = ()
+
+    pod_type = Account
+    size = 165
+    dtype_descr = [
+        ("mint", "V32"),
+        ("owner", "V32"),
+        ("amount", "<u8"),
+        ("delegate", [("tag", "<u4"), ("value", "V32")]),
+        ("state", "u1"),
+        ("is_native", [("tag", "<u4"), ("value", "<u8")]),
+        ("delegated_amount", "<u8"),
+        ("close_authority", [("tag", "<u4"), ("value", "V32")]),
+    ]
+    field_layout = {
+        "mint": (0, 32, "32s"),
+        "owner": (32, 32, "32s"),
+        "amount": (64, 8, "Q"),
+        "delegate": (72, 36, None),
+        "state": (108, 1, None),
+        "is_native": (109, 12, None),
+        "delegated_amount": (121, 8, "Q"),
+        "close_authority": (129, 36, None),
+    }
+
+    @property
+    def mint(self) -> "PublicKey":
+        return PublicKey(self._buffer[0:32].tobytes())
+
+    @property
+    def owner(self) -> "PublicKey":
+        return PublicKey(self._buffer[32:64].tobytes())
+
+    @property
+    def amount(self) -> "U64":
+        return unpack_u64(self._buffer, 64)[0]
+
+    @property
+    def delegate(self) -> "Static[COptional[PublicKey]]":
+        return BYTES_CATALOG.unpack(
+            Static[COptional[PublicKey]],
+            self._buffer[72:108].tobytes(),
+            format="FORMAT_BORSH",
+        )
+
+    @property
+    def state(self) -> "AccountState":
+        return BYTES_CATALOG.unpack(
+            AccountState, self._buffer[108:109].tobytes(), format="FORMAT_BORSH"
+        )
+
+    @property
+    def is_native(self) -> "Static[COptional[U64]]":
+        return BYTES_CATALOG.unpack(
+            Static[COptional[U64]],
+            self._buffer[109:121].tobytes(),
+            format="FORMAT_BORSH",
+        )
+
+    @property
+    def delegated_amount(self) -> "U64":
+        return unpack_u64(self._buffer, 121)[0]
+
+    @property
+    def close_authority(self) -> "Static[COptional[PublicKey]]":
+        return BYTES_CATALOG.unpack(
+            Static[COptional[PublicKey]],
+            self._buffer[129:165].tobytes(),
+            format="FORMAT_BORSH",
+        )
+
+
+# LOCK-END
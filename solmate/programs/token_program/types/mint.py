@@ -1,5 +1,6 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
 from podite import (
+    BYTES_CATALOG,
     Static,
     U64,
     U8,
@@ -7,6 +8,11 @@ from podite import (
 )
 from solana.publickey import PublicKey
 from solmate.dtypes import COptional
+from solmate.views import (
+    View,
+    unpack_u64,
+    unpack_u8,
+)
 
 # LOCK-END
 
@@ -28,3 +34,56 @@ class Mint:
     @classmethod
     def from_bytes(cls, raw, **kwargs):
         return cls.unpack(raw, converter="bytes", **kwargs)
+
+
+# LOCK-BEGIN[view(Mint)]: DON'T MODIFY
+class MintView(View):
+    __slots__ = ()
+
+    pod_type = Mint
+    size = 82
+    dtype_descr = [
+        ("mint_authority", [("tag", "<u4"), ("value", "V32")]),
+        ("supply", "<u8"),
+        ("decimals", "u1"),
+        ("is_initialized", "?"),
+        ("freeze_authority", [("tag", "<u4"), ("value", "V32")]),
+    ]
+    field_layout = {
+        "mint_authority": (0, 36, None),
+        "supply": (36, 8, "Q"),
+        "decimals": (44, 1, "B"),
+        "is_initialized": (45, 1, "?"),
+        "freeze_authority": (46, 36, None),
+    }
+
+    @property
+    def mint_authority(self) -> "Static[COptional[PublicKey]]":
+        return BYTES_CATALOG.unpack(
+            Static[COptional[PublicKey]],
+            self._buffer[0:36].tobytes(),
+            format="FORMAT_BORSH",
+        )
+
+    @property
+    def supply(self) -> "U64":
+        return unpack_u64(self._buffer, 36)[0]
+
+    @property
+    def decimals(self) -> "U8":
+        return unpack_u8(self._buffer, 44)[0]
+
+    @property
+    def is_initialized(self) -> "bool":
+        return self._buffer[45] != 0
+
+    @property
+    def freeze_authority(self) -> "Static[COptional[PublicKey]]":
+        return BYTES_CATALOG.unpack(
+            Static[COptional[PublicKey]],
+            self._buffer[46:82].tobytes(),
+            format="FORMAT_BORSH",
+        )
+
+
+# LOCK-END
@@ -1,10 +1,15 @@
 # LOCK-BEGIN[imports]: DON'T MODIFY
 from podite import (
+    BYTES_CATALOG,
     FixedLenArray,
     U8,
     pod,
 )
 from solana.publickey import PublicKey
+from solmate.views import (
+    View,
+    unpack_u8,
+)
 
 # LOCK-END
 
@@ -25,3 +30,46 @@ class Multisig:
     @classmethod
     def from_bytes(cls, raw, **kwargs):
         return cls.unpack(raw, converter="bytes", **kwargs)
+
+
+# LOCK-BEGIN[view(Multisig)]: DON'T MODIFY
+class MultisigView(View):
+    __slots__ = ()
+
+    pod_type = Multisig
+    size = 67
+    dtype_descr = [
+        ("m", "u1"),
+        ("n", "u1"),
+        ("is_initialized", "?"),
+        ("signers", ("V32", (2,))),
+    ]
+    field_layout = {
+        "m": (0, 1, "B"),
+        "n": (1, 1, "B"),
+        "is_initialized": (2, 1, "?"),
+        "signers": (3, 64, None),
+    }
+
+    @property
+    def m(self) -> "U8":
+        return unpack_u8(self._buffer, 0)[0]
+
+    @property
+    def n(self) -> "U8":
+        return unpack_u8(self._buffer, 1)[0]
+
+    @property
+    def is_initialized(self) -> "bool":
+        return self._buffer[2] != 0
+
+    @property
+    def signers(self) -> "FixedLenArray[PublicKey, 2]":
+        return BYTES_CATALOG.unpack(
+            FixedLenArray[PublicKey, 2],
+            self._buffer[3:67].tobytes(),
+            format="FORMAT_BORSH",
+        )
+
+
+# LOCK-END
@@ -0,0 +1,219 @@
+"""
+Packing of instructions into as few transactions as possible, e.g.
+```
+from solmate.tx import Packer
+
+packer = Packer(payer.public_key)
+for tx in packer.pack(transfer_checked_many(...)):
+    client.send_transaction(tx, payer)
+```
+The instructions keep their order, so filling every transaction before starting the next one gives
+the minimum number of transactions (the size of a transaction only grows with its instructions).
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from solana.publickey import PublicKey
+from solana.transaction import PACKET_DATA_SIZE, Transaction, TransactionInstruction
+
+SIGNATURE_SIZE = 64
+PUBLIC_KEY_SIZE = 32
+BLOCKHASH_SIZE = 32
+MESSAGE_HEADER_SIZE = 3
+
+_SIGNER = 1
+_WRITABLE = 2
+
+
+def get_shortvec_size(n: int) -> int:
+    """
+    Number of bytes of the compact-u16 encoding of n
+    """
+    if n < 0x80:
+        return 1
+    elif n < 0x4000:
+        return 2
+    return 3
+
+
+def get_compiled_instruction_size(ix: TransactionInstruction) -> int:
+    num_keys = len(ix.keys)
+    size = len(ix.data)
+    return 1 + get_shortvec_size(num_keys) + num_keys + get_shortvec_size(size) + size
+
+
+def get_transaction_size(
+    num_signers: int, num_keys: int, num_instructions: int, instructions_size: int
+) -> int:
+    """
+    Serialized size of a (legacy) transaction, given its number of signers and distinct keys
+    (including the program ids) and the total size of its compiled instructions
+    """
+    return (
+        get_shortvec_size(num_signers)
+        + SIGNATURE_SIZE * num_signers
+        + MESSAGE_HEADER_SIZE
+        + get_shortvec_size(num_keys)
+        + PUBLIC_KEY_SIZE * num_keys
+        + BLOCKHASH_SIZE
+        + get_shortvec_size(num_instructions)
+        + instructions_size
+    )
+
+
+class Packer:
+    """
+    Fills transactions with instructions, tracking their serialized size as the instructions are
+    added: the accounts are deduplicated (merging their signer and writable flags) like
+    `Transaction.compile_message` does.
+
+    :param fee_payer: Fee payer of the transactions (their first signer)
+    :param recent_blockhash: Recent blockhash of the transactions, can also be set before signing them
+    :param max_size: Maximum serialized size of a transaction
+    """
+
+    def __init__(
+        self,
+        fee_payer: PublicKey,
+        recent_blockhash: Optional[str] = None,
+        max_size: int = PACKET_DATA_SIZE,
+    ):
+        self.fee_payer = fee_payer
+        self.recent_blockhash = recent_blockhash
+        self.max_size = max_size
+        self._reset()
+
+    def _reset(self):
+        # account to merged flags
+        self.accounts: Dict[PublicKey, int] = {self.fee_payer: _SIGNER | _WRITABLE}
+        self.instructions: List[TransactionInstruction] = []
+        self._num_signers = 1
+        self._instructions_size = 0
+
+    @property
+    def size(self) -> int:
+        """
+        Serialized size of the pending transaction
+        """
+        return get_transaction_size(
+            self._num_signers,
+            len(self.accounts),
+            len(self.instructions),
+            self._instructions_size,
+        )
+
+    def _merge_accounts(
+        self, ix: TransactionInstruction, accounts: Dict[PublicKey, int]
+    ):
+        """
+        Returns the accounts whose flags change if ix is added to a transaction with the given
+        accounts, with their new flags, and the number of new accounts and new signers among them
+        """
+        changes = {}
+        num_new_accounts = 0
+        num_new_signers = 0
+
+        for meta in ix.keys:
+            flags = (_SIGNER if meta.is_signer else 0) | (
+                _WRITABLE if meta.is_writable else 0
+            )
+            pubkey = meta.pubkey
+            current = changes.get(pubkey)
+            if current is None:
+                current = accounts.get(pubkey)
+                if current is None:
+                    num_new_accounts += 1
+                    current = 0
+                elif current | flags == current:
+                    continue
+            elif current | flags == current:
+                continue
+
+            if flags & _SIGNER and not current & _SIGNER:
+                num_new_signers += 1
+            changes[pubkey] = current | flags
+
+        if ix.program_id not in accounts and ix.program_id not in changes:
+            num_new_accounts += 1
+            changes[ix.program_id] = 0
+
+        return changes, num_new_accounts, num_new_signers
+
+    def add(self, ix: TransactionInstruction) -> Optional[Transaction]:
+        """
+        Adds an instruction to the pending transaction. If it does not fit, the pending transaction
+        is returned and the instruction starts the next one.
+        """
+        ix_size = get_compiled_instruction_size(ix)
+        changes, num_new_accounts, num_new_signers = self._merge_accounts(
+            ix, self.accounts
+        )
+        size = get_transaction_size(
+            self._num_signers + num_new_signers,
+            len(self.accounts) + num_new_accounts,
+            len(self.instructions) + 1,
+            self._instructions_size + ix_size,
+        )
+
+        if size > self.max_size:
+            if self.instructions:
+                # the pending instructions are only flushed if ix fits in the next transaction
+                _, num_new_accounts, num_new_signers = self._merge_accounts(
+                    ix, {self.fee_payer: _SIGNER | _WRITABLE}
+                )
+                size = get_transaction_size(
+                    1 + num_new_signers, 1 + num_new_accounts, 1, ix_size
+                )
+
+            if size > self.max_size:
+                raise ValueError(
+                    f"The instruction does not fit in a transaction ({size} > {self.max_size} bytes)"
+                )
+
+            tx = self.flush()
+            self.add(ix)
+            return tx
+
+        self.accounts.update(changes)
+        self.instructions.append(ix)
+        self._num_signers += num_new_signers
+        self._instructions_size += ix_size
+        return None
+
+    def flush(self) -> Optional[Transaction]:
+        """
+        Returns the pending transaction (None if it has no instructions) and starts a new one
+        """
+        if not self.instructions:
+            return None
+
+        tx = Transaction(
+            recent_blockhash=self.recent_blockhash, fee_payer=self.fee_payer
+        )
+        tx.instructions = self.instructions
+        self._reset()
+        return tx
+
+    def pack(
+        self, instructions: Iterable[TransactionInstruction]
+    ) -> Iterator[Transaction]:
+        """
+        Lazily packs a stream of instructions, then flushes the last transaction
+        """
+        for ix in instructions:
+            tx = self.add(ix)
+            if tx is not None:
+                yield tx
+
+        tx = self.flush()
+        if tx is not None:
+            yield tx
+
+
+def pack_instructions(
+    instructions: Iterable[TransactionInstruction],
+    fee_payer: PublicKey,
+    recent_blockhash: Optional[str] = None,
+    max_size: int = PACKET_DATA_SIZE,
+) -> List[Transaction]:
+    return list(Packer(fee_payer, recent_blockhash, max_size).pack(instructions))
@@ -1,6 +1,19 @@
+import os
 import re
-from typing import Union
-
+import struct
+from collections import OrderedDict
+from typing import (
+    BinaryIO,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from podite import BYTES_CATALOG
 from solana.publickey import PublicKey
 from solana.transaction import AccountMeta
 
@@ -33,12 +46,175 @@ def snake_to_kebab(name):
     return re.sub("_", "-", name)
 
 
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class InternCache:
+    """
+    Bounded mapping that evicts the least recently used entry, with hit/miss stats
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict" = OrderedDict()
+
+    def get(self, key):
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+_PUBLIC_KEYS = InternCache(maxsize=4096)
+
+
+def intern_public_key(account: str) -> PublicKey:
+    """
+    Returns the PublicKey of a base58 address, decoding each address only once
+    """
+    pubkey = _PUBLIC_KEYS.get(account)
+    if pubkey is None:
+        pubkey = PublicKey(account)
+        _PUBLIC_KEYS.put(account, pubkey)
+    return pubkey
+
+
 def to_account_meta(
     account: Union[str, PublicKey],
     is_signer: bool,
     is_writable: bool,
 ) -> AccountMeta:
+    """
+    Returns a new AccountMeta of an account. The decoded addresses are interned since the same
+    keys are usually passed over and over, but not the metas: Transaction.compile_message
+    upgrades their flags in place.
+    """
     if isinstance(account, str):
-        account = PublicKey(account)
+        account = intern_public_key(account)
 
     return AccountMeta(account, is_signer=is_signer, is_writable=is_writable)
+
+
+def split_account_metas(
+    keys: List[AccountMeta], layout: Sequence[Tuple[str, bool, bool, bool]]
+) -> Dict[str, Union[None, AccountMeta, List[AccountMeta]]]:
+    """
+    Maps the keys of an instruction back onto its account fields, i.e. inverts the key list built by
+    the to_instruction method of the generated instruction classes.
+
+    Optional accounts are assigned greedily (as long as enough keys remain for the required ones),
+    an array of accounts takes the consecutive keys with its signer flag and the last array takes all
+    the remaining keys.
+
+    :param layout: (name, is_optional, is_array, is_signer) of the account fields in order
+    """
+    # number of keys required by the single accounts after each field
+    required_after = [0] * len(layout)
+    n_required = 0
+    for i in range(len(layout) - 1, -1, -1):
+        required_after[i] = n_required
+        _, is_optional, is_array, _ = layout[i]
+        if not is_optional and not is_array:
+            n_required += 1
+
+    if len(keys) < n_required:
+        raise ValueError(f"Expected at least {n_required} keys but got {len(keys)}")
+
+    last_array = max((i for i, entry in enumerate(layout) if entry[2]), default=None)
+
+    accounts = {}
+    position = 0
+    for i, (name, is_optional, is_array, is_signer) in enumerate(layout):
+        available = len(keys) - position - required_after[i]
+        if is_array:
+            stop = position
+            if i == last_array:
+                stop += available
+            else:
+                while stop < position + available and keys[stop].is_signer == is_signer:
+                    stop += 1
+
+            accounts[name] = keys[position:stop]
+            position = stop
+        elif is_optional and available <= 0:
+            accounts[name] = None
+        else:
+            accounts[name] = keys[position]
+            position += 1
+
+    if position != len(keys):
+        raise ValueError(f"Expected at most {position} keys but got {len(keys)}")
+
+    return accounts
+
+
+def unpack_borsh(type_, buffer: BinaryIO):
+    """
+    Reads a borsh encoded value from a buffer, raising ValueError if the buffer is too short
+    (podite raises struct.error, RuntimeError or ValueError depending on the type)
+    """
+    try:
+        return BYTES_CATALOG.unpack(type_, buffer, format="FORMAT_BORSH")
+    except (struct.error, RuntimeError) as e:
+        raise ValueError(
+            f"The instruction data is shorter than its fields ({e})"
+        ) from e
+
+
+def get_intern_cache_info() -> Dict[str, CacheInfo]:
+    """
+    Returns the stats of the caches used by to_account_meta
+    """
+    return {"public_keys": _PUBLIC_KEYS.info()}
+
+
+def clear_intern_caches():
+    _PUBLIC_KEYS.clear()
+
+
+def import_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "numpy is required for bulk decoding, install it with `pip install solmate[numpy]`"
+        ) from e
+
+    return numpy
+
+
+def get_cache_dir(name) -> Optional[str]:
+    """
+    Directory of one of solmate's caches: $SOLMATE_CACHE_DIR/<name> (defaults to ~/.cache/solmate/<name>).
+    Setting SOLMATE_CACHE_DIR to an empty string disables the caches.
+    """
+    root = os.environ.get(
+        "SOLMATE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "solmate")
+    )
+    if not root:
+        return None
+
+    return os.path.join(root, name)
@@ -0,0 +1,203 @@
+from struct import Struct
+from typing import Callable, Dict, Optional, Sequence, Tuple, Type
+
+from solana.publickey import PublicKey
+
+from solmate.utils import import_numpy
+
+unpack_u8 = Struct("<B").unpack_from
+unpack_i8 = Struct("<b").unpack_from
+unpack_u16 = Struct("<H").unpack_from
+unpack_i16 = Struct("<h").unpack_from
+unpack_u32 = Struct("<I").unpack_from
+unpack_i32 = Struct("<i").unpack_from
+unpack_u64 = Struct("<Q").unpack_from
+unpack_i64 = Struct("<q").unpack_from
+
+_DTYPES: Dict[type, object] = {}
+_PROJECTORS: Dict[Tuple[type, Tuple[str, ...]], "Projector"] = {}
+
+
+class View:
+    """
+    Base class of the generated zero-copy views.
+
+    A view wraps a memoryview over the (borsh) encoding of a fixed-size struct and decodes
+    each field from its precomputed offset only when the field is accessed.
+    """
+
+    __slots__ = ("_buffer",)
+
+    pod_type: Type
+    size: int
+    # numpy descr of the layout, None if some field has no numpy counterpart
+    dtype_descr = None
+    # field name to (offset, size, struct format or None)
+    field_layout: Dict[str, Tuple[int, int, Optional[str]]] = {}
+
+    def __init__(self, buffer, offset=0):
+        buffer = memoryview(buffer)
+        if buffer.ndim != 1 or buffer.format != "B":
+            buffer = buffer.cast("B")
+
+        if len(buffer) < offset + self.size:
+            raise ValueError(
+                f"{type(self).__name__} needs {self.size} bytes but only "
+                f"{len(buffer) - offset} are available"
+            )
+
+        self._buffer = buffer[offset : offset + self.size]
+
+    @property
+    def buffer(self) -> memoryview:
+        return self._buffer
+
+    def to_obj(self):
+        """
+        Decodes all the fields into an instance of the underlying pod type
+        """
+        return self.pod_type.from_bytes(self._buffer.tobytes(), format="FORMAT_BORSH")
+
+    @classmethod
+    def dtype(cls):
+        """
+        Returns the numpy structured dtype matching the layout of the struct
+        """
+        dtype = _DTYPES.get(cls)
+        if dtype is None:
+            if cls.dtype_descr is None:
+                raise TypeError(f"{cls.__name__} has no numpy dtype")
+
+            dtype = import_numpy().dtype(cls.dtype_descr)
+            assert dtype.itemsize == cls.size
+            _DTYPES[cls] = dtype
+
+        return dtype
+
+    @classmethod
+    def decode_many(cls, buffers):
+        """
+        Decodes many encoded structs into a structured array whose columns are the fields.
+        Buffers longer than the struct (e.g. padded account data) are truncated.
+        """
+        size = cls.size
+        chunks = []
+        for i, buffer in enumerate(buffers):
+            mv = memoryview(buffer)
+            if len(mv) < size:
+                raise ValueError(
+                    f"Buffer {i} has {len(mv)} bytes but {cls.__name__} needs {size}"
+                )
+            chunks.append(mv[:size])
+        raw = b"".join(chunks)
+
+        return import_numpy().frombuffer(raw, dtype=cls.dtype())
+
+    @classmethod
+    def from_buffer_array(cls, array):
+        """
+        Reinterprets a (n, size) uint8 array (or a flat one of n * size bytes) as a structured array
+        """
+        numpy = import_numpy()
+        array = numpy.ascontiguousarray(array, dtype=numpy.uint8)
+        if array.size % cls.size != 0:
+            raise ValueError(f"The array size is not a multiple of {cls.size}")
+
+        return array.reshape(-1).view(cls.dtype())
+
+    @classmethod
+    def projector(cls, names: Sequence[str]) -> "Projector":
+        """
+        Returns the (cached) projector decoding the given fields of the struct
+        """
+        key = (cls, tuple(names))
+        projector = _PROJECTORS.get(key)
+        if projector is None:
+            projector = Projector(cls, names)
+            _PROJECTORS[key] = projector
+
+        return projector
+
+    @classmethod
+    def decode_fields(cls, raw, names: Sequence[str], offset=0) -> tuple:
+        """
+        Decodes only the given fields of an encoded struct, e.g.
+        `owner, amount = AccountView.decode_fields(raw, ("owner", "amount"))`
+        """
+        return cls.projector(names)(raw, offset)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_obj()})"
+
+
+class Projector:
+    """
+    Decodes a subset of the fields of a fixed-size struct. The fields with a struct format are read
+    by a single unpack_from (skipping the other bytes), the others are decoded by the view.
+
+    Calling the projector returns the values of the fields in the requested order, as the view's
+    properties would return them.
+    """
+
+    def __init__(self, view_cls: Type[View], names: Sequence[str]):
+        unknown = [name for name in names if name not in view_cls.field_layout]
+        if unknown:
+            raise ValueError(f"{view_cls.__name__} has no fields {unknown}")
+
+        self.view_cls = view_cls
+        self.names = tuple(names)
+
+        packed = sorted(
+            {name for name in names if view_cls.field_layout[name][2] is not None},
+            key=lambda name: view_cls.field_layout[name][0],
+        )
+        struct_format = "<"
+        position = 0
+        for name in packed:
+            offset, size, field_format = view_cls.field_layout[name]
+            if offset > position:
+                struct_format += f"{offset - position}x"
+            struct_format += field_format
+            position = offset + size
+        if view_cls.size > position:
+            # like the views, the buffer must hold the whole struct
+            struct_format += f"{view_cls.size - position}x"
+
+        self.struct = Struct(struct_format)
+        self._project = self._compile(packed)
+
+    def _compile(self, packed) -> Callable:
+        """
+        Generates the straight-line function reading the fields
+        """
+        code = ["def project(raw, offset=0):\n"]
+        if packed:
+            unpacked = "".join(f"_{i}, " for i in range(len(packed)))
+            code.append(f"    {unpacked}= unpack_from(raw, offset)\n")
+        if len(packed) < len(set(self.names)):
+            code.append("    view = view_cls(raw, offset)\n")
+
+        values = []
+        for name in self.names:
+            if name in packed:
+                value = f"_{packed.index(name)}"
+                if self.view_cls.field_layout[name][2] == "32s":
+                    value = f"PublicKey({value})"
+            else:
+                value = f"view.{name}"
+            values.append(value)
+        code.append(f"    return ({''.join(f'{value}, ' for value in values)})\n")
+
+        namespace = {
+            "unpack_from": self.struct.unpack_from,
+            "view_cls": self.view_cls,
+            "PublicKey": PublicKey,
+        }
+        exec("".join(code), namespace)
+        return namespace["project"]
+
+    def __call__(self, raw, offset=0) -> tuple:
+        return self._project(raw, offset)
+
+    def __repr__(self):
+        return f"Projector({self.view_cls.__name__}, {self.names})"
@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+from solmate import autoload
+
+IDL_DIR = Path(__file__).parent
+
+
+def install():
+    return autoload.install(
+        {
+            "autoload_codegen.idl": str(IDL_DIR / "idl.json"),
+            "autoload_codegen.other": str(IDL_DIR / "other.json"),
+        }
+    )
+
+
+def unload(finder):
+    autoload.uninstall(finder)
+    for name in list(sys.modules):
+        if name.startswith("autoload_codegen"):
+            del sys.modules[name]
+
+
+def test_install__imports_without_writing(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOLMATE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.chdir(tmp_path)
+
+    finder = install()
+    try:
+        from autoload_codegen.idl.types import CallBackInfo
+        from autoload_codegen.other.types import CrossIdlReferenceType
+
+        # cross-idl references resolve to the autoloaded types
+        assert "CallBackInfo" in str(CrossIdlReferenceType.__annotations__)
+        assert CallBackInfo.__module__ == "autoload_codegen.idl.types.call_back_info"
+    finally:
+        unload(finder)
+
+    assert [path.name for path in tmp_path.iterdir()] == ["cache"]
+    assert len(list((tmp_path / "cache" / "autoload").iterdir())) == 2
+
+
+def test_install__served_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOLMATE_CACHE_DIR", str(tmp_path / "cache"))
+
+    finder = install()
+    try:
+        import autoload_codegen.idl.instructions as expected
+    finally:
+        unload(finder)
+
+    def fail(self, program):
+        raise AssertionError("the cached bytecode should have been used")
+
+    monkeypatch.setattr(autoload.IdlFinder, "generate_modules", fail)
+    finder = install()
+    try:
+        import autoload_codegen.idl.instructions as actual
+
+        assert actual is not expected
+        assert sorted(vars(actual)) == sorted(vars(expected))
+    finally:
+        unload(finder)
@@ -0,0 +1,443 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+from podite import pod, Enum, Option, U64, U128
+from solana.publickey import PublicKey
+
+from solmate.anchor import CodeGenProfiler, Idl, InstructionDiscriminant
+from solmate.anchor.codegen import (
+    CodeGen,
+    InstructionCodeGen,
+    usize_type,
+    MANIFEST_FILENAME,
+)
+from solmate.anchor.editor import CodeEditor
+from solmate.anchor.idl import IdlField, IdlType
+
+IDL_PATH = Path(__file__).parent / "idl.json"
+
+
+def generate(idl, source_path, **kwargs):
+    codegen = CodeGen(
+        idl=idl,
+        addresses={},
+        root_module="incremental_codegen.idl",
+        source_path=str(source_path),
+        external_types={"usize": usize_type},
+        instr_tag_values="anchor",
+        accnt_tag_values="anchor",
+        **kwargs,
+    )
+    codegen.generate_code()
+    codegen.save_modules()
+    return codegen
+
+
+def get_mtimes(root):
+    return {
+        path: os.stat(path).st_mtime_ns
+        for path in Path(root).rglob("*")
+        if path.is_file()
+    }
+
+
+def set_old_mtimes(root):
+    for path in Path(root).rglob("*"):
+        if path.is_file():
+            os.utime(path, ns=(10**9, 10**9))
+
+
+def test_incremental__noop_run_touches_nothing(tmp_path):
+    idl = Idl.from_json_file(IDL_PATH)
+    generate(idl, tmp_path, incremental=True)
+    assert (tmp_path / "incremental_codegen" / "idl" / MANIFEST_FILENAME).exists()
+
+    set_old_mtimes(tmp_path)
+    before = get_mtimes(tmp_path)
+
+    codegen = generate(idl, tmp_path, incremental=True)
+    assert get_mtimes(tmp_path) == before
+    assert "incremental_codegen.idl.instructions.some_ix_name" in codegen._fresh
+    assert "incremental_codegen.idl.types.call_back_info" in codegen._fresh
+
+
+def test_incremental__only_changed_modules_are_written(tmp_path):
+    idl = Idl.from_json_file(IDL_PATH)
+    generate(idl, tmp_path, incremental=True)
+    set_old_mtimes(tmp_path)
+    before = get_mtimes(tmp_path)
+
+    # renaming a field of one type only affects that type's module
+    call_back_info = next(t for t in idl.types if t.name == "CallBackInfo")
+    call_back_info.type.field.fields[1].name = "renamedIdx"
+    generate(idl, tmp_path, incremental=True)
+
+    after = get_mtimes(tmp_path)
+    changed = {path.name for path in after if after[path] != before[path]}
+    assert changed == {"call_back_info.py", MANIFEST_FILENAME}
+
+    source = (tmp_path / "incremental_codegen/idl/types/call_back_info.py").read_text()
+    assert "renamed_idx: U64" in source
+
+
+def test_incremental__regenerates_deleted_modules(tmp_path):
+    idl = Idl.from_json_file(IDL_PATH)
+    generate(idl, tmp_path, incremental=True)
+
+    path = tmp_path / "incremental_codegen/idl/instructions/some_ix_name.py"
+    expected = path.read_text()
+    path.unlink()
+
+    generate(idl, tmp_path, incremental=True)
+    assert path.read_text() == expected
+
+
+def test_incremental__deletes_removed_modules(tmp_path):
+    idl = Idl.from_json_file(IDL_PATH)
+    generate(idl, tmp_path, incremental=True)
+
+    path = tmp_path / "incremental_codegen/idl/types/enum_with_struct_variant.py"
+    assert path.exists()
+
+    idl.types = [t for t in idl.types if t.name != "EnumWithStructVariant"]
+    generate(idl, tmp_path, incremental=True)
+    assert not path.exists()
+
+    manifest_path = tmp_path / "incremental_codegen/idl" / MANIFEST_FILENAME
+    manifest = json.loads(manifest_path.read_text())
+    assert (
+        "incremental_codegen.idl.types.enum_with_struct_variant"
+        not in manifest["modules"]
+    )
+
+
+def test_incremental__referenced_type_kind_changes(tmp_path):
+    with open(IDL_PATH) as fin:
+        raw = json.load(fin)
+    before = generate(Idl.from_dict(raw), tmp_path, incremental=True)
+
+    # EnumWithFields references ActionStatus, which becomes a struct
+    action_status = next(t for t in raw["types"] if t["name"] == "ActionStatus")
+    action_status["type"] = {"kind": "struct", "fields": []}
+    after = generate(Idl.from_dict(raw), tmp_path, incremental=True)
+
+    name = "incremental_codegen.idl.types.enum_with_fields"
+    assert after._fingerprints[name] != before._fingerprints[name]
+    assert name not in after._fresh
+
+
+def test_data_layout__anchor_tag():
+    @pod
+    class Tag(Enum[U64]):
+        SOME_IX_NAME = InstructionDiscriminant()
+
+    idl = Idl.from_json_file(IDL_PATH)
+    codegen = CodeGen(
+        idl=idl,
+        addresses={},
+        root_module="layout_codegen.idl",
+        source_path="unused",
+        instr_tag_values="anchor",
+        accnt_tag_values="anchor",
+    )
+    instr = idl.instructions[0]
+    assert codegen.get_instr_tag_value(instr) == int(Tag.SOME_IX_NAME)
+
+    # the only arg is a defined type, so there is no fixed-size layout
+    instr_codegen = InstructionCodeGen(codegen, CodeEditor("unused.py"), instr)
+    assert instr_codegen.get_data_layout() is None
+
+    instr.args = [
+        IdlField("amount", IdlType.U64),
+        IdlField("owner", IdlType.PUBLIC_KEY),
+    ]
+    assert instr_codegen.get_data_layout() == "<QQ32s"
+
+
+def test_lazy_imports(tmp_path, monkeypatch):
+    codegen = CodeGen(
+        idl=Idl.from_json_file(IDL_PATH),
+        addresses={},
+        root_module="lazy_codegen.idl",
+        source_path=str(tmp_path),
+        external_types={"usize": usize_type},
+        instr_tag_values="anchor",
+        accnt_tag_values="anchor",
+        lazy_imports=True,
+    )
+    codegen.generate_code()
+    codegen.save_modules()
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        import lazy_codegen.idl as idl
+
+        assert "lazy_codegen.idl.types" not in sys.modules
+        assert "types" in dir(idl)
+
+        types = idl.types
+        assert "CallBackInfo" in dir(types)
+        assert "lazy_codegen.idl.types.call_back_info" not in sys.modules
+
+        call_back_info = types.CallBackInfo
+        assert call_back_info.__module__ == "lazy_codegen.idl.types.call_back_info"
+        assert vars(types)["CallBackInfo"] is call_back_info
+
+        try:
+            types.NotAType
+            excepted = False
+        except AttributeError:
+            excepted = True
+        assert excepted
+    finally:
+        for name in list(sys.modules):
+            if name.startswith("lazy_codegen"):
+                del sys.modules[name]
+
+
+def build_samples(types, public_key):
+    info = types.CallBackInfo(public_key, 129)
+    health = types.EnumWithFields.HEALTH(info)
+    optional_u128 = Option[U128]
+    return [
+        (types.CallBackInfo, info),
+        (types.EnumWithFields, health),
+        (
+            types.EnumWithFields,
+            types.EnumWithFields.LIQUIDATION(types.ActionStatus.NOT_APPROVED),
+        ),
+        (types.RiskOutputRegister, types.RiskOutputRegister(health)),
+        (types.SomeType, types.SomeType(5)),
+        (
+            types.EnumWithStructVariant,
+            types.EnumWithStructVariant.STRUCT_VARIANT((types.SomeType(5),)),
+        ),
+        (
+            types.EnumWithStructVariant,
+            types.EnumWithStructVariant.OPTIONAL_VARIANT((optional_u128.SOME(42),)),
+        ),
+    ]
+
+
+def test_specialized_codecs__wire_compatible(tmp_path, monkeypatch):
+    for root_module, specialized_codecs in [
+        ("plain_codegen.idl", False),
+        ("specialized_codegen.idl", True),
+    ]:
+        codegen = CodeGen(
+            idl=Idl.from_json_file(IDL_PATH),
+            addresses={},
+            root_module=root_module,
+            source_path=str(tmp_path),
+            external_types={"usize": usize_type},
+            instr_tag_values="anchor",
+            accnt_tag_values="anchor",
+            specialized_codecs=specialized_codecs,
+        )
+        codegen.generate_code()
+        codegen.save_modules()
+
+    source = (tmp_path / "specialized_codegen/idl/types/call_back_info.py").read_text()
+    assert "def _from_bytes_partial" in source
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        import plain_codegen.idl.types as plain
+        import specialized_codegen.idl.types as specialized
+
+        public_key = PublicKey(bytes(range(32)))
+        samples = zip(
+            build_samples(plain, public_key), build_samples(specialized, public_key)
+        )
+        for (plain_type, plain_obj), (specialized_type, specialized_obj) in samples:
+            for format in ("FORMAT_BORSH", "FORMAT_ZERO_COPY"):
+                raw = plain_type.to_bytes(plain_obj, format=format)
+                assert specialized_type.to_bytes(specialized_obj, format=format) == raw
+                decoded = specialized_type.from_bytes(raw, format=format)
+                assert decoded == specialized_obj
+    finally:
+        for name in list(sys.modules):
+            if name.startswith(("plain_codegen", "specialized_codegen")):
+                del sys.modules[name]
+
+
+def test_profiler__phases_and_items(tmp_path):
+    idl = Idl.from_json_file(IDL_PATH)
+    generate(idl, tmp_path)
+
+    profiler = CodeGenProfiler()
+    generate(idl, tmp_path, profiler=profiler)
+    report = profiler.get_report()
+
+    phases = report["phases"]
+    expected_phases = {"types", "instructions", "load", "infer_locks", "save_modules"}
+    assert expected_phases <= set(phases)
+    assert phases["load"]["files_read"] == len(list(tmp_path.rglob("*.py")))
+    # the second run produces the same files, so nothing is written
+    assert phases["save_modules"]["files_written"] == 0
+    assert phases["types"]["wall_s"] >= phases["type"]["wall_s"]
+
+    items = {(entry["phase"], entry["item"]) for entry in report["items"]}
+    assert ("type", "CallBackInfo") in items
+    assert all(entry["lock_edits"] > 0 for entry in report["items"])
+
+    profiler.dump(str(tmp_path / "profile.speedscope.json"))
+    speedscope = json.loads((tmp_path / "profile.speedscope.json").read_text())
+    events = speedscope["profiles"][0]["events"]
+    assert len(events) == 2 * sum(stats["calls"] for stats in phases.values())
+
+
+def get_public_names(module, root_module):
+    # the names defined by the program, excluding its submodules and the imported names
+    return {
+        name
+        for name, value in vars(module).items()
+        if not name.startswith("_")
+        and not isinstance(value, type(sys))
+        and (getattr(value, "__module__", None) or root_module).startswith(root_module)
+    }
+
+
+def test_bundle__same_public_names(tmp_path, monkeypatch):
+    for root_module, bundle in [
+        ("package_codegen.idl", False),
+        ("bundled_codegen.idl", True),
+    ]:
+        codegen = CodeGen(
+            idl=Idl.from_json_file(IDL_PATH),
+            addresses={"PROGRAM_ID": str(PublicKey(1))},
+            root_module=root_module,
+            source_path=str(tmp_path),
+            external_types={"usize": usize_type},
+            instr_tag_values="anchor",
+            accnt_tag_values="anchor",
+            bundle=bundle,
+        )
+        codegen.generate_code()
+        codegen.save_modules()
+
+    assert [path.name for path in (tmp_path / "bundled_codegen").iterdir()] == [
+        "idl.py"
+    ]
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        import package_codegen.idl as package
+        import package_codegen.idl.instructions.some_ix_name
+        import bundled_codegen.idl as bundled
+        from bundled_codegen.idl.instructions.some_ix_name import SomeIxNameIx
+
+        assert SomeIxNameIx is bundled.instructions.SomeIxNameIx
+        for name in ("", ".types", ".instructions", ".instructions.some_ix_name"):
+            expected = get_public_names(
+                sys.modules[f"package_codegen.idl{name}"], "package_codegen.idl"
+            )
+            actual = get_public_names(
+                sys.modules[f"bundled_codegen.idl{name}"], "bundled_codegen.idl"
+            )
+            # the root of the bundle also holds the names of all the submodules
+            assert expected <= actual if not name else expected == actual
+
+        public_key = PublicKey(bytes(range(32)))
+        samples = zip(
+            build_samples(package.types, public_key),
+            build_samples(bundled.types, public_key),
+        )
+        for (package_type, package_obj), (bundled_type, bundled_obj) in samples:
+            raw = package_type.to_bytes(package_obj)
+            assert bundled_type.to_bytes(bundled_obj) == raw
+            assert bundled_type.from_bytes(raw) == bundled_obj
+    finally:
+        for name in list(sys.modules):
+            if name.startswith(("package_codegen", "bundled_codegen")):
+                del sys.modules[name]
+
+
+def test_account_filters__anchor_discriminator(tmp_path, monkeypatch):
+    idl_json = json.loads(IDL_PATH.read_text())
+    idl_json["accounts"].append(
+        {
+            "name": "Vault",
+            "type": {
+                "kind": "struct",
+                "fields": [
+                    {"name": "owner", "type": "publicKey"},
+                    {"name": "amount", "type": "u64"},
+                ],
+            },
+        }
+    )
+    idl_path = tmp_path / "idl.json"
+    idl_path.write_text(json.dumps(idl_json))
+
+    codegen = CodeGen(
+        idl=Idl.from_json_file(str(idl_path)),
+        addresses={},
+        root_module="filters_codegen.idl",
+        source_path=str(tmp_path),
+        external_types={"usize": usize_type},
+        instr_tag_values="anchor",
+        accnt_tag_values="anchor",
+    )
+    codegen.generate_code()
+    codegen.save_modules()
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        from filters_codegen.idl.accounts import Accounts, Filters
+        from filters_codegen.idl.types import Vault
+        from solmate.filters import LocalClient
+
+        # only the accounts with a fixed layout get filters
+        assert not hasattr(Filters, "RISK_OUTPUT_REGISTER")
+
+        owner = PublicKey(7)
+        vault = Vault(owner=owner, amount=42)
+        raw = Filters.VAULT.discriminator + Vault.to_bytes(vault)
+        assert Accounts.from_bytes(raw) == Accounts.VAULT(vault)
+
+        client = LocalClient()
+        # anchor accounts may be allocated more space than their fields need
+        client.add_account(PublicKey(1), PublicKey(2), raw + bytes(16))
+        client.add_account(PublicKey(3), PublicKey(2), bytes(8) + raw[8:])
+
+        query = Filters.VAULT.query(Filters.VAULT.owner == owner, slice=("amount",))
+        assert query["data_size"] is None
+        assert query["memcmp_opts"][1].offset == 8
+
+        result = client.get_program_accounts(PublicKey(2), **query)["result"]
+        assert [item["pubkey"] for item in result] == [str(PublicKey(1))]
+        assert result[0]["account"]["data"][0] == "KgAAAAAAAAA="
+    finally:
+        for name in list(sys.modules):
+            if name.startswith("filters_codegen"):
+                del sys.modules[name]
+
+
+def test_decode_instruction__anchor_discriminator(tmp_path, monkeypatch):
+    generate(Idl.from_json_file(IDL_PATH), tmp_path)
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        from incremental_codegen.idl import instructions, types
+
+        health = types.EnumWithFields.HEALTH(types.CallBackInfo(PublicKey(3), 129))
+        ix = instructions.some_ix_name(
+            is_signer_true=PublicKey(1),
+            is_mut_true=PublicKey(2),
+            neither=PublicKey(3),
+            both=PublicKey(4),
+            params=types.ArrayOfEnumWithFields([health] * 256),
+            program_id=PublicKey(5),
+        )
+
+        decoded = instructions.decode_instruction(ix)
+        assert isinstance(decoded, instructions.SomeIxNameIx)
+        assert decoded.params == types.ArrayOfEnumWithFields([health] * 256)
+        assert decoded.to_instruction() == ix
+    finally:
+        for name in list(sys.modules):
+            if name.startswith("incremental_codegen"):
+                del sys.modules[name]
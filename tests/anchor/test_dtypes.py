@@ -1,5 +1,10 @@
-from podite import U32
-from solmate.dtypes import Repeat
+import importlib
+import sys
+
+import pytest
+from podite import FORMAT_BORSH, U16, U32, U64, pod
+
+from solmate.dtypes import Repeat, RingCursor
 
 
 def test_repeat():
@@ -18,3 +23,96 @@ def test_repeat():
     # ring behavior
     for i, value in enumerate(actual):
         assert value == expect[i + 4]
+
+
+@pod
+class Pair:
+    a: U16
+    b: U64
+
+
+def test_repeat__iter_and_slices():
+    actual = list(range(0, 5000, 7))
+    raw = b"".join(U64.to_bytes(e) for e in actual)
+
+    repeat = Repeat[U64].from_bytes(raw)
+    assert len(repeat) == len(actual)
+    assert list(repeat) == actual
+    assert repeat[10:20] == actual[10:20]
+    assert repeat[::-3] == actual[::-3]
+
+    pairs = [Pair(a=i, b=10 * i) for i in range(5)]
+    raw = b"".join(Pair.to_bytes(p, format=FORMAT_BORSH) for p in pairs)
+    repeat = Repeat[Pair].from_bytes(raw)
+    assert list(repeat) == pairs
+    assert repeat[1:3] == pairs[1:3]
+
+
+def test_repeat__to_numpy():
+    np = pytest.importorskip("numpy")
+
+    raw = b"".join(U32.to_bytes(e) for e in range(100))
+    array = Repeat[U32].from_bytes(raw).to_numpy()
+    assert array.dtype == np.dtype("<u4")
+    assert array.sum() == sum(range(100))
+
+
+def test_ring_cursor():
+    capacity = 8
+
+    def snapshot(pushed):
+        slots = [0] * capacity
+        for seq in range(pushed):
+            slots[seq % capacity] = seq
+        raw = b"".join(U64.to_bytes(e) for e in slots)
+        return Repeat[U64].from_bytes(raw), pushed
+
+    cursor = RingCursor()
+    assert cursor.poll(*snapshot(3)) == []
+    assert cursor.poll(*snapshot(5)) == [3, 4]
+    assert cursor.poll(*snapshot(5)) == []
+    assert cursor.poll(*snapshot(12)) == list(range(5, 12))
+    assert cursor.missed == 0
+
+    # events overwritten between polls are skipped and counted
+    assert cursor.poll(*snapshot(30)) == list(range(22, 30))
+    assert cursor.missed == 10
+
+    assert RingCursor(seq_num=0).poll(*snapshot(4)) == [0, 1, 2, 3]
+
+
+def test_ring_cursor__empty_ring():
+    empty = Repeat[U64].from_bytes(b"")
+
+    cursor = RingCursor()
+    assert cursor.poll(empty, 0) == []
+    assert cursor.poll(empty, 5) == []
+    assert cursor.missed == 5
+
+
+def test_coptional__resolves_once_per_module_load(tmp_path, monkeypatch):
+    module_path = tmp_path / "coptional_module.py"
+    source = (
+        "from podite import {0}\n"
+        "from solmate.dtypes import COptional\n"
+        "\n"
+        'OptionalValue = COptional["Value"]\n'
+        "Value = {0}\n"
+    )
+    module_path.write_text(source.format("U16"))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # the two versions of the source have the same size, so a stale .pyc could be picked up
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    monkeypatch.delitem(sys.modules, "coptional_module", raising=False)
+
+    module = importlib.import_module("coptional_module")
+    optional_value = module.OptionalValue
+    assert optional_value.calc_max_size() == 6
+    assert optional_value.from_bytes(b"\x01\x00\x00\x00\x07\x00") == 7
+    assert optional_value.to_bytes(None) == b"\x00" * 4
+
+    # the forward reference is resolved again once the module is reloaded
+    module_path.write_text(source.format("U32"))
+    importlib.reload(module)
+    assert module.OptionalValue is optional_value
+    assert optional_value.calc_max_size() == 8
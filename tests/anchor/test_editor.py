@@ -0,0 +1,80 @@
+from solmate.anchor.editor import CodeEditor
+
+
+def lines_of(*names):
+    return [f"{name}\n" for name in names]
+
+
+def test_set_with_lock__replaces_in_place():
+    editor = CodeEditor("unused.py")
+    editor.add_lines(*lines_of("a", "b"))
+    assert editor.set_with_lock("x", lines_of("x1"))
+    editor.add_lines(*lines_of("c"))
+    assert editor.set_with_lock("y", lines_of("y1", "y2"))
+
+    assert not editor.set_with_lock("x", lines_of("x1", "x2", "x3"))
+    assert editor.locks == {"x": slice(2, 7), "y": slice(8, 12)}
+    assert editor["x"][1:-1] == lines_of("x1", "x2", "x3")
+    assert editor[7] == lines_of("c")
+    assert len(editor) == 12
+
+
+def test_setitem__lock_intersection():
+    editor = CodeEditor("unused.py")
+    editor.add_lines(*lines_of("a", "b"))
+    editor.set_with_lock("x", lines_of("x1"))
+    editor.add_lines(*lines_of("c"))
+
+    try:
+        editor[1:3] = []
+        excepted = False
+    except ValueError:
+        excepted = True
+    assert excepted
+
+    # edits covering a whole lock remove it
+    editor[1:6] = lines_of("d")
+    assert "x" not in editor
+    assert editor[0 : len(editor)] == lines_of("a", "d")
+
+
+def test_setitem__edits_within_lock():
+    editor = CodeEditor("unused.py")
+    editor.set_with_lock("x", lines_of("x1", "x2"))
+    editor[2:3] = lines_of("y1", "y2")
+    editor[0:0] = lines_of("a")
+
+    assert editor.locks == {"x": slice(1, 6)}
+    assert editor["x"][1:-1] == lines_of("x1", "y1", "y2")
+
+
+def test_infer_locks__roundtrip(tmp_path):
+    editor = CodeEditor(str(tmp_path / "module.py"))
+    editor.add_lines(*lines_of("a"))
+    editor.set_with_lock("x", lines_of("x1"))
+    editor.add_lines(*lines_of("b"))
+    editor.add_from_import("podite", "U8")
+    editor.save()
+
+    loaded = CodeEditor(str(tmp_path / "module.py"))
+    loaded.load()
+    assert loaded.locks == editor.locks
+    assert set(loaded.locks) == {"imports", "x"}
+
+    loaded.add_from_import("podite", "U8")
+    assert loaded.get_source_code() == editor.get_source_code()
+
+
+def test_set_with_lock__many_locks():
+    editor = CodeEditor("unused.py")
+    n_locks = 2000
+    for i in range(n_locks):
+        editor.set_with_lock(f"lock{i}", lines_of(f"a{i}"))
+        editor.add_lines("\n")
+
+    for i in reversed(range(n_locks)):
+        editor.set_with_lock(f"lock{i}", lines_of(f"b{i}", f"c{i}"))
+
+    assert len(editor) == 5 * n_locks
+    assert editor.locks[f"lock{n_locks - 1}"] == slice(5 * n_locks - 5, 5 * n_locks - 1)
+    assert editor[f"lock7"][1:-1] == lines_of("b7", "c7")
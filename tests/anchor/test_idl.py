@@ -0,0 +1,47 @@
+import json
+import os
+from pathlib import Path
+
+from solmate.anchor.idl import Idl, load_idl
+
+ROOT = Path(__file__).parent.parent.parent
+IDL_PATHS = [
+    ROOT / "tests/anchor/idl.json",
+    ROOT / "tests/anchor/other.json",
+    ROOT / "programs/system_program.json",
+    ROOT / "programs/token_program.json",
+]
+
+
+def test_load_idl__matches_reflective_loader():
+    for path in IDL_PATHS:
+        with open(path, "r") as fin:
+            raw = json.load(fin)
+
+        assert load_idl(raw) == Idl.from_dict(raw)
+        assert repr(load_idl(raw)) == repr(Idl.from_dict(raw))
+
+
+def test_from_json_file__cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOLMATE_CACHE_DIR", str(tmp_path / "cache"))
+    path = IDL_PATHS[0]
+
+    idl = Idl.from_json_file(path)
+    cached = list((tmp_path / "cache" / "idl").iterdir())
+    assert len(cached) == 1
+
+    # the second load is served from the cache
+    mtime = os.stat(cached[0]).st_mtime_ns
+    assert Idl.from_json_file(path) == idl
+    assert os.stat(cached[0]).st_mtime_ns == mtime
+
+    # corrupted entries are ignored
+    cached[0].write_bytes(b"not a pickle")
+    assert Idl.from_json_file(path) == idl
+
+
+def test_from_json_file__cache_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOLMATE_CACHE_DIR", "")
+    assert Idl.from_json_file(IDL_PATHS[0]) == Idl.from_json_file(
+        IDL_PATHS[0], use_cache=False
+    )
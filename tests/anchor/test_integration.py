@@ -8,6 +8,8 @@ from solana.keypair import Keypair
 
 from podite import U128
 
+from solmate.anchor import sighash
+
 
 def get_project_root() -> Path:
     return Path(__file__).parent.parent.parent
@@ -72,3 +74,27 @@ def test():
     )
     round_tripped = EnumWithStructVariant.from_bytes(_bytes)
     assert enum_struct_optional == round_tripped
+
+    from codegen.idl.accounts import Accounts
+    from codegen.idl.types import RiskOutputRegister
+
+    # the discriminators are emitted as literals and must match the runtime sighash
+    assert int(Accounts.RISK_OUTPUT_REGISTER) == sighash(
+        "account", "RiskOutputRegister"
+    )
+
+    account = Accounts.RISK_OUTPUT_REGISTER(
+        RiskOutputRegister(EnumWithFields.HEALTH(info))
+    )
+    for format in ("FORMAT_BORSH", "FORMAT_ZERO_COPY"):
+        _bytes = Accounts.to_bytes(account, format=format)
+        assert _bytes[:8] == int(Accounts.RISK_OUTPUT_REGISTER).to_bytes(8, "little")
+        assert Accounts.from_bytes(_bytes, format=format) == account
+
+    try:
+        Accounts.from_bytes(bytes(8) + _bytes[8:])
+        excepted = False
+    except ValueError:
+        excepted = True
+    finally:
+        assert excepted
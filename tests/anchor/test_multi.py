@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+
+from solmate.anchor import multi
+
+IDL_DIR = Path(__file__).parent
+
+
+def write_manifest(tmp_path):
+    manifest = {
+        "root_dir": "out",
+        "programs": [
+            {
+                "idl": str(IDL_DIR / "idl.json"),
+                "module": "multi_codegen.idl",
+                "default_accounts": {"rent": "solana.sysvar.SYSVAR_RENT_PUBKEY"},
+            },
+            {
+                "idl": str(IDL_DIR / "other.json"),
+                "module": "multi_codegen.other",
+            },
+        ],
+    }
+    path = tmp_path / "solmate.json"
+    path.write_text(json.dumps(manifest))
+    return path
+
+
+def test_generate__cross_idl_references(tmp_path):
+    manifest = multi.Manifest.from_json_file(str(write_manifest(tmp_path)))
+    outputs = multi.generate(manifest, jobs=2)
+
+    out = tmp_path / "out" / "multi_codegen"
+    assert (out / "idl" / "types" / "call_back_info.py").exists()
+    assert all(Path(filepath).exists() for filepath in outputs)
+
+    source = (out / "other" / "types" / "cross_idl_reference_type.py").read_text()
+    assert "from multi_codegen.idl.types.call_back_info import CallBackInfo" in source
+
+
+def test_generate__parallel_matches_serial(tmp_path):
+    manifest = multi.Manifest.from_json_file(str(write_manifest(tmp_path)))
+
+    serial = multi.generate(manifest, jobs=1)
+    for filepath in serial:
+        Path(filepath).unlink()
+    parallel = multi.generate(manifest, jobs=2)
+
+    assert serial == parallel
+
+
+def test_merge_outputs__conflict():
+    results = [
+        ("a", {"x.py": "a = 1\n", "y.py": "same\n"}),
+        ("b", {"y.py": "same\n"}),
+    ]
+    assert multi.merge_outputs(results) == {"x.py": "a = 1\n", "y.py": "same\n"}
+
+    results.append(("c", {"x.py": "a = 2\n"}))
+    try:
+        multi.merge_outputs(results)
+        excepted = False
+    except ValueError:
+        excepted = True
+    assert excepted
+
+
+def test_cli__global_flags_apply_to_every_program(tmp_path):
+    multi.cli(str(write_manifest(tmp_path)), jobs=1, lazy_imports=True)
+
+    out = tmp_path / "out" / "multi_codegen"
+    for module in ("idl", "other"):
+        source = (out / module / "types" / "__init__.py").read_text()
+        assert "lazy_attrs(" in source
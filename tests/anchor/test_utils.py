@@ -1,4 +1,11 @@
+from solana.publickey import PublicKey
+from solana.transaction import Transaction, TransactionInstruction
+
 from solmate.utils import (
+    InternCache,
+    clear_intern_caches,
+    get_intern_cache_info,
+    to_account_meta,
     camel_to_snake,
     snake_to_camel,
     pascal_to_snake,
@@ -36,3 +43,53 @@ def test_kebab_to_snake():
 def test_snake_to_kebab():
     assert snake_to_kebab("a_b_c_d") == "a-b-c-d"
     assert snake_to_kebab("market_group") == "market-group"
+
+
+def test_to_account_meta__interned_public_keys():
+    clear_intern_caches()
+    address = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+
+    meta = to_account_meta(address, is_signer=False, is_writable=True)
+    assert meta.pubkey == PublicKey(address)
+
+    other = to_account_meta(address, is_signer=False, is_writable=True)
+    assert other is not meta
+    assert other.pubkey is meta.pubkey
+
+    info = get_intern_cache_info()
+    assert info["public_keys"].misses == 1
+    assert info["public_keys"].hits == 1
+
+
+def test_to_account_meta__compiling_a_transaction_does_not_change_other_instructions():
+    payer = PublicKey(1)
+    ix1 = TransactionInstruction(
+        keys=[to_account_meta(str(payer), is_signer=True, is_writable=False)],
+        program_id=PublicKey(2),
+    )
+    ix2 = TransactionInstruction(
+        keys=[to_account_meta(str(payer), is_signer=True, is_writable=False)],
+        program_id=PublicKey(2),
+    )
+
+    # compile_message makes the metas of the fee payer writable in place
+    Transaction(fee_payer=payer, recent_blockhash=str(PublicKey(3))).add(
+        ix1
+    ).compile_message()
+
+    assert ix1.keys[0].is_writable
+    assert not ix2.keys[0].is_writable
+    assert ix2.keys[0].is_signer
+
+
+def test_intern_cache__evicts_least_recently_used():
+    cache = InternCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.info() == (3, 1, 2, 2)
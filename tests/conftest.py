@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path_factory, monkeypatch):
+    # keeps the tests out of the developer's ~/.cache/solmate (and from each other's entries)
+    monkeypatch.setenv(
+        "SOLMATE_CACHE_DIR", str(tmp_path_factory.mktemp("solmate-cache"))
+    )
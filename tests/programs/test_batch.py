@@ -0,0 +1,160 @@
+import pytest
+from solana.transaction import AccountMeta, Transaction
+
+from solmate.programs.system_program import instructions as system_ixs
+from solmate.programs.token_program import instructions as token_ixs
+from solmate.programs.token_program.types import AuthorityType
+from tests.programs.utils import get_pubkey, assert_ix_equal
+
+
+def test_transfer_checked_many__matches_single():
+    np = pytest.importorskip("numpy")
+
+    sources = [get_pubkey(i) for i in range(1, 5)]
+    destinations = [str(get_pubkey(i)) for i in range(5, 9)]
+    amounts = np.array([0, 1, 2**40, 2**64 - 1], dtype=np.uint64)
+
+    actual = token_ixs.transfer_checked_many(
+        source=sources,
+        mint=get_pubkey(10),
+        destination=destinations,
+        source_owner=get_pubkey(11),
+        amount=amounts,
+        decimals=6,
+        signers=[],
+    )
+
+    assert len(actual) == 4
+    for i, ix in enumerate(actual):
+        expect = token_ixs.transfer_checked(
+            source=sources[i],
+            mint=get_pubkey(10),
+            destination=destinations[i],
+            source_owner=get_pubkey(11),
+            amount=int(amounts[i]),
+            decimals=6,
+            signers=[],
+        )
+        assert_ix_equal(expect, ix)
+
+
+def test_transfer_checked_many__compiling_one_instruction_does_not_change_the_others():
+    owner = get_pubkey(11)
+    ixs = token_ixs.transfer_checked_many(
+        source=[get_pubkey(1), get_pubkey(2)],
+        mint=get_pubkey(10),
+        destination=get_pubkey(3),
+        source_owner=owner,
+        amount=[1, 2],
+        decimals=6,
+        signers=[],
+        remaining_accounts=[AccountMeta(get_pubkey(12), False, False)],
+    )
+
+    # compile_message makes the metas of the fee payer writable in place
+    tx = Transaction(fee_payer=owner, recent_blockhash=str(get_pubkey(99)))
+    tx.add(ixs[0]).compile_message()
+
+    assert ixs[0].keys[3].is_writable
+    assert not ixs[1].keys[3].is_writable
+    assert ixs[1].keys[4] is not ixs[0].keys[4]
+
+
+def test_transfer_checked_many__default_signers():
+    actual = token_ixs.transfer_checked_many(
+        source=[get_pubkey(1), get_pubkey(2)],
+        mint=get_pubkey(10),
+        destination=get_pubkey(3),
+        source_owner=get_pubkey(11),
+        amount=[1, 2],
+        decimals=6,
+    )
+
+    for i, ix in enumerate(actual):
+        expect = token_ixs.transfer_checked(
+            source=get_pubkey(1 + i),
+            mint=get_pubkey(10),
+            destination=get_pubkey(3),
+            source_owner=get_pubkey(11),
+            amount=1 + i,
+            decimals=6,
+        )
+        assert_ix_equal(expect, ix)
+        # without signers, the owner signs
+        assert ix.keys[3].is_signer
+        assert len(ix.keys) == 4
+
+
+def test_transfer_checked_many__multisig():
+    actual = token_ixs.transfer_checked_many(
+        source=get_pubkey(1),
+        mint=get_pubkey(2),
+        destination=[get_pubkey(3), get_pubkey(4)],
+        source_owner=get_pubkey(5),
+        amount=[7, 8],
+        decimals=[0, 9],
+        signers=[get_pubkey(6), get_pubkey(7)],
+    )
+
+    for i, ix in enumerate(actual):
+        expect = token_ixs.transfer_checked(
+            source=get_pubkey(1),
+            mint=get_pubkey(2),
+            destination=[get_pubkey(3), get_pubkey(4)][i],
+            source_owner=get_pubkey(5),
+            amount=[7, 8][i],
+            decimals=[0, 9][i],
+            signers=[get_pubkey(6), get_pubkey(7)],
+        )
+        assert_ix_equal(expect, ix)
+
+
+def test_create_account_many__public_key_column():
+    owners = [get_pubkey(3), get_pubkey(4), get_pubkey(3)]
+    actual = system_ixs.create_account_many(
+        from_pubkey=get_pubkey(1),
+        to_pubkey=[get_pubkey(5), get_pubkey(6), get_pubkey(7)],
+        lamports=10**9,
+        space=[0, 82, 165],
+        owner=owners,
+    )
+
+    for i, ix in enumerate(actual):
+        expect = system_ixs.create_account(
+            from_pubkey=get_pubkey(1),
+            to_pubkey=[get_pubkey(5), get_pubkey(6), get_pubkey(7)][i],
+            lamports=10**9,
+            space=[0, 82, 165][i],
+            owner=owners[i],
+        )
+        assert_ix_equal(expect, ix)
+
+
+def test_set_authority_many__without_data_layout():
+    new_authorities = [get_pubkey(3), None]
+    actual = token_ixs.set_authority_many(
+        mint_or_account=[get_pubkey(1), get_pubkey(2)],
+        source_owner=get_pubkey(4),
+        authority_type=AuthorityType.MINT_TOKENS,
+        new_authority=new_authorities,
+        signers=[],
+    )
+
+    for i, ix in enumerate(actual):
+        expect = token_ixs.set_authority(
+            mint_or_account=[get_pubkey(1), get_pubkey(2)][i],
+            source_owner=get_pubkey(4),
+            authority_type=AuthorityType.MINT_TOKENS,
+            new_authority=new_authorities[i],
+            signers=[],
+        )
+        assert_ix_equal(expect, ix)
+
+
+def test_many__columns_of_different_lengths():
+    with pytest.raises(ValueError):
+        system_ixs.transfer_many(
+            from_pubkey=[get_pubkey(1), get_pubkey(2)],
+            to_pubkey=get_pubkey(3),
+            lamports=[1, 2, 3],
+        )
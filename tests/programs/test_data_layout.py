@@ -0,0 +1,67 @@
+from dataclasses import fields
+from io import BytesIO
+
+from podite import BYTES_CATALOG
+from solana.publickey import PublicKey
+
+from solmate.programs.system_program import instructions as system_ixs
+from solmate.programs.token_program import instructions as token_ixs
+from tests.programs.utils import get_pubkey
+
+
+def get_ix_classes(module):
+    return [
+        value
+        for name, value in vars(module).items()
+        if name.endswith("Ix") and hasattr(value, "_data_layout")
+    ]
+
+
+def get_sample_value(field_type, i):
+    if field_type is PublicKey:
+        return get_pubkey(i)
+
+    # all the other fixed-size fields are unsigned integers in these programs
+    return 100 + i
+
+
+def encode_generic(module, ix):
+    buffer = BytesIO()
+    tag = getattr(module.InstructionTag, pascal_to_tag(type(ix).__name__))
+    buffer.write(module.InstructionTag.to_bytes(tag))
+    for field in get_data_fields(type(ix)):
+        buffer.write(BYTES_CATALOG.pack(field.type, getattr(ix, field.name)))
+    return buffer.getvalue()
+
+
+def pascal_to_tag(cls_name):
+    name = cls_name[: -len("Ix")]
+    return "".join(f"_{c}" if c.isupper() else c.upper() for c in name).lstrip("_")
+
+
+def get_data_fields(cls):
+    # data fields come after the account metas (which are AccountMeta or lists of them)
+    result = []
+    for field in fields(cls):
+        if field.name == "program_id" or "AccountMeta" in str(field.type):
+            continue
+        result.append(field)
+    return result
+
+
+def test_data_layout__matches_generic_encoding():
+    n_classes = 0
+    for module in (token_ixs, system_ixs):
+        for cls in get_ix_classes(module):
+            kwargs = {
+                f.name: [] if "List" in str(f.type) else None for f in fields(cls)
+            }
+            kwargs["program_id"] = get_pubkey(0)
+            for i, field in enumerate(get_data_fields(cls)):
+                kwargs[field.name] = get_sample_value(field.type, i)
+
+            ix = cls(**kwargs)
+            assert ix.to_instruction().data == encode_generic(module, ix), cls
+            n_classes += 1
+
+    assert n_classes > 20
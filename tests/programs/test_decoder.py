@@ -0,0 +1,122 @@
+import typing
+from dataclasses import fields
+
+import pytest
+from solana.transaction import AccountMeta, TransactionInstruction
+
+from solmate.programs.system_program import PROGRAM_ID as SYSTEM_PROGRAM_ID
+from solmate.programs.system_program import instructions as system_ixs
+from solmate.programs.token_program import instructions as token_ixs
+from solmate.programs.token_program.types import AuthorityType
+from tests.programs.utils import get_pubkey
+
+
+def get_sample_value(field, i):
+    name = str(field.type)
+    if "AccountMeta" in name:
+        meta = AccountMeta(get_pubkey(i), is_signer=False, is_writable=True)
+        return [meta] if "List" in name else meta
+    elif field.type is str:
+        return "1.5"
+    elif field.type is AuthorityType:
+        return AuthorityType.CLOSE_ACCOUNT
+    elif "PublicKey" in name:
+        return get_pubkey(i)
+
+    # the remaining arguments are integers
+    return 100 + i
+
+
+def get_ix_classes(module):
+    return [
+        value
+        for name, value in sorted(vars(module).items())
+        if name.endswith("Ix") and isinstance(value, type)
+    ]
+
+
+@pytest.mark.parametrize("module", [token_ixs, system_ixs])
+def test_decode_instruction__inverts_to_instruction(module):
+    classes = get_ix_classes(module)
+    assert classes
+
+    for cls in classes:
+        kwargs = {
+            field.name: get_sample_value(field, i)
+            for i, field in enumerate(fields(cls))
+        }
+        ix = cls(**kwargs).to_instruction()
+
+        decoded = module.decode_instruction(ix)
+        assert type(decoded) is cls
+        assert decoded.to_instruction() == ix, cls.__name__
+
+
+def test_decode_instruction__accounts():
+    ix = token_ixs.transfer_checked(
+        source=get_pubkey(1),
+        mint=get_pubkey(2),
+        destination=get_pubkey(3),
+        source_owner=get_pubkey(4),
+        amount=10,
+        decimals=2,
+        signers=[get_pubkey(5), get_pubkey(6)],
+        remaining_accounts=[get_pubkey(7)],
+    )
+
+    decoded = token_ixs.decode_instruction(ix)
+    assert decoded.source_owner.pubkey == get_pubkey(4)
+    assert [meta.pubkey for meta in decoded.signers] == [get_pubkey(5), get_pubkey(6)]
+    assert [meta.pubkey for meta in decoded.remaining_accounts] == [get_pubkey(7)]
+    assert (decoded.amount, decoded.decimals) == (10, 2)
+
+    # the optional base account is left out when it is the funding account itself
+    ix = system_ixs.create_account_with_seed(
+        from_pubkey=get_pubkey(1),
+        base=get_pubkey(1),
+        seed="seed",
+        lamports=1,
+        space=2,
+        owner=get_pubkey(3),
+    )
+    decoded = system_ixs.decode_instruction(ix)
+    assert decoded.base_pubkey is None
+    assert decoded.to_instruction() == ix
+
+
+def test_decode_instructions__skips_other_programs():
+    ixs = [
+        system_ixs.transfer(get_pubkey(1), get_pubkey(2), 5),
+        token_ixs.sync_native(get_pubkey(3)),
+        system_ixs.assign(get_pubkey(4), get_pubkey(5)),
+    ]
+
+    decoded = list(system_ixs.decode_instructions(ixs, SYSTEM_PROGRAM_ID))
+    assert [type(ix) for ix in decoded] == [system_ixs.TransferIx, system_ixs.AssignIx]
+
+
+def test_decode_instruction__unknown_tag():
+    with pytest.raises(ValueError):
+        token_ixs.decode_instruction(
+            TransactionInstruction(keys=[], program_id=get_pubkey(1), data=b"\xff")
+        )
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        # transfer with a truncated amount (fixed data layout)
+        bytes([3, 1, 2]),
+        # set_authority without its authority type, then with a truncated new authority
+        bytes([6]),
+        bytes([6, 1, 1, 1, 2]),
+    ],
+)
+def test_decode_instruction__truncated_data(data):
+    keys = [
+        AccountMeta(get_pubkey(i), is_signer=False, is_writable=True) for i in (1, 2, 3)
+    ]
+    with pytest.raises(ValueError):
+        token_ixs.decode_instruction(
+            TransactionInstruction(keys=keys, program_id=get_pubkey(9), data=data)
+        )
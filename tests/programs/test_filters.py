@@ -0,0 +1,90 @@
+import base64
+
+import pytest
+
+from solmate.filters import LocalClient
+from solmate.programs.token_program import PROGRAM_ID
+from solmate.programs.token_program.accounts import Filters
+from solmate.programs.token_program.constants import SPL_TOKEN_ACCOUNT_OWNER_OFFSET
+from solmate.programs.token_program.types import (
+    Account,
+    AccountState,
+    Mint,
+)
+from tests.programs.utils import get_pubkey
+
+
+def get_account(owner, amount):
+    return Account(
+        mint=get_pubkey(1),
+        owner=owner,
+        amount=amount,
+        delegate=None,
+        state=AccountState.INITIALIZED,
+        is_native=None,
+        delegated_amount=0,
+        close_authority=None,
+    )
+
+
+def get_client():
+    client = LocalClient()
+    client.add_account(
+        get_pubkey(10), PROGRAM_ID, Account.to_bytes(get_account(get_pubkey(2), 5))
+    )
+    client.add_account(
+        get_pubkey(11), PROGRAM_ID, Account.to_bytes(get_account(get_pubkey(3), 6))
+    )
+    client.add_account(
+        get_pubkey(12), get_pubkey(4), Account.to_bytes(get_account(get_pubkey(2), 7))
+    )
+
+    mint = Mint(
+        mint_authority=get_pubkey(2),
+        supply=100,
+        decimals=6,
+        is_initialized=True,
+        freeze_authority=None,
+    )
+    client.add_account(get_pubkey(13), PROGRAM_ID, Mint.to_bytes(mint))
+    return client
+
+
+def test_filters__memcmp_and_data_size():
+    memcmp = Filters.ACCOUNT.owner == get_pubkey(2)
+    assert memcmp.offset == SPL_TOKEN_ACCOUNT_OWNER_OFFSET
+    assert (Filters.ACCOUNT.owner == str(get_pubkey(2))) == memcmp
+
+    query = Filters.ACCOUNT.query(memcmp)
+    assert query["data_size"] == 165
+    assert query["data_slice"] is None
+
+    response = get_client().get_program_accounts(PROGRAM_ID, encoding="base64", **query)
+    assert [item["pubkey"] for item in response["result"]] == [str(get_pubkey(10))]
+
+    # the mint authority of the mint is at the same offset, but the mint is smaller
+    response = get_client().get_program_accounts(PROGRAM_ID, **Filters.ACCOUNT.query())
+    assert len(response["result"]) == 2
+
+
+def test_filters__data_slice():
+    query = Filters.ACCOUNT.query(
+        Filters.ACCOUNT.state == AccountState.INITIALIZED, slice=("amount",)
+    )
+    response = get_client().get_program_accounts(PROGRAM_ID, **query)
+
+    amounts = [
+        int.from_bytes(base64.b64decode(item["account"]["data"][0]), "little")
+        for item in response["result"]
+    ]
+    assert amounts == [5, 6]
+
+    assert Filters.ACCOUNT.slice("mint", "owner") == (0, 64)
+
+
+def test_filters__errors():
+    with pytest.raises(AttributeError):
+        Filters.ACCOUNT.balance
+
+    with pytest.raises(ValueError):
+        Filters.ACCOUNT.amount == b"\x00"
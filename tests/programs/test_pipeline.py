@@ -0,0 +1,227 @@
+import base64
+import json
+from struct import pack
+
+import pytest
+from solana.transaction import Transaction, TransactionInstruction
+
+from solmate.pipeline import (
+    BlockPipeline,
+    parse_json_transaction,
+    parse_wire_transaction,
+)
+from solmate.programs.system_program import instructions as system_ixs
+from solmate.programs.token_program import PROGRAM_ID as TOKEN_PROGRAM_ID
+from solmate.programs.token_program import instructions as token_ixs
+from tests.programs.utils import get_keypair, get_pubkey
+
+PAYER = get_keypair(1)
+BLOCKHASH = str(get_pubkey(99))
+
+
+def get_transaction(*instructions):
+    tx = Transaction(fee_payer=PAYER.public_key, recent_blockhash=BLOCKHASH)
+    tx.add(*instructions)
+    tx.sign(PAYER)
+    return tx
+
+
+def to_json_transaction(tx, inner=(), err=None):
+    message = tx.compile_message()
+    return {
+        "transaction": {
+            "signatures": [str(get_pubkey(0))],
+            "message": {
+                "accountKeys": [str(key) for key in message.account_keys],
+                "header": {
+                    "numRequiredSignatures": message.header.num_required_signatures,
+                    "numReadonlySignedAccounts": message.header.num_readonly_signed_accounts,
+                    "numReadonlyUnsignedAccounts": message.header.num_readonly_unsigned_accounts,
+                },
+                "instructions": [
+                    {
+                        "programIdIndex": ix.program_id_index,
+                        "accounts": ix.accounts,
+                        "data": ix.data.decode(),
+                    }
+                    for ix in message.instructions
+                ],
+            },
+        },
+        "meta": {"err": err, "innerInstructions": list(inner)},
+    }
+
+
+def assert_same_accounts_and_data(expect, actual):
+    # the flags of the decoded accounts are the ones of the transaction, e.g. the fee payer is writable
+    assert actual.program_id == expect.program_id
+    assert [key.pubkey for key in actual.keys] == [key.pubkey for key in expect.keys]
+    assert actual.data == expect.data
+
+
+def get_transfer(i):
+    return token_ixs.transfer_checked(
+        source=get_pubkey(2),
+        mint=get_pubkey(3),
+        destination=get_pubkey(4),
+        source_owner=PAYER.public_key,
+        amount=i,
+        decimals=6,
+        signers=[],
+    )
+
+
+def get_system_transfer(i):
+    return system_ixs.transfer(
+        from_pubkey=PAYER.public_key, to_pubkey=get_pubkey(5), lamports=i
+    )
+
+
+@pytest.fixture
+def json_dumps(tmp_path):
+    expect = []
+    for slot in range(10, 13):
+        transactions = []
+        for i in range(4):
+            amount = slot * 10 + i
+            transactions.append(
+                to_json_transaction(
+                    get_transaction(get_transfer(amount), get_system_transfer(amount))
+                )
+            )
+            expect.append((slot, 0, get_transfer(amount)))
+            expect.append((slot, 1, get_system_transfer(amount)))
+
+        # the instructions of failed transactions are skipped
+        transactions.append(
+            to_json_transaction(get_transaction(get_transfer(0)), err={"Custom": 1})
+        )
+
+        with open(tmp_path / f"{slot}.json", "w") as f:
+            json.dump({"slot": slot, "transactions": transactions}, f)
+
+    return tmp_path, expect
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_decode__json_dumps(json_dumps, jobs):
+    path, expect = json_dumps
+    pipeline = BlockPipeline(jobs=jobs, chunk_size=1)
+
+    actual = list(pipeline.decode(str(path)))
+
+    assert len(actual) == len(expect)
+    for decoded, (slot, index, ix) in zip(actual, expect):
+        assert decoded.slot == slot
+        assert decoded.index == index
+        assert decoded.inner_index is None
+        assert decoded.signature == str(get_pubkey(0))
+        assert_same_accounts_and_data(ix, decoded.ix.to_instruction())
+
+
+def test_decode__program_filter_and_inner_instructions(tmp_path):
+    tx = to_json_transaction(get_transaction(get_system_transfer(1), get_transfer(7)))
+    # turns the token transfer into an instruction invoked by the system transfer
+    message = tx["transaction"]["message"]
+    tx["meta"]["innerInstructions"] = [
+        {"index": 0, "instructions": [message["instructions"].pop()]}
+    ]
+
+    with open(tmp_path / "blocks.jsonl", "w") as f:
+        f.write(json.dumps({"slot": 1, "transactions": [tx]}) + "\n")
+
+    pipeline = BlockPipeline(
+        jobs=1, decoders={TOKEN_PROGRAM_ID: token_ixs.decode_instruction}
+    )
+    (decoded,) = pipeline.decode(str(tmp_path / "blocks.jsonl"))
+
+    assert (decoded.index, decoded.inner_index) == (0, 0)
+    assert_same_accounts_and_data(get_transfer(7), decoded.ix.to_instruction())
+
+    pipeline.inner = False
+    assert list(pipeline.decode(str(tmp_path / "blocks.jsonl"))) == []
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_decode_batches__binary_dump(tmp_path, jobs):
+    with open(tmp_path / "txs.bin", "wb") as f:
+        for i in range(20):
+            raw = get_transaction(get_transfer(i), get_system_transfer(i)).serialize()
+            f.write(pack("<QI", 100 + i // 4, len(raw)) + raw)
+
+    pipeline = BlockPipeline(jobs=jobs, chunk_size=1000)
+    batches = list(pipeline.decode_batches(str(tmp_path / "txs.bin")))
+    assert len(batches) > 1
+
+    transfers = {}
+    for batch in batches:
+        for name, values in batch["TransferCheckedIx"].items():
+            transfers.setdefault(name, []).extend(values)
+
+    assert transfers["slot"] == [100 + i // 4 for i in range(20)]
+    assert transfers["amount"] == list(range(20))
+    assert transfers["destination"] == [str(get_pubkey(4))] * 20
+    assert transfers["index"] == [0] * 20
+    assert sum(len(batch["TransferIx"]["lamports"]) for batch in batches) == 20
+
+
+def test_parse_wire_transaction__matches_compiled_message():
+    tx = get_transaction(get_transfer(1), get_system_transfer(2))
+    message = tx.compile_message()
+
+    actual = parse_wire_transaction(tx.serialize())
+
+    assert actual.account_keys == [str(key) for key in message.account_keys]
+    assert actual.num_signed == message.header.num_required_signatures
+    for i in range(len(actual.account_keys)):
+        assert actual.is_writable(i) == message.is_account_writable(i)
+
+    tx_json = to_json_transaction(tx)
+    tx_json["transaction"] = [base64.b64encode(tx.serialize()).decode(), "base64"]
+    assert parse_json_transaction(tx_json) == actual
+
+
+def get_v0_transaction(data):
+    # a transfer whose destination is loaded from an address lookup table
+    return b"".join(
+        [
+            bytes([1]) + bytes(64),
+            bytes([0x80, 1, 0, 1]),
+            bytes([2]) + bytes(PAYER.public_key) + bytes(TOKEN_PROGRAM_ID),
+            bytes(get_pubkey(99)),
+            bytes([1, 1, 2, 0, 2, len(data)]) + data,
+            bytes([1]) + bytes(get_pubkey(98)) + bytes([1, 0, 0]),
+        ]
+    )
+
+
+def test_decode__binary_v0_transaction_with_lookup_tables(tmp_path):
+    records = [
+        get_v0_transaction(get_transfer(1).data),
+        get_transaction(get_transfer(2)).serialize(),
+    ]
+    with open(tmp_path / "txs.bin", "wb") as f:
+        for raw in records:
+            f.write(pack("<QI", 1, len(raw)) + raw)
+
+    # the instruction using the unresolved account is skipped
+    (decoded,) = BlockPipeline(jobs=1).decode(str(tmp_path / "txs.bin"))
+    assert decoded.ix.amount == 2
+
+    with pytest.raises(ValueError):
+        list(BlockPipeline(jobs=1, strict=True).decode(str(tmp_path / "txs.bin")))
+
+
+def test_decode__truncated_instruction_data(tmp_path):
+    truncated = TransactionInstruction(
+        keys=get_transfer(1).keys, program_id=TOKEN_PROGRAM_ID, data=bytes([12, 1, 2])
+    )
+    tx = to_json_transaction(get_transaction(truncated, get_transfer(3)))
+    with open(tmp_path / "block.json", "w") as f:
+        json.dump({"slot": 1, "transactions": [tx]}, f)
+
+    (decoded,) = BlockPipeline(jobs=1).decode(str(tmp_path / "block.json"))
+    assert (decoded.index, decoded.ix.amount) == (1, 3)
+
+    with pytest.raises(ValueError):
+        list(BlockPipeline(jobs=1, strict=True).decode(str(tmp_path / "block.json")))
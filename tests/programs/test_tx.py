@@ -0,0 +1,109 @@
+import pytest
+from solana.transaction import AccountMeta, TransactionInstruction
+
+from solmate.programs.system_program import instructions as system_ixs
+from solmate.programs.token_program import PROGRAM_ID as TOKEN_PROGRAM_ID
+from solmate.programs.token_program import instructions as token_ixs
+from solmate.tx import Packer, get_shortvec_size, pack_instructions
+from tests.programs.utils import get_pubkey
+
+PAYER = get_pubkey(1)
+BLOCKHASH = str(get_pubkey(99))
+
+
+def get_serialized_size(tx):
+    message = tx.compile_message()
+    num_signers = message.header.num_required_signatures
+    return len(message.serialize()) + get_shortvec_size(num_signers) + 64 * num_signers
+
+
+def get_transfer(i):
+    return token_ixs.transfer_checked(
+        source=get_pubkey(2),
+        mint=get_pubkey(3),
+        destination=get_pubkey(10 + i % 50),
+        source_owner=PAYER,
+        amount=i,
+        decimals=6,
+        signers=[],
+    )
+
+
+def get_create_account(i):
+    # the new accounts sign the transaction too
+    return system_ixs.create_account(
+        from_pubkey=PAYER,
+        to_pubkey=get_pubkey(100 + i),
+        lamports=i,
+        space=165,
+        owner=TOKEN_PROGRAM_ID,
+    )
+
+
+@pytest.mark.parametrize("get_ix", [get_transfer, get_create_account])
+def test_packer__size_is_exact(get_ix):
+    packer = Packer(PAYER, BLOCKHASH)
+    for i in range(5):
+        assert packer.add(get_ix(i)) is None
+
+        expect = packer.size
+        tx = Packer(PAYER, BLOCKHASH).pack(packer.instructions)
+        assert get_serialized_size(next(tx)) == expect
+
+
+def test_packer__merges_flags():
+    account = get_pubkey(5)
+    packer = Packer(PAYER, BLOCKHASH)
+
+    packer.add(
+        TransactionInstruction(
+            keys=[AccountMeta(account, is_signer=False, is_writable=False)],
+            program_id=get_pubkey(6),
+            data=b"",
+        )
+    )
+    size = packer.size
+
+    # the same account as a signer only adds its signature
+    packer.add(
+        TransactionInstruction(
+            keys=[AccountMeta(account, is_signer=True, is_writable=True)],
+            program_id=get_pubkey(6),
+            data=b"",
+        )
+    )
+    assert packer.size == size + 64 + 4
+    assert packer.accounts[account] == 3
+
+    (tx,) = packer.pack([])
+    assert get_serialized_size(tx) == size + 64 + 4
+
+
+def test_pack_instructions__fills_transactions():
+    ixs = [get_transfer(i) for i in range(1000)]
+
+    txs = pack_instructions(ixs, PAYER, BLOCKHASH)
+
+    assert [ix for tx in txs for ix in tx.instructions] == ixs
+    for tx, next_tx in zip(txs, txs[1:]):
+        assert get_serialized_size(tx) <= 1232
+        # the next instruction did not fit
+        packer = Packer(PAYER, BLOCKHASH)
+        for ix in tx.instructions:
+            packer.add(ix)
+        assert packer.add(next_tx.instructions[0]) is not None
+
+
+def test_packer__instruction_too_big():
+    ix = TransactionInstruction(keys=[], program_id=get_pubkey(6), data=bytes(2000))
+    with pytest.raises(ValueError):
+        Packer(PAYER).add(ix)
+
+    # the pending instructions are kept
+    packer = Packer(PAYER, BLOCKHASH)
+    packer.add(get_transfer(0))
+    size = packer.size
+    with pytest.raises(ValueError):
+        packer.add(ix)
+    assert packer.instructions == [get_transfer(0)]
+    assert packer.size == size
@@ -0,0 +1,136 @@
+import struct
+from dataclasses import fields
+
+import pytest
+
+from solmate.programs.token_program import constants
+from solmate.programs.token_program.types import (
+    Account,
+    AccountState,
+    AccountView,
+    Mint,
+    MintView,
+)
+from tests.programs.utils import get_pubkey
+
+
+def get_account():
+    return Account(
+        mint=get_pubkey(1),
+        owner=get_pubkey(2),
+        amount=12345,
+        delegate=get_pubkey(3),
+        state=AccountState.FROZEN,
+        is_native=None,
+        delegated_amount=678,
+        close_authority=None,
+    )
+
+
+def test_view__matches_from_bytes():
+    account = get_account()
+    raw = Account.to_bytes(account)
+    assert len(raw) == AccountView.size
+
+    view = AccountView(raw)
+    for field in fields(Account):
+        assert getattr(view, field.name) == getattr(account, field.name), field.name
+    assert view.to_obj() == account
+
+
+def test_view__offset_without_copy():
+    mint = Mint(
+        mint_authority=None,
+        supply=10**12,
+        decimals=6,
+        is_initialized=True,
+        freeze_authority=get_pubkey(4),
+    )
+    raw = bytearray(b"\xff" * 3 + Mint.to_bytes(mint))
+    # podite packs booleans incorrectly, so set the flag by hand
+    raw[3 + 45] = 1
+
+    view = MintView(raw, 3)
+    assert view.supply == 10**12
+    assert view.is_initialized
+    assert view.freeze_authority == get_pubkey(4)
+
+    # the view reads through to the underlying buffer
+    raw[3 + 36 : 3 + 44] = (7).to_bytes(8, "little")
+    assert view.supply == 7
+
+    try:
+        MintView(raw, 4)
+        excepted = False
+    except ValueError:
+        excepted = True
+    assert excepted
+
+
+def test_decode_many__columns():
+    np = pytest.importorskip("numpy")
+
+    accounts = []
+    for i in range(10):
+        account = get_account()
+        account.mint = get_pubkey(i % 3)
+        account.amount = i
+        account.delegate = None if i % 2 else get_pubkey(i)
+        accounts.append(account)
+    buffers = [Account.to_bytes(account) for account in accounts]
+
+    columns = AccountView.decode_many(buffers)
+    assert columns.shape == (10,)
+    assert columns["amount"].tolist() == list(range(10))
+    assert columns["delegate"]["tag"].tolist() == [1 - i % 2 for i in range(10)]
+    assert columns["state"].tolist() == [int(AccountState.FROZEN)] * 10
+    assert bytes(columns["mint"][4]) == bytes(get_pubkey(1))
+
+    # sum of the balances per mint
+    mints, inverse = np.unique(columns["mint"], return_inverse=True)
+    totals = np.bincount(inverse, weights=columns["amount"])
+    assert sorted(totals.tolist()) == [12.0, 15.0, 18.0]
+
+    array = np.frombuffer(b"".join(buffers), dtype=np.uint8).reshape(10, -1)
+    assert (AccountView.from_buffer_array(array) == columns).all()
+
+
+def test_decode_many__short_buffer():
+    pytest.importorskip("numpy")
+
+    raw = Account.to_bytes(get_account())
+    # the lengths add up to a multiple of the size
+    buffers = [raw[:100], raw[:65], raw]
+    with pytest.raises(ValueError):
+        AccountView.decode_many(buffers)
+
+
+def test_decode_fields__matches_view():
+    account = get_account()
+    raw = Account.to_bytes(account)
+
+    names = ("amount", "owner", "delegate", "state", "mint")
+    assert AccountView.decode_fields(raw, names) == tuple(
+        getattr(account, name) for name in names
+    )
+
+    projector = AccountView.projector(("owner",))
+    assert AccountView.projector(["owner"]) is projector
+    assert projector(b"\x00" + raw, 1) == (account.owner,)
+
+
+def test_decode_fields__errors():
+    raw = Account.to_bytes(get_account())
+    with pytest.raises(ValueError):
+        AccountView.projector(("owner", "balance"))
+
+    with pytest.raises(struct.error):
+        AccountView.decode_fields(raw[:100], ("mint",))
+
+
+def test_field_layout__matches_constants():
+    layout = AccountView.field_layout
+    assert layout["mint"][0] == constants.SPL_TOKEN_ACCOUNT_MINT_OFFSET
+    assert layout["owner"][0] == constants.SPL_TOKEN_ACCOUNT_OWNER_OFFSET
+    assert layout["state"][0] == constants.ACCOUNT_INITIALIZED_INDEX
+    assert sum(size for _, size, _ in layout.values()) == AccountView.size